@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Event indexes: seeds a large event table in a throwaway
+test database and prints the plan and timing of the hot Event queries,
+first with the old single-column FK indexes, then with the composite /
+covering / partial indexes declared on Event.Meta.
+
+Run it against Postgres for representative plans (covering indexes are
+Postgres-only); SQLite works but ignores the INCLUDE columns.
+
+    python benchmarks/event_index_benchmark.py --events 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Set up Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stats_tracker.settings')
+django.setup()
+
+import numpy as np
+from django.db import connection, models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from games.hexbin import MADE_ACTIONS, MISSED_ACTIONS
+from games.models import Event, Game, Player, Season
+
+ACTIONS = ["made_two", "missed_two", "made_three", "missed_three", "assist", "def_reb", "off_reb", "steal", "block", "turnover"]
+OLD_INDEXES = [
+    models.Index(fields=["game"], name="bench_event_game_idx"),
+    models.Index(fields=["season"], name="bench_event_season_idx"),
+    models.Index(fields=["player"], name="bench_event_player_idx"),
+]
+
+
+def seed(n_events, n_players=200, n_seasons=10, games_per_season=80, batch=20000):
+    seasons = Season.objects.bulk_create([
+        Season(name=f"Bench {i}", external_id=f"bench_season_{i}", start_date="2025-01-01", end_date="2025-12-31")
+        for i in range(n_seasons)
+    ])
+    games = Game.objects.bulk_create([
+        Game(external_id=f"bench_game_{s.id}_{i}", opponent="Bench", date="2025-07-28", season=s)
+        for s in seasons for i in range(games_per_season)
+    ])
+    players = Player.objects.bulk_create(
+        [Player(name=f"Player {i}", external_id=f"bench_player_{i}") for i in range(n_players)]
+    )
+
+    rng = np.random.default_rng(0)
+    now = timezone.now()
+    for start in range(0, n_events, batch):
+        size = min(batch, n_events - start)
+        game_idx = rng.integers(0, len(games), size)
+        player_idx = rng.integers(0, n_players, size)
+        action_idx = rng.integers(0, len(ACTIONS), size)
+        xs = rng.uniform(-250, 250, size)
+        ys = rng.uniform(-50, 420, size)
+        Event.objects.bulk_create([
+            Event(game_id=games[g].id, season_id=games[g].season_id, player_id=players[p].id,
+                  timestamp=now, action=ACTIONS[a], x=x, y=y)
+            for g, p, a, x, y in zip(game_idx.tolist(), player_idx.tolist(), action_idx.tolist(), xs.tolist(), ys.tolist())
+        ])
+        print(f"  seeded {start + size:>9} events", end="\r")
+    print()
+    return seasons[0].id, games[0].id, players[0].id
+
+
+def hot_queries(season_id, game_id, player_id):
+    """The Event reads from views.py, async_views.py and the heatmap job utils."""
+    shots = ("x", "y", "action")
+    fingerprint = {"max_id": Max("id"), "count": Count("id")}
+    return [
+        ("career heatmap (player)", Event.objects.filter(player_id=player_id).values_list(*shots)),
+        ("season heatmap (player, season)", Event.objects.filter(player_id=player_id, season_id=season_id).values_list(*shots)),
+        ("game heatmap (game, player)", Event.objects.filter(game_id=game_id, player_id=player_id).values_list(*shots)),
+        ("season fingerprint (season)", Event.objects.filter(season_id=season_id).values("season_id").annotate(**fingerprint)),
+        ("game heatmap (game)", Event.objects.filter(game_id=game_id).values_list(*shots)),
+        ("bins (season, shots)", Event.objects.filter(
+            season_id=season_id, action__in=MADE_ACTIONS + MISSED_ACTIONS
+        ).values_list(*shots)),
+    ]
+
+
+def run(label, queries, repeat):
+    print(f"\n{label}")
+    print("-" * 50)
+    for name, queryset in queries:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append(time.perf_counter() - started)
+        print(f"{name}: {min(timings) * 1000:.1f} ms")
+        for line in queryset.explain().splitlines():
+            print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("🏀 Event Index Benchmark")
+    print("=" * 50)
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        ids = seed(args.events)
+        queries = hot_queries(*ids)
+
+        with connection.schema_editor() as editor:
+            for index in Event._meta.indexes:
+                editor.remove_index(Event, index)
+            for index in OLD_INDEXES:
+                editor.add_index(Event, index)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM ANALYZE games_event")
+        run("Before: single-column FK indexes", queries, args.repeat)
+
+        with connection.schema_editor() as editor:
+            for index in OLD_INDEXES:
+                editor.remove_index(Event, index)
+            for index in Event._meta.indexes:
+                editor.add_index(Event, index)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM ANALYZE games_event")
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        run("After: composite / covering / partial indexes", queries, args.repeat)
+        print("\n✅ Done")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
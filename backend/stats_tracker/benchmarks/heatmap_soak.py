@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Soak test for heatmap rendering: renders many heatmaps in one process and
+reports resident memory along the way. RSS should level off after warm-up.
+
+    python benchmarks/heatmap_soak.py --renders 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Set up Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stats_tracker.settings')
+django.setup()
+
+import numpy as np
+
+from games.heatmap import render_png
+
+ACTIONS = ["made_two", "missed_two", "made_three", "missed_three"]
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def random_shots(rng, n):
+    xs = rng.normal(0, 90, n)
+    ys = np.abs(rng.normal(120, 90, n))
+    return list(zip(xs.tolist(), ys.tolist(), rng.choice(ACTIONS, n).tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=10000)
+    parser.add_argument("--shots", type=int, default=300, help="shots per heatmap")
+    parser.add_argument("--report-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("🏀 Heatmap Rendering Soak Test")
+    print("=" * 50)
+    rng = np.random.default_rng(0)
+
+    # warm up caches (court raster, fonts, colormaps) before the baseline
+    for _ in range(20):
+        render_png(random_shots(rng, args.shots))
+    baseline = rss_mb()
+    print(f"Baseline RSS after warm-up: {baseline:.1f} MB")
+
+    started = time.perf_counter()
+    for i in range(1, args.renders + 1):
+        render_png(random_shots(rng, args.shots))
+        if i % args.report_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"  {i:>6} renders  RSS {rss_mb():7.1f} MB  ({i / elapsed:.1f} renders/s)")
+
+    growth = rss_mb() - baseline
+    print(f"\n✅ {args.renders} renders, RSS growth {growth:+.1f} MB over baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of ingest -> render -> store: posts games of random
+events through process_game, drains the heatmap job queue and reports the
+throughput of each stage. Heatmaps go to the filesystem (or in-memory)
+storage backend, so no Supabase credentials are needed.
+
+Runs against a throwaway test database created from the configured
+DATABASES (like `manage.py test`), so live data is never touched.
+
+    python benchmarks/ingest_pipeline_benchmark.py --games 20 --players 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import django
+
+# Set up Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stats_tracker.settings')
+django.setup()
+
+import numpy as np
+from django.db import connection
+from django.test import override_settings
+
+from games.heatmap_cache import get_heatmap_cache
+from games.heatmap_storage import get_heatmap_storage
+from games.models import Game, Player, Season
+from games.utility.heatmap_job_util import run_heatmap_jobs
+from games.utility.process_data_util import process_game
+
+ACTIONS = ["made_two", "missed_two", "made_three", "missed_three", "assist", "def_reb", "off_reb", "steal", "block", "turnover"]
+
+
+def game_events(rng, player_ids, season_id, n):
+    return [
+        {"player_id": player_ids[p], "season_id": season_id, "action": ACTIONS[a], "x": x, "y": y}
+        for p, a, x, y in zip(
+            rng.integers(0, len(player_ids), n).tolist(),
+            rng.integers(0, len(ACTIONS), n).tolist(),
+            rng.uniform(-250, 250, n).tolist(),
+            rng.uniform(-50, 420, n).tolist(),
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--events", type=int, default=400, help="events per game")
+    parser.add_argument("--backend", choices=["filesystem", "memory"], default="filesystem")
+    args = parser.parse_args()
+
+    print("🏀 Ingest -> Render -> Store Benchmark")
+    print("=" * 50)
+    location = tempfile.mkdtemp(prefix="heatmaps-")
+    if args.backend == "filesystem":
+        storage = {"BACKEND": "games.heatmap_storage.FileSystemHeatmapStorage", "OPTIONS": {"location": location}}
+    else:
+        storage = {"BACKEND": "games.heatmap_storage.InMemoryHeatmapStorage", "OPTIONS": {}}
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        with override_settings(HEATMAP_STORAGE=storage):
+            get_heatmap_storage.cache_clear()
+            get_heatmap_cache.cache_clear()
+            rng = np.random.default_rng(0)
+            season = Season.objects.create(name="Bench", external_id="bench", start_date="2025-01-01", end_date="2025-12-31")
+            player_ids = [p.id for p in Player.objects.bulk_create(
+                [Player(name=f"Player {i}", external_id=f"bench_player_{i}") for i in range(args.players)]
+            )]
+            games = Game.objects.bulk_create([
+                Game(external_id=f"bench_game_{i}", opponent="Bench", date="2025-07-28") for i in range(args.games)
+            ])
+            payloads = [game_events(rng, player_ids, season.id, args.events) for _ in games]
+
+            started = time.perf_counter()
+            for game, events in zip(games, payloads):
+                process_game(events, game.id, run_eager_jobs=False)
+            ingest = time.perf_counter() - started
+            total_events = args.games * args.events
+            print(f"ingest: {total_events} events in {ingest:.2f}s ({total_events / ingest:,.0f} events/s)")
+
+            started = time.perf_counter()
+            rendered = run_heatmap_jobs()
+            render_store = time.perf_counter() - started
+            print(f"render + store: {rendered} heatmaps in {render_store:.2f}s ({rendered / render_store:.1f}/s)")
+            print(f"end to end: {ingest + render_store:.2f}s")
+            if args.backend == "filesystem":
+                size = sum(entry.stat().st_size for entry in os.scandir(location))
+                print(f"stored: {len(os.listdir(location))} files, {size / 2**20:.1f} MB in {location}")
+        print("\n✅ Done")
+    finally:
+        get_heatmap_storage.cache_clear()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
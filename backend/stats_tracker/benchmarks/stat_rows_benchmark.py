@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for large stat list payloads: times the ModelSerializer +
+JSONRenderer path against the .values() row builder + FastJSONRenderer on
+the same rows, and checks that both produce identical bytes.
+
+Runs against a throwaway test database created from the configured
+DATABASES (like `manage.py test`), so live data is never touched.
+
+    python benchmarks/stat_rows_benchmark.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Set up Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stats_tracker.settings')
+django.setup()
+
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from games.models import Game, Player, PlayerGame, PlayerSeason, Season
+from games.renderers import FastJSONRenderer, orjson
+from games.serializers import PlayerGameSerializer, PlayerSeasonSerializer, values_queryset, values_rows
+
+
+def seed(rows):
+    """Create ``rows`` PlayerGame and PlayerSeason rows spread over 100 players."""
+    season = Season.objects.create(name="Bench", external_id="bench", start_date="2025-01-01", end_date="2025-12-31")
+    players = Player.objects.bulk_create(
+        [Player(name=f"Player {i}", external_id=f"bench_player_{i}") for i in range(100)]
+    )
+    games = Game.objects.bulk_create([
+        Game(external_id=f"bench_game_{i}", opponent="Bench", date="2025-07-28", season=season)
+        for i in range(rows // len(players) + 1)
+    ])
+    zones = {"PAINT": {"makes": 3, "attempts": 5, "fg_pct": 0.6}, "THREE_C": {"makes": 1, "attempts": 4, "fg_pct": 0.25}}
+    PlayerGame.objects.bulk_create([
+        PlayerGame(player_id=players[i % len(players)], game_id=games[i // len(players)],
+                   point=i % 40, assist=i % 9, steal=i % 4, block=i % 3, off_reb=i % 5, def_reb=i % 8,
+                   turnover=i % 6, shot_zone_stats=zones, heatmap_url=f"https://example.com/{i}.png")
+        for i in range(rows)
+    ], batch_size=1000)
+    seasons = Season.objects.bulk_create([
+        Season(name=f"Bench {i}", external_id=f"bench_season_{i}", start_date="2025-01-01", end_date="2025-12-31")
+        for i in range(rows // len(players) + 1)
+    ])
+    PlayerSeason.objects.bulk_create([
+        PlayerSeason(player_id=players[i % len(players)], season_id=seasons[i // len(players)],
+                     games_played=20, point=i % 400 + 0.5, assist=i % 90, shot_zone_stats=zones)
+        for i in range(rows)
+    ], batch_size=1000)
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("🏀 Stat Payload Rendering Benchmark")
+    print("=" * 50)
+    print(f"orjson: {'installed' if orjson else 'not installed (FastJSONRenderer falls back)'}")
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        seed(args.rows)
+        for serializer_class, model in [(PlayerGameSerializer, PlayerGame), (PlayerSeasonSerializer, PlayerSeason)]:
+            queryset = model.objects.select_related("player_id").order_by("id")
+
+            slow, slow_body = best_of(args.repeat, lambda: JSONRenderer().render(
+                serializer_class(queryset.all(), many=True).data
+            ))
+            fast, fast_body = best_of(args.repeat, lambda: FastJSONRenderer().render(
+                values_rows(serializer_class, values_queryset(serializer_class, queryset.all()))
+            ))
+
+            print(f"\n{serializer_class.__name__} ({args.rows} rows, {len(slow_body) / 2**20:.1f} MB)")
+            print(f"  serializer + JSONRenderer:      {slow * 1000:8.1f} ms")
+            print(f"  values rows + FastJSONRenderer: {fast * 1000:8.1f} ms")
+            print(f"  speedup: {slow / fast:.1f}x  identical output: {'✅' if slow_body == fast_body else '❌'}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
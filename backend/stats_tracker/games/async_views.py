@@ -0,0 +1,142 @@
+"""Async variants of the heatmap and event-ingest endpoints.
+
+Plain Django async views (DRF's @api_view is sync-only), served under
+``async/`` and meant for an ASGI server such as ``uvicorn
+stats_tracker.asgi:application``. Reads use the async ORM, matplotlib
+rendering runs on the heatmap render executor and storage uploads go through
+httpx, so a waiting request never holds a worker thread. Responses match
+the sync views in views.py.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import Http404, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .heatmap_cache import acached_heatmap_png
+from .models import Event, Game, Player, Season
+from .partitions import game_event_filter
+from .serializers import EventSerializer
+from .utility.heatmap_job_util import arun_heatmap_jobs
+from .utility.process_data_util import EventReferenceError, process_game
+from .views import BATCH_CONFLICT, _heatmap_data, batched_events, is_batch_conflict
+
+
+async def _heatmap_response(scope, events, not_found, **fields):
+    png, total_events = await acached_heatmap_png(scope, events)
+    if png is None:
+        return JsonResponse({"error": not_found}, status=404)
+    return JsonResponse({"heatmap_data": _heatmap_data(png), **fields, "total_events": total_events})
+
+
+@require_GET
+async def generate_player_heatmap(request, player_id):
+    """Generate heatmap for a player's career"""
+    try:
+        player = await Player.objects.aget(id=player_id)
+    except Player.DoesNotExist:
+        return JsonResponse({"error": "Player not found"}, status=404)
+
+    events = Event.objects.filter(player_id=player_id)
+    try:
+        png, total_events = await acached_heatmap_png(f"player:{player_id}", events)
+    except Exception as e:
+        return JsonResponse({"error": f"Heatmap generation failed: {str(e)}"}, status=500)
+    if png is None:
+        return JsonResponse({"error": f"No events found for player: {player.name}"}, status=404)
+
+    return JsonResponse({
+        "heatmap_data": _heatmap_data(png),
+        "player_name": player.name,
+        "total_events": total_events
+    })
+
+
+@require_GET
+async def generate_season_heatmap(request, season_id, player_id=None):
+    """Generate heatmap for a season (all players or specific player)"""
+    try:
+        season = await Season.objects.aget(id=season_id)
+        if player_id:
+            player = await Player.objects.aget(id=player_id)
+            events = Event.objects.filter(season_id=season_id, player_id=player_id)
+            title = f"{player.name} - {season.name}"
+            scope = f"season:{season_id}:player:{player_id}"
+        else:
+            events = Event.objects.filter(season_id=season_id)
+            title = f"All Players - {season.name}"
+            scope = f"season:{season_id}"
+    except Season.DoesNotExist:
+        return JsonResponse({"error": "Season not found"}, status=404)
+
+    return await _heatmap_response(scope, events, f"No events found for season: {season.name}", title=title)
+
+
+@require_GET
+async def generate_game_heatmap(request, game_id, player_id=None):
+    """Generate heatmap for a game (all players or specific player)"""
+    try:
+        game = await Game.objects.aget(id=game_id)
+        if player_id:
+            player = await Player.objects.aget(id=player_id)
+            events = Event.objects.filter(**game_event_filter(game), player_id=player_id)
+            title = f"{player.name} vs {game.opponent}"
+            scope = f"game:{game_id}:player:{player_id}"
+        else:
+            events = Event.objects.filter(**game_event_filter(game))
+            title = f"All Players vs {game.opponent}"
+            scope = f"game:{game_id}"
+    except Game.DoesNotExist:
+        return JsonResponse({"error": "Game not found"}, status=404)
+
+    return await _heatmap_response(scope, events, f"No events found for game vs {game.opponent}", title=title)
+
+
+@require_GET
+async def generate_player_season_heatmap(request, player_id, season_id):
+    """Generate heatmap for a specific player in a specific season"""
+    try:
+        player = await Player.objects.aget(id=player_id)
+        season = await Season.objects.aget(id=season_id)
+    except (Player.DoesNotExist, Season.DoesNotExist):
+        return JsonResponse({"error": "Player or Season not found"}, status=404)
+
+    events = Event.objects.filter(player_id=player_id, season_id=season_id)
+    return await _heatmap_response(
+        f"season:{season_id}:player:{player_id}", events,
+        "No events found for this player in this season",
+        title=f"{player.name} - {season.name}",
+    )
+
+
+@csrf_exempt
+@require_POST
+async def post_events(request, game_id):
+    """Ingest a game's events; eager heatmap jobs are built concurrently."""
+    try:
+        payload = json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+    serializer = EventSerializer(data=batched_events(payload), many=True)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400, safe=False)
+
+    try:
+        inserted, _ = await sync_to_async(process_game)(serializer.validated_data, game_id, run_eager_jobs=False)
+    except Http404:
+        return JsonResponse({"error": "Game not found"}, status=404)
+    except EventReferenceError as error:
+        return JsonResponse(error.detail, status=400)
+    except IntegrityError as error:
+        if not is_batch_conflict(error):
+            raise
+        return JsonResponse(BATCH_CONFLICT, status=409)
+    if serializer.validated_data and not inserted:
+        return JsonResponse({"message": "Batch already ingested"})
+    if settings.HEATMAP_JOBS_EAGER:
+        await arun_heatmap_jobs()
+    return JsonResponse({"message": "Events processed successfully"})
@@ -0,0 +1,71 @@
+"""ETags for stats endpoints, built from the aggregate rows' version stamps.
+
+Each function takes the view's request and URL kwargs and returns an ETag
+string, or None when the resource does not exist (the view then answers
+as usual). They run before the view, so a matching If-None-Match is
+answered with 304 from a single indexed lookup, without serializing.
+The response cache keys on the same tag, and each is computed once per
+request.
+"""
+import functools
+import hashlib
+
+from django.db.models import Count, Max, Sum
+
+from .models import PlayerCareer, PlayerGame, PlayerSeason, SeasonSummary
+
+
+def _etag(name, *parts, request):
+    # ?fields= and ?cursor= change the body, so they are part of the tag
+    query = request.META.get("QUERY_STRING", "")
+    if query:
+        parts += (hashlib.md5(query.encode()).hexdigest()[:12],)
+    return "-".join([name, *map(str, parts)])
+
+
+def _per_request(etag_func):
+    # condition() passes the Django request, cached_response the DRF one
+    @functools.wraps(etag_func)
+    def wrapper(request, *args, **kwargs):
+        request = getattr(request, "_request", request)
+        tags = request.__dict__.setdefault("_stats_etags", {})
+        if etag_func not in tags:
+            tags[etag_func] = etag_func(request, *args, **kwargs)
+        return tags[etag_func]
+    return wrapper
+
+
+def _row_etag(name, model, request, **lookup):
+    row = model.objects.filter(**lookup).values_list("pk", "version").first()
+    if row is None:
+        return None
+    return _etag(name, *row, request=request)
+
+
+@_per_request
+def player_game_etag(request, game_id, player_id):
+    return _row_etag("pg", PlayerGame, request, game_id=game_id, player_id=player_id)
+
+
+@_per_request
+def player_season_etag(request, season_id, player_id):
+    return _row_etag("ps", PlayerSeason, request, season_id=season_id, player_id=player_id)
+
+
+@_per_request
+def player_career_etag(request, player_id):
+    return _row_etag("pc", PlayerCareer, request, player_id=player_id)
+
+
+@_per_request
+def season_summary_etag(request, season_id):
+    return _row_etag("ss", SeasonSummary, request, season_id=season_id)
+
+
+@_per_request
+def season_players_etag(request, season_id):
+    # versions only grow, so count + version sum + newest id moves on any write
+    stamp = PlayerSeason.objects.filter(season_id=season_id).aggregate(
+        rows=Count("id"), versions=Sum("version"), last=Max("id")
+    )
+    return _etag("sp", season_id, stamp["rows"], stamp["versions"] or 0, stamp["last"] or 0, request=request)
@@ -4,13 +4,142 @@ import matplotlib
 # Set matplotlib to use non-interactive backend to avoid GUI issues
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.patches import Circle, Rectangle, Arc, Polygon, Wedge
 from matplotlib.colors import LinearSegmentedColormap, Normalize
+from collections import namedtuple
+from functools import lru_cache
+import threading
+from PIL import Image
 import io
 
 from .shotzone import ShotZone
 from .models import Event
 
+
+def draw_court(ax=None, color='black', lw=2, outer_lines=False):
+    # If an axes object isn't provided to plot onto, just get current one
+    if ax is None:
+        ax = plt.gca()
+
+    # Create the various parts of an NBA basketball court
+
+    # Create the basketball hoop
+    # Diameter of a hoop is 18" so it has a radius of 9", which is a value
+    # 7.5 in our coordinate system
+    hoop = Circle((0, 0), radius=7.5, linewidth=lw, color=color, fill=False)
+
+    # Create backboard
+    backboard = Rectangle((-30, -7.5), 60, -1, linewidth=lw, color=color)
+
+    # The paint
+    # Create the outer box 0f the paint, width=16ft, height=19ft
+    outer_box = Rectangle((-80, -47.5), 160, 190, linewidth=lw, color=color,
+                        fill=False)
+    # Create the inner box of the paint, widt=12ft, height=19ft
+    inner_box = Rectangle((-60, -47.5), 120, 190, linewidth=lw, color=color,
+                        fill=False)
+
+    # Create free throw top arc
+    top_free_throw = Arc((0, 142.5), 120, 120, theta1=0, theta2=180,
+                        linewidth=lw, color=color, fill=False)
+    # Create free throw bottom arc
+    bottom_free_throw = Arc((0, 142.5), 120, 120, theta1=180, theta2=0,
+                            linewidth=lw, color=color, linestyle='dashed')
+    # Restricted Zone, it is an arc with 4ft radius from center of the hoop
+    restricted = Arc((0, 0), 80, 80, theta1=0, theta2=180, linewidth=lw,
+                    color=color)
+
+    # Three point line
+    # Create the side 3pt lines, they are 14ft long before they begin to arc
+    corner_three_a = Rectangle((-220, -47.5), 0, 140, linewidth=lw,
+                            color=color)
+    corner_three_b = Rectangle((220, -47.5), 0, 140, linewidth=lw, color=color)
+    # 3pt arc - center of arc will be the hoop, arc is 23'9" away from hoop
+    # I just played around with the theta values until they lined up with the 
+    # threes
+    three_arc = Arc((0, 0), 475, 475, theta1=22, theta2=158, linewidth=lw,
+                    color=color)
+
+    # Center Court
+    center_outer_arc = Arc((0, 422.5), 120, 120, theta1=180, theta2=0,
+                        linewidth=lw, color=color)
+    center_inner_arc = Arc((0, 422.5), 40, 40, theta1=180, theta2=0,
+                        linewidth=lw, color=color)
+
+    # List of the court elements to be plotted onto the axes
+    court_elements = [hoop, backboard, outer_box, inner_box, top_free_throw,
+                    bottom_free_throw, restricted, corner_three_a,
+                    corner_three_b, three_arc, center_outer_arc,
+                    center_inner_arc]
+
+    if outer_lines:
+        # Draw the half court line, baseline and side out bound lines
+        outer_lines = Rectangle((-250, -47.5), 500, 470, linewidth=lw,
+                                color=color, fill=False)
+        court_elements.append(outer_lines)
+
+    # Add the court elements onto the axes
+    for element in court_elements:
+        ax.add_patch(element)
+
+    return ax
+
+
+# lightweight stand-in for Event rows, e.g. from values_list("x", "y", "action")
+Shot = namedtuple("Shot", "x y action")
+
+FIGSIZE = (6, 5)
+DPI = 100
+COURT_XLIM = (-250, 250)
+COURT_YLIM = (-47.5, 422.5)
+# court and data layers share one fixed axes rect so their pixels line up
+AXES_RECT = (0.02, 0.02, 0.96, 0.96)
+
+
+def _layer_figure(figsize, dpi, transparent=False):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    if transparent:
+        fig.patch.set_alpha(0)
+    ax = fig.add_axes(AXES_RECT)
+    ax.set_xlim(*COURT_XLIM)
+    ax.set_ylim(*COURT_YLIM)
+    ax.invert_yaxis()
+    ax.axis("off")
+    return fig, ax
+
+
+@lru_cache(maxsize=8)
+def court_background(figsize=FIGSIZE, dpi=DPI):
+    """The court lines rendered once per size/DPI as an RGBA raster."""
+    fig, ax = _layer_figure(figsize, dpi)
+    draw_court(ax)
+    fig.canvas.draw()
+    return Image.fromarray(np.array(fig.canvas.buffer_rgba()))
+
+
+class _LayerFigures(threading.local):
+    """One reusable transparent figure per thread and size for hexbin layers.
+
+    Reusing the figure avoids building a new Figure/Axes per heatmap, and
+    keeps the number of live figures (and their Agg buffers) bounded.
+    """
+
+    def __init__(self):
+        self.figures = {}
+
+    def get(self, figsize, dpi):
+        key = (tuple(figsize), dpi)
+        if key not in self.figures:
+            self.figures[key] = _layer_figure(figsize, dpi, transparent=True)
+        return self.figures[key]
+
+
+_layer_figures = _LayerFigures()
+
+
 class Heatmap:
     def __init__(self, player_id = None, events = []):
         self.player_id = player_id
@@ -22,98 +151,22 @@ class Heatmap:
 
 
     def _draw_court(self, ax=None, color='black', lw=2, outer_lines=False):
-        # If an axes object isn't provided to plot onto, just get current one
-        if ax is None:
-            ax = plt.gca()
-
-        # Create the various parts of an NBA basketball court
-
-        # Create the basketball hoop
-        # Diameter of a hoop is 18" so it has a radius of 9", which is a value
-        # 7.5 in our coordinate system
-        hoop = Circle((0, 0), radius=7.5, linewidth=lw, color=color, fill=False)
-
-        # Create backboard
-        backboard = Rectangle((-30, -7.5), 60, -1, linewidth=lw, color=color)
-
-        # The paint
-        # Create the outer box 0f the paint, width=16ft, height=19ft
-        outer_box = Rectangle((-80, -47.5), 160, 190, linewidth=lw, color=color,
-                            fill=False)
-        # Create the inner box of the paint, widt=12ft, height=19ft
-        inner_box = Rectangle((-60, -47.5), 120, 190, linewidth=lw, color=color,
-                            fill=False)
-
-        # Create free throw top arc
-        top_free_throw = Arc((0, 142.5), 120, 120, theta1=0, theta2=180,
-                            linewidth=lw, color=color, fill=False)
-        # Create free throw bottom arc
-        bottom_free_throw = Arc((0, 142.5), 120, 120, theta1=180, theta2=0,
-                                linewidth=lw, color=color, linestyle='dashed')
-        # Restricted Zone, it is an arc with 4ft radius from center of the hoop
-        restricted = Arc((0, 0), 80, 80, theta1=0, theta2=180, linewidth=lw,
-                        color=color)
-
-        # Three point line
-        # Create the side 3pt lines, they are 14ft long before they begin to arc
-        corner_three_a = Rectangle((-220, -47.5), 0, 140, linewidth=lw,
-                                color=color)
-        corner_three_b = Rectangle((220, -47.5), 0, 140, linewidth=lw, color=color)
-        # 3pt arc - center of arc will be the hoop, arc is 23'9" away from hoop
-        # I just played around with the theta values until they lined up with the 
-        # threes
-        three_arc = Arc((0, 0), 475, 475, theta1=22, theta2=158, linewidth=lw,
-                        color=color)
-
-        # Center Court
-        center_outer_arc = Arc((0, 422.5), 120, 120, theta1=180, theta2=0,
-                            linewidth=lw, color=color)
-        center_inner_arc = Arc((0, 422.5), 40, 40, theta1=180, theta2=0,
-                            linewidth=lw, color=color)
-
-        # List of the court elements to be plotted onto the axes
-        court_elements = [hoop, backboard, outer_box, inner_box, top_free_throw,
-                        bottom_free_throw, restricted, corner_three_a,
-                        corner_three_b, three_arc, center_outer_arc,
-                        center_inner_arc]
-
-        if outer_lines:
-            # Draw the half court line, baseline and side out bound lines
-            outer_lines = Rectangle((-250, -47.5), 500, 470, linewidth=lw,
-                                    color=color, fill=False)
-            court_elements.append(outer_lines)
-
-        # Add the court elements onto the axes
-        for element in court_elements:
-            ax.add_patch(element)
-
-        return ax
-    
-
-    def render_with_hex(self, gridsize=20, mincnt=1):
-        # 1. Draw your court as you already do
-        fig, ax = plt.subplots(figsize=(6, 5))
-        self._draw_court(ax)
-
-        ax.set_xlim(-250, 250)
-        ax.set_ylim(-47.5, 422.5)
-
-        x_min, x_max = ax.get_xlim()
-        y_min, y_max = ax.get_ylim()
-        extent = (x_min, x_max, y_min, y_max)
+        return draw_court(ax, color=color, lw=lw, outer_lines=outer_lines)
 
-        ax.invert_yaxis()
-
-        # 2. Filter out only the shot events and split makes vs. misses
+    def _shot_coords(self):
+        # Filter out only the shot events and split makes vs. misses
         xs_made = [e.x for e in self.events if e.action in ["made_two", "made_three"]]
         ys_made = [e.y for e in self.events if e.action in ["made_two", "made_three"]]
         xs_missed = [e.x for e in self.events if e.action in ["missed_two", "missed_three"]]
         ys_missed = [e.y for e in self.events if e.action in ["missed_two", "missed_three"]]
+        return xs_made, ys_made, xs_missed, ys_missed
+
+    def _draw_hexbins(self, ax, gridsize, mincnt):
+        xs_made, ys_made, xs_missed, ys_missed = self._shot_coords()
+        extent = (*COURT_XLIM, *COURT_YLIM)
 
-        # 3. Grab the exact court extents so your hexbins line up perfectly
-       
-        # 4a. Plot made‐shot density in reds
-        hb_made = ax.hexbin(
+        # Plot made‐shot density in reds
+        ax.hexbin(
             xs_made, ys_made,
             gridsize=gridsize,
             extent=extent,
@@ -122,8 +175,8 @@ class Heatmap:
             alpha=0.6
         )
 
-        # 4b. Plot missed‐shot density in blues (on top)
-        hb_missed = ax.hexbin(
+        # Plot missed‐shot density in blues (on top)
+        ax.hexbin(
             xs_missed, ys_missed,
             gridsize=gridsize,
             extent=extent,
@@ -132,13 +185,52 @@ class Heatmap:
             alpha=0.6
         )
 
+    def render_with_hex(self, gridsize=20, mincnt=1):
+        # Object-oriented API only: pyplot would keep every figure alive in
+        # its global figure manager until explicitly closed.
+        fig = Figure(figsize=FIGSIZE)
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+
+        # 1. Draw your court as you already do
+        self._draw_court(ax)
+
+        ax.set_xlim(*COURT_XLIM)
+        ax.set_ylim(*COURT_YLIM)
+        ax.invert_yaxis()
+
+        # 2. Overlay make/miss densities on the court extents
+        self._draw_hexbins(ax, gridsize, mincnt)
+
         ax.axis("off")
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
-    
-    def save_as_image(self, **kwargs):
-        fig = self.render_with_hex(**kwargs)
+
+    def render_layer(self, gridsize=20, mincnt=1, figsize=FIGSIZE, dpi=DPI):
+        """RGBA raster of just the hexbins, on a transparent background."""
+        fig, ax = _layer_figures.get(figsize, dpi)
+        try:
+            self._draw_hexbins(ax, gridsize, mincnt)
+            fig.canvas.draw()
+            # copy out: the canvas buffer is reused by the next render
+            return np.array(fig.canvas.buffer_rgba())
+        finally:
+            for collection in list(ax.collections):
+                collection.remove()
+
+    def save_as_image(self, gridsize=20, mincnt=1, figsize=FIGSIZE, dpi=DPI):
+        # only the data layer is drawn per image; the court comes from cache
+        layer = Image.fromarray(self.render_layer(gridsize, mincnt, figsize, dpi))
+        image = Image.alpha_composite(court_background(figsize, dpi), layer)
         buf = io.BytesIO()
-        fig.savefig(buf, format='png')
+        image.save(buf, format='png')
         buf.seek(0)
         return buf
+
+
+def render_png(shots, **kwargs):
+    """PNG bytes of the heatmap for ``(x, y, action)`` rows.
+
+    Module-level and free of model instances so process pools can pickle it.
+    """
+    return Heatmap(events=[Shot(*shot) for shot in shots]).save_as_image(**kwargs).getvalue()
@@ -0,0 +1,183 @@
+import asyncio
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.utils.module_loading import import_string
+
+from .heatmap import render_png
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class LocMemHeatmapCache:
+    """In-process LRU of rendered PNGs, evicting oldest entries past max_bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+            return png
+
+    def set(self, key, png):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = png
+            self.size += len(png)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class FileHeatmapCache:
+    """PNGs on disk, evicting least recently used files past max_bytes."""
+
+    def __init__(self, location, max_bytes=DEFAULT_MAX_BYTES):
+        self.location = Path(location)
+        self.location.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.location / (hashlib.sha256(key.encode()).hexdigest() + ".png")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            png = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mtime doubles as last-used time for eviction
+        return png
+
+    def set(self, key, png):
+        if len(png) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        files = []
+        for path in self.location.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class DjangoHeatmapCache:
+    """Stores PNGs in a Django cache alias; eviction is left to that backend."""
+
+    def __init__(self, alias="default", timeout=None, max_entry_bytes=DEFAULT_MAX_BYTES):
+        self.alias = alias
+        self.timeout = timeout
+        self.max_entry_bytes = max_entry_bytes
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, png):
+        if len(png) <= self.max_entry_bytes:
+            caches[self.alias].set(key, png, self.timeout)
+
+
+@lru_cache(maxsize=None)
+def get_heatmap_cache():
+    config = getattr(settings, "HEATMAP_CACHE", {})
+    backend = import_string(config.get("BACKEND", "games.heatmap_cache.LocMemHeatmapCache"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+def events_fingerprint(events):
+    """Cheap stand-in for an event set's contents: (max id, count)."""
+    agg = events.aggregate(max_id=Max("id"), count=Count("id"))
+    return agg["max_id"], agg["count"]
+
+
+def _cache_key(scope, max_id, count, render_kwargs):
+    options = ":".join(f"{k}={v}" for k, v in sorted(render_kwargs.items()))
+    return f"heatmap:{scope}:{max_id}:{count}:{options}"
+
+
+def cached_heatmap_png(scope, events, **render_kwargs):
+    """PNG bytes of the heatmap for ``events``, rendered only on a cache miss.
+
+    Returns ``(png, event_count)``; ``png`` is None when there are no events.
+    """
+    max_id, count = events_fingerprint(events)
+    if not count:
+        return None, 0
+
+    key = _cache_key(scope, max_id, count, render_kwargs)
+    cache = get_heatmap_cache()
+    png = cache.get(key)
+    if png is None:
+        png = render_png(events.values_list("x", "y", "action"), **render_kwargs)
+        cache.set(key, png)
+    return png, count
+
+
+@lru_cache(maxsize=None)
+def render_executor():
+    """Thread pool async views hand matplotlib rendering to."""
+    return ThreadPoolExecutor(
+        max_workers=getattr(settings, "HEATMAP_RENDER_THREADS", 4),
+        thread_name_prefix="heatmap-render",
+    )
+
+
+async def arender_png(shots, **render_kwargs):
+    """``render_png`` on the render executor, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(render_executor(), functools.partial(render_png, shots, **render_kwargs))
+
+
+async def aevents_fingerprint(events):
+    agg = await events.aaggregate(max_id=Max("id"), count=Count("id"))
+    return agg["max_id"], agg["count"]
+
+
+async def acached_heatmap_png(scope, events, **render_kwargs):
+    """Async ``cached_heatmap_png``: async ORM reads, rendering off the loop."""
+    max_id, count = await aevents_fingerprint(events)
+    if not count:
+        return None, 0
+
+    key = _cache_key(scope, max_id, count, render_kwargs)
+    cache = get_heatmap_cache()
+    # file and Django cache backends may block on I/O
+    png = await sync_to_async(cache.get, thread_sensitive=False)(key)
+    if png is None:
+        shots = [row async for row in events.values_list("x", "y", "action")]
+        png = await arender_png(shots, **render_kwargs)
+        await sync_to_async(cache.set, thread_sensitive=False)(key, png)
+    return png, count
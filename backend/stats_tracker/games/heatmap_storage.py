@@ -0,0 +1,139 @@
+"""Where rendered heatmap PNGs are persisted, selected by HEATMAP_STORAGE.
+
+Every backend takes ``(game_id, player_id, image)`` uploads, where ``image``
+is a BytesIO, and returns the URL to store in ``heatmap_url``. Objects are
+named by content hash (``heatmap_object_name``), so an unchanged heatmap
+resolves to the URL it already has. The filesystem and in-memory backends
+serve their images through the ``heatmap_file`` route.
+"""
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from .utility.supabase_utility import (
+    aupload_heatmap_to_supabase,
+    heatmap_object_name,
+    upload_heatmap_to_supabase,
+    upload_heatmaps_to_supabase,
+)
+
+
+class HeatmapStorage:
+    """Base class: backends implement save(), and open() if they serve files."""
+
+    def save(self, game_id, player_id, image):
+        raise NotImplementedError
+
+    def save_many(self, uploads, max_workers=None):
+        """Save many ``(game_id, player_id, image)`` uploads; URLs in input order."""
+        uploads = list(uploads)
+        workers = min(max_workers or settings.HEATMAP_UPLOAD_CONCURRENCY, len(uploads))
+        if workers <= 1:
+            return [self.save(*upload) for upload in uploads]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda upload: self.save(*upload), uploads))
+
+    async def asave(self, game_id, player_id, image):
+        return await sync_to_async(self.save, thread_sensitive=False)(game_id, player_id, image)
+
+    def open(self, name):
+        """A binary file object for a stored image, or None."""
+        return None
+
+
+class SupabaseHeatmapStorage(HeatmapStorage):
+    """Supabase Storage through the pooled client in supabase_utility."""
+
+    def save(self, game_id, player_id, image):
+        return upload_heatmap_to_supabase(game_id, player_id, image)
+
+    def save_many(self, uploads, max_workers=None):
+        return upload_heatmaps_to_supabase(uploads, max_workers)
+
+    async def asave(self, game_id, player_id, image):
+        return await aupload_heatmap_to_supabase(game_id, player_id, image)
+
+
+class _ServedHeatmapStorage(HeatmapStorage):
+    def __init__(self, base_url=""):
+        # prefix for the relative heatmap_file URLs, e.g. "http://localhost:8000"
+        self.base_url = base_url.rstrip("/")
+
+    def url(self, name):
+        return self.base_url + reverse("heatmap_file", args=[name])
+
+
+class FileSystemHeatmapStorage(_ServedHeatmapStorage):
+    """PNG files in a local directory, for running the pipeline offline."""
+
+    def __init__(self, location=None, base_url=""):
+        super().__init__(base_url)
+        self.location = Path(location or Path(settings.BASE_DIR) / "heatmap_files")
+        self.location.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name):
+        return self.location / f"{name}.png"
+
+    def save(self, game_id, player_id, image):
+        image_bytes = image.getvalue()
+        name = heatmap_object_name(game_id, player_id, image_bytes)
+        path = self._path(name)
+        if not path.exists():
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(image_bytes)
+            os.replace(tmp, path)
+        return self.url(name)
+
+    def open(self, name):
+        try:
+            return self._path(name).open("rb")
+        except FileNotFoundError:
+            return None
+
+
+class InMemoryHeatmapStorage(_ServedHeatmapStorage):
+    """Images kept in this process only; for tests and benchmarks."""
+
+    def __init__(self, base_url=""):
+        super().__init__(base_url)
+        self.images = {}
+        self._lock = threading.Lock()
+
+    def save(self, game_id, player_id, image):
+        image_bytes = image.getvalue()
+        name = heatmap_object_name(game_id, player_id, image_bytes)
+        with self._lock:
+            self.images[name] = image_bytes
+        return self.url(name)
+
+    def open(self, name):
+        with self._lock:
+            image_bytes = self.images.get(name)
+        return io.BytesIO(image_bytes) if image_bytes is not None else None
+
+
+@lru_cache(maxsize=None)
+def get_heatmap_storage():
+    config = getattr(settings, "HEATMAP_STORAGE", {})
+    backend = import_string(config.get("BACKEND", "games.heatmap_storage.SupabaseHeatmapStorage"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+def save_heatmap(game_id, player_id, image):
+    return get_heatmap_storage().save(game_id, player_id, image)
+
+
+def save_heatmaps(uploads, max_workers=None):
+    return get_heatmap_storage().save_many(uploads, max_workers)
+
+
+async def asave_heatmap(game_id, player_id, image):
+    return await get_heatmap_storage().asave(game_id, player_id, image)
@@ -0,0 +1,87 @@
+"""Hexagonal binning of shot coordinates without matplotlib.
+
+Reproduces the binning done by ``Axes.hexbin`` (for ``C=None`` and a
+linear scale) so the frontend can draw the same hexes client-side.
+"""
+import math
+
+import numpy as np
+
+from .shotzone import COURT_X_MIN, COURT_X_MAX, COURT_Y_MIN, COURT_Y_MAX
+
+COURT_EXTENT = (COURT_X_MIN, COURT_X_MAX, COURT_Y_MIN, COURT_Y_MAX)
+MADE_ACTIONS = ("made_two", "made_three")
+MISSED_ACTIONS = ("missed_two", "missed_three")
+
+
+def hex_grid(gridsize=20, extent=COURT_EXTENT):
+    """Hex grid geometry as matplotlib lays it out: (nx, ny, xmin, ymin, sx, sy)."""
+    nx = gridsize
+    ny = int(nx / math.sqrt(3))
+    xmin, xmax, ymin, ymax = extent
+    padding = 1.e-9 * (xmax - xmin)
+    xmin -= padding
+    xmax += padding
+    return nx, ny, xmin, ymin, (xmax - xmin) / nx, (ymax - ymin) / ny
+
+
+def hexbin_counts(xs, ys, gridsize=20, extent=COURT_EXTENT, mincnt=1):
+    """Count points per hexagon.
+
+    Returns ``(centers, counts)`` for every hex with at least ``mincnt``
+    points, in the same order matplotlib draws them.
+    """
+    nx, ny, xmin, ymin, sx, sy = hex_grid(gridsize, extent)
+    nx1, ny1 = nx + 1, ny + 1
+    nx2, ny2 = nx, ny
+
+    ix = (np.asarray(xs, float) - xmin) / sx
+    iy = (np.asarray(ys, float) - ymin) / sy
+    # two offset lattices; each point goes to the nearer hex center
+    ix1 = np.round(ix).astype(int)
+    iy1 = np.round(iy).astype(int)
+    ix2 = np.floor(ix).astype(int)
+    iy2 = np.floor(iy).astype(int)
+    # flat indices, plus one so that out-of-range points land in slot 0
+    i1 = np.where((0 <= ix1) & (ix1 < nx1) & (0 <= iy1) & (iy1 < ny1), ix1 * ny1 + iy1 + 1, 0)
+    i2 = np.where((0 <= ix2) & (ix2 < nx2) & (0 <= iy2) & (iy2 < ny2), ix2 * ny2 + iy2 + 1, 0)
+
+    d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+    d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+    bdist = d1 < d2
+
+    counts = np.concatenate([
+        np.bincount(i1[bdist], minlength=1 + nx1 * ny1)[1:],
+        np.bincount(i2[~bdist], minlength=1 + nx2 * ny2)[1:],
+    ])
+
+    centers = np.zeros((len(counts), 2), float)
+    centers[:nx1 * ny1, 0] = np.repeat(np.arange(nx1), ny1)
+    centers[:nx1 * ny1, 1] = np.tile(np.arange(ny1), nx1)
+    centers[nx1 * ny1:, 0] = np.repeat(np.arange(nx2) + 0.5, ny2)
+    centers[nx1 * ny1:, 1] = np.tile(np.arange(ny2), nx2) + 0.5
+    centers[:, 0] *= sx
+    centers[:, 1] *= sy
+    centers[:, 0] += xmin
+    centers[:, 1] += ymin
+
+    keep = counts >= mincnt
+    return centers[keep], counts[keep]
+
+
+def shot_hexbins(shots, gridsize=20, extent=COURT_EXTENT, mincnt=1):
+    """JSON-ready make/miss hexbins for ``(x, y, action)`` shot rows."""
+    shots = list(shots)
+    _, _, _, _, sx, sy = hex_grid(gridsize, extent)
+    layers = {}
+    for layer, actions in (("made", MADE_ACTIONS), ("missed", MISSED_ACTIONS)):
+        xs = [x for x, _, action in shots if action in actions]
+        ys = [y for _, y, action in shots if action in actions]
+        centers, counts = hexbin_counts(xs, ys, gridsize, extent, mincnt)
+        layers[layer] = {"centers": centers.tolist(), "counts": counts.tolist()}
+    return {
+        "gridsize": gridsize,
+        "extent": list(extent),
+        "hex_size": [sx, sy],
+        **layers,
+    }
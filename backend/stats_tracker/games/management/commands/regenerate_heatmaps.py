@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from games.models import HeatmapJob, PlayerCareer, PlayerGame, PlayerSeason
+from games.utility.bulk_heatmap_util import regenerate_heatmaps
+
+
+def heatmap_targets(scope):
+    """(player_id, scope, scope_id) for every aggregate row with a heatmap."""
+    if scope in ("game", "all"):
+        for player_id, game_id in PlayerGame.objects.values_list("player_id", "game_id").iterator():
+            yield player_id, HeatmapJob.Scope.GAME, game_id
+    if scope in ("season", "all"):
+        for player_id, season_id in PlayerSeason.objects.values_list("player_id", "season_id").iterator():
+            yield player_id, HeatmapJob.Scope.SEASON, season_id
+    if scope in ("career", "all"):
+        for player_id in PlayerCareer.objects.values_list("player_id", flat=True).iterator():
+            yield player_id, HeatmapJob.Scope.CAREER, 0
+
+
+class Command(BaseCommand):
+    help = "Re-render heatmaps in bulk across a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scope", choices=["game", "season", "career", "all"], default="all")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+
+    def handle(self, *args, **options):
+        # materialize first so no cursor is open while the pool forks
+        targets = list(heatmap_targets(options["scope"]))
+        self.stdout.write(f"Regenerating {len(targets)} heatmaps")
+        regenerate_heatmaps(targets, workers=options["workers"])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from games.utility.heatmap_job_util import run_heatmap_jobs, run_heatmap_worker
+
+
+class Command(BaseCommand):
+    help = "Render queued heatmaps and store their URLs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls of an empty queue")
+        parser.add_argument("--batch-size", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            processed = run_heatmap_jobs(options["batch_size"])
+            self.stdout.write(f"Processed {processed} heatmap jobs")
+            return
+        self.stdout.write("Heatmap worker started")
+        run_heatmap_worker(options["interval"], options["batch_size"])
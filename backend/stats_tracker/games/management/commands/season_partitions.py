@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games.partitions import (
+    attach_season_partition,
+    detach_season_partition,
+    is_partitioned,
+    partition_name,
+    season_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "List, attach or detach the per-season partitions of games_event (Postgres)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "attach", "detach"])
+        parser.add_argument("season_ids", nargs="*", type=int)
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError("games_event is not partitioned on this database")
+        if options["action"] == "list":
+            for season_id in season_partitions():
+                self.stdout.write(f"{season_id}\t{partition_name(season_id)}")
+            return
+        if not options["season_ids"]:
+            raise CommandError(f"{options['action']} needs at least one season id")
+
+        change = attach_season_partition if options["action"] == "attach" else detach_season_partition
+        for season_id in options["season_ids"]:
+            if change(season_id):
+                self.stdout.write(f"{options['action']}ed {partition_name(season_id)}")
+            else:
+                self.stdout.write(f"{partition_name(season_id)} unchanged")
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_season_summaries(apps, schema_editor):
+    Season = apps.get_model('games', 'Season')
+    SeasonSummary = apps.get_model('games', 'SeasonSummary')
+    PlayerSeason = apps.get_model('games', 'PlayerSeason')
+    Event = apps.get_model('games', 'Event')
+
+    for season in Season.objects.all():
+        totals = PlayerSeason.objects.filter(season_id=season.id).aggregate(
+            points=Sum('point'), games_played=Sum('games_played')
+        )
+        games_count = Event.objects.filter(season_id=season.id).aggregate(n=Count('game', distinct=True))['n']
+        SeasonSummary.objects.create(
+            season_id=season,
+            games_count=games_count or 0,
+            total_points=totals['points'] or 0.0,
+            total_games_played=totals['games_played'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_heatmapjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('games_count', models.IntegerField(default=0)),
+                ('total_points', models.FloatField(default=0.0)),
+                ('total_games_played', models.IntegerField(default=0)),
+                ('season_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='games.season')),
+            ],
+        ),
+        migrations.RunPython(backfill_season_summaries, migrations.RunPython.noop),
+    ]
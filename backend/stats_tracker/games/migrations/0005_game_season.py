@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_game_seasons(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    Event = apps.get_model('games', 'Event')
+    SeasonSummary = apps.get_model('games', 'SeasonSummary')
+
+    first_season = Event.objects.filter(game_id=OuterRef('pk')).order_by('id').values('season_id')[:1]
+    Game.objects.filter(season__isnull=True).update(season_id=Subquery(first_season))
+
+    # season game counts now come from Game.season
+    counts = dict(
+        Game.objects.filter(season__isnull=False).values_list('season_id').annotate(n=Count('id'))
+    )
+    for summary in SeasonSummary.objects.all():
+        summary.games_count = counts.get(summary.season_id_id, 0)
+        summary.save(update_fields=['games_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_seasonsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='season',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='games', to='games.season'),
+        ),
+        migrations.RunPython(backfill_game_seasons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_aggregate_versions'),
+    ]
+
+    operations = [
+        # build the composites before dropping the single-column FK indexes
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['player', 'season'], include=('x', 'y', 'action'), name='event_player_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['game', 'player'], include=('x', 'y', 'action'), name='event_game_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['season', 'game'], include=('x', 'y', 'action'), name='event_season_game_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('action__in', ['made_two', 'made_three', 'missed_two', 'missed_three'])), fields=['season', 'player'], include=('x', 'y', 'action'), name='event_shot_season_player_idx'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='games.game'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='player',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='games.player'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='season',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='games.season'),
+        ),
+    ]
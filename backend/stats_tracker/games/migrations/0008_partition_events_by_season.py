@@ -0,0 +1,94 @@
+# Generated manually to partition games_event by season (Postgres only)
+
+from django.db import migrations
+
+
+def partition_events(apps, schema_editor):
+    """Rebuild games_event as a LIST-partitioned table on season_id.
+
+    The old table's indexes and foreign keys are read back from the catalog
+    and recreated on the partitioned parent, which propagates them to every
+    partition. Postgres requires the partition key in the primary key, so it
+    becomes (id, season_id); ids still come from the same identity/sequence.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    Season = apps.get_model("games", "Season")
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('games_event')")
+        if cursor.fetchone():
+            return
+
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = 'games_event'"
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'games_event'::regclass AND contype IN ('p', 'f')"
+        )
+        constraints = cursor.fetchall()
+        primary_key = next(name for name, kind, _ in constraints if kind == "p")
+        foreign_keys = [(name, definition) for name, kind, definition in constraints if kind == "f"]
+
+        # free the index and constraint names for the new table
+        cursor.execute("ALTER TABLE games_event RENAME TO games_event_unpartitioned")
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE games_event_unpartitioned DROP CONSTRAINT "{name}"')
+        cursor.execute(f'ALTER TABLE games_event_unpartitioned DROP CONSTRAINT "{primary_key}"')
+        for name, _ in indexes:
+            if name != primary_key:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+        cursor.execute(
+            "CREATE TABLE games_event (LIKE games_event_unpartitioned INCLUDING DEFAULTS INCLUDING IDENTITY) "
+            "PARTITION BY LIST (season_id)"
+        )
+        cursor.execute("SELECT pg_get_serial_sequence('games_event', 'id')")
+        if cursor.fetchone()[0]:
+            # identity column: continue numbering after the existing ids
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence('games_event', 'id'), "
+                "COALESCE((SELECT MAX(id) FROM games_event_unpartitioned), 0) + 1, false)"
+            )
+        else:
+            # serial column: keep the old sequence alive past the DROP below
+            cursor.execute("SELECT pg_get_serial_sequence('games_event_unpartitioned', 'id')")
+            sequence = cursor.fetchone()[0]
+            if sequence:
+                cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY games_event.id")
+
+        cursor.execute(f'ALTER TABLE games_event ADD CONSTRAINT "{primary_key}" PRIMARY KEY (id, season_id)')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE games_event ADD CONSTRAINT "{name}" {definition}')
+        for name, definition in indexes:
+            if name != primary_key:
+                cursor.execute(definition.replace(" ON ONLY ", " ON ").replace(
+                    "games_event_unpartitioned", "games_event"
+                ))
+
+        for season_id in Season.objects.values_list("id", flat=True):
+            cursor.execute(
+                f"CREATE TABLE games_event_season_{int(season_id)} PARTITION OF games_event FOR VALUES IN (%s)",
+                [season_id],
+            )
+        cursor.execute("CREATE TABLE games_event_default PARTITION OF games_event DEFAULT")
+
+        cursor.execute("INSERT INTO games_event SELECT * FROM games_event_unpartitioned")
+        cursor.execute("DROP TABLE games_event_unpartitioned")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_event_composite_indexes'),
+    ]
+
+    operations = [
+        # The partitioned table works with every earlier migration's schema,
+        # so unapplying only forgets this step.
+        migrations.RunPython(partition_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_partition_events_by_season'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='batch_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='seq',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('batch_id', 'seq', 'season'), name='unique_event_batch_seq'),
+        ),
+    ]
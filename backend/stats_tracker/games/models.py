@@ -1,6 +1,14 @@
 from django.db import models
 from .shotzone import ShotZone, define_shot_zone
 
+# Raw shot actions get resolved into twos/threes from the shot's court zone.
+SHOT_ACTIONS = {"made_shot", "missed_shot"}
+SHOT_RESULT_ACTIONS = ["made_two", "made_three", "missed_two", "missed_three"]
+THREE_POINT_ZONES = {
+    ShotZone.THREE_L.name, ShotZone.THREE_LC.name, ShotZone.THREE_C.name,
+    ShotZone.THREE_RC.name, ShotZone.THREE_R.name,
+}
+
 # Create your models here.
 class Player(models.Model):
     external_id = models.CharField(max_length=50, unique=True)
@@ -21,6 +29,8 @@ class PlayerCareer(models.Model):
     games_played = models.IntegerField(default=0)
 
     shot_zone_stats = models.JSONField(default=dict)
+    # bumped on every write; served as the resource's ETag
+    version = models.PositiveIntegerField(default=0)
 
 class Season(models.Model):
     external_id = models.CharField(max_length=50, unique=True)
@@ -45,15 +55,29 @@ class PlayerSeason(models.Model):
     turnover = models.FloatField(default=0.0)          
 
     shot_zone_stats = models.JSONField(default=dict)
+    # bumped on every write; served as the resource's ETag
+    version = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ("player_id", "season_id")
 
 
+class SeasonSummary(models.Model):
+    """League-wide season totals, kept current by ingest for cheap reads."""
+    season_id = models.OneToOneField(Season, on_delete=models.CASCADE, related_name="summary")
+
+    games_count = models.IntegerField(default=0)
+    total_points = models.FloatField(default=0.0)
+    total_games_played = models.IntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+
+
 class Game(models.Model):
     external_id = models.CharField(max_length=50, unique=True)
     opponent = models.CharField(max_length=100)
     date = models.DateField()
+    # set from the first events ingested for the game
+    season = models.ForeignKey(Season, on_delete=models.SET_NULL, related_name="games", null=True, blank=True, db_index=True)
 
 class PlayerGame(models.Model):
     player_id = models.ForeignKey(Player, on_delete=models.CASCADE)
@@ -73,6 +97,8 @@ class PlayerGame(models.Model):
 
     # shotzone averages and attempts
     shot_zone_stats = models.JSONField(default=dict)
+    # bumped on every write; served as the resource's ETag
+    version = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ("player_id", "game_id")
@@ -93,35 +119,92 @@ class Event(models.Model):
         MISSED_TWO = "missed_two"
         MISSED_THREE = "missed_three"
 
-    game       = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="events", db_index=True)
-    season     = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="events", db_index=True)
-    player     = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="events", db_index=True)
+    # indexed through the composite indexes in Meta, which lead with each FK
+    game       = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="events", db_index=False)
+    season     = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="events", db_index=False)
+    player     = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="events", db_index=False)
     timestamp  = models.DateTimeField()
     action     = models.CharField(max_length=36, choices=Action.choices)
     x          = models.FloatField()
     y          = models.FloatField()
     shot_zone   = models.CharField(max_length=100, choices= ShotZone.choices, blank=True, null=True, db_index=True)
+    # client-supplied upload key and position, so a replayed batch is skipped
+    batch_id   = models.CharField(max_length=64, blank=True, null=True)
+    seq        = models.PositiveIntegerField(blank=True, null=True)
 
-    def save(self, *args, **kwargs):
-        if self.action in {
-            self.Action.MADE_SHOT, self.Action.MISSED_SHOT,
-        }:
-            # Create a simple object with x_coord and y_coord for the define_shot_zone function
-            class EventCoords:
-                def __init__(self, x, y):
-                    self.x_coord = x
-                    self.y_coord = y
-            
-            event_coords = EventCoords(self.x, self.y)
-            self.shot_zone = define_shot_zone(event_coords).name
-            if self.action == self.Action.MADE_SHOT and  self.shot_zone in {ShotZone.THREE_C, ShotZone.THREE_L, ShotZone.THREE_LC, ShotZone.THREE_R, ShotZone.THREE_RC}:
-                self.action = self.Action.MADE_THREE
-            elif self.action == self.Action.MISSED_SHOT and  self.shot_zone in {ShotZone.THREE_C, ShotZone.THREE_L, ShotZone.THREE_LC, ShotZone.THREE_R, ShotZone.THREE_RC}:
-                self.action = self.Action.MISSED_THREE
-            elif self.action == self.Action.MISSED_SHOT:
-                self.action = self.Action.MISSED_TWO
+    class Meta:
+        # Shaped after the real filters: heatmaps and scope_events go by
+        # (player, season), (game, player), a season or a game, and only read
+        # id/x/y/action, which the covering columns (Postgres) serve from the
+        # index alone. heatmap/bins additionally filters to shot results.
+        indexes = [
+            models.Index(fields=["player", "season"], include=["x", "y", "action"], name="event_player_season_idx"),
+            models.Index(fields=["game", "player"], include=["x", "y", "action"], name="event_game_player_idx"),
+            models.Index(fields=["season", "game"], include=["x", "y", "action"], name="event_season_game_idx"),
+            models.Index(
+                fields=["season", "player"],
+                include=["x", "y", "action"],
+                condition=models.Q(action__in=SHOT_RESULT_ACTIONS),
+                name="event_shot_season_player_idx",
+            ),
+        ]
+        constraints = [
+            # season is the partition key on Postgres, which unique
+            # constraints on a partitioned table must include
+            models.UniqueConstraint(fields=["batch_id", "seq", "season"], name="unique_event_batch_seq"),
+        ]
+
+    def classify(self, zone=None):
+        """Set shot_zone and resolve made/missed shots into twos and threes.
+
+        Bulk inserts skip save(), so the ingest path calls this directly and
+        may pass a precomputed ``zone`` for the event's coordinates.
+        """
+        if self.action in SHOT_ACTIONS:
+            if zone is None:
+                zone = define_shot_zone(self)
+            self.shot_zone = zone.name
+            is_three = self.shot_zone in THREE_POINT_ZONES
+            if self.action == self.Action.MADE_SHOT:
+                self.action = self.Action.MADE_THREE if is_three else self.Action.MADE_TWO
             else:
-                self.action = self.Action.MADE_TWO
+                self.action = self.Action.MISSED_THREE if is_three else self.Action.MISSED_TWO
         else:
             self.shot_zone = None
+        return self
+
+    def save(self, *args, **kwargs):
+        self.classify()
         super().save(*args, **kwargs)
+
+
+class HeatmapJob(models.Model):
+    """A pending heatmap rebuild for one player at game, season or career scope."""
+    class Scope(models.TextChoices):
+        GAME = "game"
+        SEASON = "season"
+        CAREER = "career"
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        FAILED = "failed"
+
+    player     = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="heatmap_jobs")
+    scope      = models.CharField(max_length=16, choices=Scope.choices)
+    scope_id   = models.IntegerField(default=0)  # game or season id, 0 for career
+    status     = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING, db_index=True)
+    attempts   = models.IntegerField(default=0)
+    error      = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # duplicate rebuild requests coalesce into the one pending job
+            models.UniqueConstraint(
+                fields=["player", "scope", "scope_id"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_heatmap_job",
+            ),
+        ]
@@ -0,0 +1,150 @@
+"""Season partitions of the Postgres ``games_event`` table.
+
+Migration 0008 turns ``games_event`` into a table LIST-partitioned on
+``season_id``, with one partition per season plus a default partition.
+Queries filtered by season (or by a game, which carries its season) only
+scan that season's partition. Old seasons can be detached into standalone
+archive tables and attached again later; a deleted season's partition is
+dropped.
+
+Everything here is a no-op on databases other than Postgres and on an
+unpartitioned table, so SQLite development and tests are unaffected.
+"""
+from django.db import connections, transaction
+
+EVENT_TABLE = "games_event"
+DEFAULT_PARTITION = "games_event_default"
+
+
+def partition_name(season_id):
+    return f"games_event_season_{int(season_id)}"
+
+
+def is_partitioned(using="default"):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [EVENT_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def season_partitions(using="default"):
+    """Season ids with a partition currently attached to games_event."""
+    if not is_partitioned(using):
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [EVENT_TABLE],
+        )
+        prefix = partition_name(0)[:-1]
+        return sorted(int(name[len(prefix):]) for (name,) in cursor.fetchall() if name.startswith(prefix))
+
+
+def _table_exists(cursor, table):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table])
+    return cursor.fetchone()[0]
+
+
+def _is_attached(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s) AND inhparent = to_regclass(%s)",
+        [table, EVENT_TABLE],
+    )
+    return cursor.fetchone() is not None
+
+
+def create_season_partition(season_id, using="default"):
+    """Create the partition for a newly created season.
+
+    A new season has no events yet, so a single CREATE ... PARTITION OF is
+    enough; use attach_season_partition to bring back a detached season.
+    """
+    if not is_partitioned(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{partition_name(season_id)}" '
+            f'PARTITION OF "{EVENT_TABLE}" FOR VALUES IN (%s)',
+            [season_id],
+        )
+    return True
+
+
+def attach_season_partition(season_id, using="default"):
+    """Create (or re-attach) the partition for a season.
+
+    Rows for the season that landed in the default partition, e.g. while
+    the season was detached, are moved into it first so the attach is
+    valid. Returns True when a partition was attached.
+    """
+    if not is_partitioned(using):
+        return False
+    name = partition_name(season_id)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        if _table_exists(cursor, name) and _is_attached(cursor, name):
+            return False
+        if not _table_exists(cursor, name):
+            cursor.execute(
+                f'CREATE TABLE "{name}" (LIKE "{EVENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE season_id = %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [season_id],
+        )
+        cursor.execute(f'ALTER TABLE "{EVENT_TABLE}" ATTACH PARTITION "{name}" FOR VALUES IN (%s)', [season_id])
+    return True
+
+
+def detach_season_partition(season_id, using="default"):
+    """Detach a season's partition, keeping it as a standalone archive table.
+
+    The season's events drop out of every query until the partition is
+    attached again; the table can also be dumped and dropped. Returns True
+    when a partition was detached.
+    """
+    if not is_partitioned(using):
+        return False
+    name = partition_name(season_id)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        if not _table_exists(cursor, name) or not _is_attached(cursor, name):
+            return False
+        cursor.execute(f'ALTER TABLE "{EVENT_TABLE}" DETACH PARTITION "{name}"')
+    return True
+
+
+def drop_season_partition(season_id, using="default"):
+    """Detach and drop a deleted season's partition.
+
+    A partition already detached as an archive table is dropped too, since
+    its season is gone. Returns True when a table was dropped.
+    """
+    if not is_partitioned(using):
+        return False
+    name = partition_name(season_id)
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        if not _table_exists(cursor, name):
+            return False
+        if _is_attached(cursor, name):
+            cursor.execute(f'ALTER TABLE "{EVENT_TABLE}" DETACH PARTITION "{name}"')
+        cursor.execute(f'DROP TABLE "{name}"')
+    return True
+
+
+def game_event_filter(game):
+    """Event filters for a game, pinned to its season's partition when known.
+
+    A game takes the season of its first ingested events (process_game), so
+    adding the season lets Postgres skip every other partition.
+    """
+    if game.season_id is None:
+        return {"game_id": game.id}
+    return {"game_id": game.id, "season_id": game.season_id}
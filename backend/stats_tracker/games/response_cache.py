@@ -0,0 +1,112 @@
+"""Read-through cache for the aggregate stat endpoints.
+
+Entries are keyed on the endpoint, its URL kwargs, the query string and the
+current generation of every resource the payload depends on (a player, a
+season or a game). Writers bump those generations through ``invalidate``,
+so only the entries for what they touched stop matching; nothing is
+flushed, and orphaned entries age out with the cache timeout.
+
+The key also holds the view's ETag, built from the database version stamps.
+Generations live in the cache backend, so with a per-process cache such as
+LocMem a write made in another process (the heatmap worker, another web
+worker) never bumps this process's counters; the stamp still moves, so no
+entry older than the database is served, nor 304'd by a matching ETag.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+GENERATION_PREFIX = "stats:gen"
+
+
+def _settings():
+    return getattr(settings, "RESPONSE_CACHE", {})
+
+
+def _cache():
+    return caches[_settings().get("ALIAS", "default")]
+
+
+def _generation_key(resource, resource_id):
+    return f"{GENERATION_PREFIX}:{resource}:{resource_id}"
+
+
+def _new_generation():
+    # never reuse a number an evicted counter may have handed out
+    return time.time_ns()
+
+
+def _generations(cache, keys):
+    found = cache.get_many(keys)
+    missing = {key: _new_generation() for key in keys if key not in found}
+    for key, generation in missing.items():
+        if not cache.add(key, generation, timeout=None):
+            missing[key] = cache.get(key, generation)
+    return [found.get(key, missing.get(key)) for key in keys]
+
+
+def invalidate(players=(), seasons=(), games=()):
+    """Retire cached responses for the given player, season and game ids."""
+    cache = _cache()
+    keys = (
+        [_generation_key("player", pid) for pid in set(players)]
+        + [_generation_key("season", sid) for sid in set(seasons)]
+        + [_generation_key("game", gid) for gid in set(games)]
+    )
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), timeout=None)
+
+
+def cached_response(*depends_on, stamp=None):
+    """Cache a view's 200 responses, keyed on the resources it depends on.
+
+    ``depends_on`` names the URL kwargs that identify resources, e.g.
+    ``cached_response("player_id", "season_id")``. ``stamp`` is the view's
+    ETag function (games.etags); a None stamp (no such row) bypasses the
+    cache. Apply it below ``@api_view`` so the cached payload is rendered
+    per request.
+    """
+    resources = [name.removesuffix("_id") for name in depends_on]
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, **kwargs):
+            if request.method != "GET" or not _settings().get("ENABLED", True):
+                return view(request, **kwargs)
+
+            version = stamp(request, **kwargs) if stamp else ""
+            if version is None:
+                return view(request, **kwargs)
+
+            cache = _cache()
+            generation_keys = [
+                _generation_key(resource, kwargs[name]) for resource, name in zip(resources, depends_on)
+            ]
+            generations = _generations(cache, generation_keys)
+            query = request.META.get("QUERY_STRING", "")
+            raw_key = "|".join([
+                view.__name__,
+                *(f"{name}={kwargs[name]}" for name in sorted(kwargs)),
+                query,
+                version,
+                *map(str, generations),
+            ])
+            key = "stats:resp:" + hashlib.md5(raw_key.encode()).hexdigest()
+
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view(request, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, _settings().get("TIMEOUT", 300))
+            return response
+        return wrapper
+    return decorator
@@ -1,11 +1,43 @@
 from rest_framework import serializers
 
+class EventListSerializer(serializers.ListSerializer):
+    """Rejects events that repeat a ``(batch_id, seq)`` within one payload.
+
+    Otherwise the repeat would be taken for a replay and silently skipped.
+    Errors come back per event, like the field errors.
+    """
+
+    def to_internal_value(self, data):
+        events = super().to_internal_value(data)
+        seen = set()
+        errors = [{} for _ in events]
+        for index, event in enumerate(events):
+            if event.get("batch_id") is None:
+                continue
+            key = (event["batch_id"], event["seq"])
+            if key in seen:
+                errors[index] = {"seq": [f"Duplicate seq {key[1]} in batch {key[0]}."]}
+            seen.add(key)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return events
+
 class EventSerializer(serializers.Serializer):
     player_id = serializers.IntegerField()
     season_id = serializers.IntegerField()
     action = serializers.CharField()
     x = serializers.FloatField()
     y = serializers.FloatField()
+    batch_id = serializers.CharField(max_length=64, required=False)
+    seq = serializers.IntegerField(min_value=0, required=False)
+
+    class Meta:
+        list_serializer_class = EventListSerializer
+
+    def validate(self, attrs):
+        if ("batch_id" in attrs) != ("seq" in attrs):
+            raise serializers.ValidationError("batch_id and seq must be given together.")
+        return attrs
 
     def validate_action(self, value):
         valid_actions = [
@@ -16,10 +48,47 @@ class EventSerializer(serializers.Serializer):
         if value not in valid_actions:
             raise serializers.ValidationError("Invalid action type.")
         return value
+
+class StreamEventSerializer(EventSerializer):
+    """One line of an NDJSON event stream, which can span many games."""
+    game_id = serializers.IntegerField()
+
+from functools import lru_cache
+
 from rest_framework import serializers
-from .models import PlayerGame, PlayerSeason, Game, PlayerCareer, Player, Season
+from .models import PlayerGame, PlayerSeason, Game, PlayerCareer, Player, Season, Event
+
+
+def requested_fields(request):
+    """Field names from a ``?fields=a,b`` query parameter, or None."""
+    if request is None or request.method != "GET":
+        return None
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+class DynamicFieldsMixin:
+    """Limit output to a sparse fieldset, e.g. ``?fields=id,name``.
+
+    Fields come from the ``fields`` kwarg or the request in the serializer
+    context; unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
 
-class PlayerGameSerializer(serializers.ModelSerializer):
+        if fields is None:
+            fields = requested_fields(self.context.get("request"))
+        if isinstance(fields, str):
+            fields = [name.strip() for name in fields.split(",") if name.strip()]
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class PlayerGameSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     player_name = serializers.CharField(source="player_id.name", read_only=True)
     points = serializers.IntegerField(source="point", read_only=True)
     assists = serializers.IntegerField(source="assist", read_only=True)
@@ -31,9 +100,10 @@ class PlayerGameSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PlayerGame
-        fields = "__all__"
+        # version only drives ETags and cache keys
+        exclude = ["version"]
 
-class PlayerSeasonSerializer(serializers.ModelSerializer):
+class PlayerSeasonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     player_name = serializers.CharField(source="player_id.name", read_only=True)
     points = serializers.FloatField(source="point", read_only=True)
     assists = serializers.FloatField(source="assist", read_only=True)
@@ -45,20 +115,29 @@ class PlayerSeasonSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PlayerSeason
-        fields = "__all__"
+        # version only drives ETags and cache keys
+        exclude = ["version"]
 
-class GameSerializer(serializers.ModelSerializer):
+class GameSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Game
         fields = '__all__'
 
-class PlayerSerializer(serializers.ModelSerializer):
+    def validate_season(self, value):
+        # events, their partition and the season totals stay in the old season
+        game = self.instance
+        if game is not None and game.season_id is not None and game.season_id != getattr(value, "id", None):
+            if Event.objects.filter(game_id=game.id, season_id=game.season_id).exists():
+                raise serializers.ValidationError("A game with events cannot change season.")
+        return value
+
+class PlayerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Player
         fields = '__all__'
 
 
-class PlayerCareerStatsSerializer(serializers.ModelSerializer):
+class PlayerCareerStatsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     player_name = serializers.CharField(source="player_id.name", read_only=True)
     points = serializers.FloatField(source="point", read_only=True)
     assists = serializers.FloatField(source="assist", read_only=True)
@@ -93,7 +172,54 @@ class PlayerCareerStatsSerializer(serializers.ModelSerializer):
             "turnovers_per_game": round(obj.turnover / gp, 1),
         }
 
-class SeasonSerializer(serializers.ModelSerializer):
+class SeasonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Season
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+# Plain builtins standing in for the field classes' to_representation.
+_VALUE_CASTS = {
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.CharField: str,
+    serializers.URLField: str,
+    serializers.JSONField: None,
+    serializers.PrimaryKeyRelatedField: None,
+}
+
+
+@lru_cache(maxsize=None)
+def values_columns(serializer_class):
+    """``(key, values() lookup, cast)`` for each field a serializer outputs.
+
+    Only plain and source-dotted model fields are supported; anything that
+    needs an instance (method fields, nested serializers) raises.
+    """
+    columns = []
+    for key, field in serializer_class().fields.items():
+        base = next((cls for cls in type(field).__mro__ if cls in _VALUE_CASTS), None)
+        if base is None:
+            raise TypeError(f"{serializer_class.__name__}.{key} has no values() equivalent")
+        columns.append((key, field.source.replace(".", "__"), _VALUE_CASTS[base]))
+    return tuple(columns)
+
+
+def values_queryset(serializer_class, queryset):
+    return queryset.values(*dict.fromkeys(lookup for _, lookup, _ in values_columns(serializer_class)))
+
+
+def values_rows(serializer_class, values, fields=None):
+    """Build serializer-shaped rows straight from ``.values()`` dicts.
+
+    Produces the same keys, order and types as ``serializer_class(many=True)``
+    without instantiating models or running per-field serializer machinery.
+    """
+    columns = values_columns(serializer_class)
+    if fields:
+        columns = [column for column in columns if column[0] in fields]
+    return [
+        {key: value if cast is None or value is None else cast(value)
+         for key, lookup, cast in columns
+         for value in (row[lookup],)}
+        for row in values
+    ]
@@ -1,6 +1,9 @@
 from enum import Enum, auto
+from functools import lru_cache
 import math
 
+import numpy as np
+
 class ShotZone(Enum):
     MID_L = auto()
     MID_LC = auto()
@@ -21,6 +24,15 @@ class ShotZone(Enum):
     def choices(cls):
         return [(member.name, member.name) for member in cls]
 
+
+REST_RADIUS        =   40     # 4 ft
+PAINT_X_OUTER      =   80     # 16 ft box half-width
+PAINT_X_INNER      =   60     # 12 ft inner box half-width
+PAINT_Y_MAX        =  142.5   # free-throw line
+THREE_POINT_RADIUS =  237.5   # 23'9"
+THREE_CORNER_X     =  220     # corner 3 x
+THREE_CORNER_Y     =   92.5   # corner 3 y (matches court lines)
+
 # parameters: x_coord and y_coord of shot
 # returns ShotZone of shot
 def define_shot_zone(event):
@@ -31,14 +43,6 @@ def define_shot_zone(event):
         x = getattr(event, "x_coord", 0)
         y = getattr(event, "y_coord", 0)
 
-    REST_RADIUS        =   40     # 4 ft
-    PAINT_X_OUTER      =   80     # 16 ft box half-width
-    PAINT_X_INNER      =   60     # 12 ft inner box half-width
-    PAINT_Y_MAX        =  142.5   # free-throw line
-    THREE_POINT_RADIUS =  237.5   # 23'9"
-    THREE_CORNER_X     =  220     # corner 3 x
-    THREE_CORNER_Y     =   92.5   # corner 3 y (matches court lines)
-
     r = math.hypot(x, y)
 
     # 1) restricted area
@@ -75,3 +79,101 @@ def define_shot_zone(event):
         return getattr(ShotZone, f"THREE_{side}")
     else:
         return getattr(ShotZone, f"MID_{side}")
+
+
+# zone codes (ShotZone values) per side, ordered L, LC, C, RC, R
+_MID_CODES = np.array([z.value for z in (ShotZone.MID_L, ShotZone.MID_LC, ShotZone.MID_C, ShotZone.MID_RC, ShotZone.MID_R)])
+_THREE_CODES = np.array([z.value for z in (ShotZone.THREE_L, ShotZone.THREE_LC, ShotZone.THREE_C, ShotZone.THREE_RC, ShotZone.THREE_R)])
+
+# parameters: arrays of x and y coords of shots
+# returns array of ShotZone values, matching define_shot_zone element-wise
+def define_shot_zones(xs, ys):
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    abs_x = np.abs(x)
+
+    r = np.hypot(x, y)
+    theta = np.degrees(np.arctan2(x, y))
+
+    # bucket into L, LC, C, RC, R by angle from y-axis, then mid vs three
+    side = np.select([theta < -30, theta < -10, theta <= 10, theta <= 30], [0, 1, 2, 3], default=4)
+    zones = np.where(r >= THREE_POINT_RADIUS, _THREE_CODES[side], _MID_CODES[side])
+
+    # apply the remaining rules from lowest to highest precedence
+    corner = (abs_x >= THREE_CORNER_X) & (y <= THREE_CORNER_Y)
+    zones = np.where(corner, np.where(x < 0, ShotZone.THREE_L.value, ShotZone.THREE_R.value), zones)
+
+    paint = (y <= PAINT_Y_MAX) & (abs_x <= PAINT_X_OUTER)
+    paint_zones = np.where(
+        abs_x <= PAINT_X_INNER,
+        ShotZone.PAINT_C.value,
+        np.where(x < 0, ShotZone.PAINT_L.value, ShotZone.PAINT_R.value),
+    )
+    zones = np.where(paint, paint_zones, zones)
+
+    zones = np.where(r <= REST_RADIUS, ShotZone.REST_AREA.value, zones)
+    return zones.astype(np.uint8)
+
+
+# Court lookup raster: zone codes precomputed over the court extent so that
+# classification is an index lookup. Cells a zone boundary passes through
+# are marked ambiguous and fall back to the exact classifier.
+COURT_X_MIN, COURT_X_MAX = -250, 250
+COURT_Y_MIN, COURT_Y_MAX = -47.5, 422.5
+RASTER_RESOLUTION = 0.5
+_AMBIGUOUS = 0  # ShotZone values start at 1
+
+@lru_cache(maxsize=None)
+def zone_raster():
+    res = RASTER_RESOLUTION
+    nx = int(round((COURT_X_MAX - COURT_X_MIN) / res))
+    ny = int(round((COURT_Y_MAX - COURT_Y_MIN) / res))
+    gx, gy = np.meshgrid(
+        COURT_X_MIN + res * (np.arange(nx) + 0.5),
+        COURT_Y_MIN + res * (np.arange(ny) + 0.5),
+        indexing="ij",
+    )
+    raster = define_shot_zones(gx, gy)
+
+    # anything within a cell's reach of a boundary may straddle it
+    # (half the cell diagonal is ~0.71 * res)
+    reach = res
+    r = np.hypot(gx, gy)
+    abs_x = np.abs(gx)
+    near = (
+        (np.abs(r - REST_RADIUS) <= reach)
+        | (np.abs(r - THREE_POINT_RADIUS) <= reach)
+        | (np.abs(abs_x - PAINT_X_OUTER) <= reach)
+        | (np.abs(abs_x - PAINT_X_INNER) <= reach)
+        | (np.abs(abs_x - THREE_CORNER_X) <= reach)
+        | (np.abs(gy - PAINT_Y_MAX) <= reach)
+        | (np.abs(gy - THREE_CORNER_Y) <= reach)
+        | (abs_x <= reach)
+    )
+    for deg in (10, 30):
+        t = math.radians(deg)
+        near |= np.abs(abs_x * math.cos(t) - gy * math.sin(t)) <= reach
+
+    raster[near] = _AMBIGUOUS
+    raster.setflags(write=False)
+    return raster
+
+# parameters: arrays of x and y coords of shots
+# returns array of ShotZone values via the court raster, exact near boundaries
+def lookup_shot_zones(xs, ys):
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    raster = zone_raster()
+    nx, ny = raster.shape
+
+    ix = np.floor((x - COURT_X_MIN) / RASTER_RESOLUTION)
+    iy = np.floor((y - COURT_Y_MIN) / RASTER_RESOLUTION)
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+
+    zones = np.full(x.shape, _AMBIGUOUS, dtype=np.uint8)
+    zones[inside] = raster[ix[inside].astype(np.intp), iy[inside].astype(np.intp)]
+
+    fallback = zones == _AMBIGUOUS
+    if fallback.any():
+        zones[fallback] = define_shot_zones(x[fallback], y[fallback])
+    return zones
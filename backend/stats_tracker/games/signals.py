@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Season
+from .partitions import create_season_partition, drop_season_partition
+
+
+@receiver(post_save, sender=Season)
+def add_season_partition(sender, instance, created, using, raw=False, **kwargs):
+    """Give a new season its own games_event partition (Postgres only)."""
+    if created and not raw:
+        create_season_partition(instance.id, using=using)
+
+
+@receiver(post_delete, sender=Season)
+def remove_season_partition(sender, instance, using, **kwargs):
+    """Drop a deleted season's games_event partition (Postgres only).
+
+    The drop waits for the commit: Postgres refuses to drop a table with
+    deferred FK checks still pending in the transaction, and a rolled-back
+    delete keeps its partition.
+    """
+    season_id = instance.id
+    transaction.on_commit(lambda: drop_season_partition(season_id, using=using), using=using)
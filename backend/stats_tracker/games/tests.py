@@ -1,8 +1,37 @@
 
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Player, Game, Season, PlayerCareer
+from rest_framework.renderers import JSONRenderer
+from .models import Player, Game, Season, PlayerCareer, PlayerGame, PlayerSeason, Event, HeatmapJob, SeasonSummary
+from .utility.heatmap_job_util import claim_heatmap_jobs, run_heatmap_jobs, arun_heatmap_jobs, store_heatmap_url
+from .utility.bulk_heatmap_util import regenerate_heatmaps
+from .utility import supabase_utility
+from .heatmap import Heatmap, Shot, court_background
+from .heatmap_cache import LocMemHeatmapCache, FileHeatmapCache, get_heatmap_cache
+from .heatmap_storage import get_heatmap_storage, save_heatmap
+from .hexbin import hexbin_counts, COURT_EXTENT
+from .partitions import drop_season_partition, game_event_filter, is_partitioned, partition_name, season_partitions
+from .renderers import FastJSONRenderer
+from .views import is_batch_conflict
+from .serializers import PlayerGameSerializer, PlayerSeasonSerializer, values_queryset, values_rows
+from .shotzone import ShotZone, define_shot_zone, define_shot_zones, lookup_shot_zones
 
 class PlayerTests(APITestCase):
     def test_create_player(self):
@@ -62,6 +91,92 @@ class GameTests(APITestCase):
         response = self.client.post(url, data, format="json")
         self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST])
 
+    def test_post_events_bulk_ingest(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_6", opponent="Team F")
+        player = Player.objects.create(name="Shooter", external_id="player_7")
+        season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_6"
+        )
+        url = reverse("post_events", args=[game.id])
+        data = {
+            "events": [
+                {"player_id": player.id, "season_id": season.id, "action": "made_shot", "x": 0, "y": 300},
+                {"player_id": player.id, "season_id": season.id, "action": "made_shot", "x": 0, "y": 10},
+                {"player_id": player.id, "season_id": season.id, "action": "missed_shot", "x": 0, "y": 10},
+                {"player_id": player.id, "season_id": season.id, "action": "assist", "x": 0, "y": 0},
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Event.objects.filter(game=game).count(), 4)
+        self.assertEqual(
+            sorted(Event.objects.values_list("action", flat=True)),
+            ["assist", "made_three", "made_two", "missed_two"],
+        )
+        pg = PlayerGame.objects.get(game_id=game, player_id=player)
+        self.assertEqual(pg.point, 5)
+        self.assertEqual(pg.assist, 1)
+        self.assertEqual(pg.shot_zone_stats["REST_AREA"]["attempts"], 2)
+        self.assertEqual(pg.shot_zone_stats["THREE_C"]["makes"], 1)
+
+    def test_post_events_applies_deltas(self):
+        games = [
+            Game.objects.create(date="2025-07-28", external_id=f"game_delta_{i}", opponent="Team G")
+            for i in range(2)
+        ]
+        player = Player.objects.create(name="Delta Player", external_id="player_8")
+        season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_7"
+        )
+
+        def post(game, action, x=0, y=10):
+            data = {"events": [{"player_id": player.id, "season_id": season.id, "action": action, "x": x, "y": y}]}
+            response = self.client.post(reverse("post_events", args=[game.id]), data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        post(games[0], "made_shot")
+        post(games[0], "missed_shot")
+        post(games[1], "made_shot", y=300)
+
+        pg = PlayerGame.objects.get(game_id=games[0], player_id=player)
+        self.assertEqual(pg.point, 2)
+        self.assertEqual(pg.shot_zone_stats["REST_AREA"], {"makes": 1, "attempts": 2, "fg_pct": 0.5})
+
+        ps = PlayerSeason.objects.get(season_id=season, player_id=player)
+        career = PlayerCareer.objects.get(player_id=player)
+        for aggregate in (ps, career):
+            self.assertEqual(aggregate.games_played, 2)
+            self.assertEqual(aggregate.point, 5)
+            self.assertEqual(aggregate.shot_zone_stats["REST_AREA"]["attempts"], 2)
+            self.assertEqual(aggregate.shot_zone_stats["THREE_C"]["makes"], 1)
+
+    def test_post_events_rejects_unknown_game_player_and_season(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_refs", opponent="Team H")
+        player = Player.objects.create(name="Known Player", external_id="player_refs")
+        season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_refs"
+        )
+
+        def post(game_id, player_id, season_id):
+            data = {"events": [{"player_id": player_id, "season_id": season_id, "action": "assist", "x": 0, "y": 0}]}
+            return self.client.post(reverse("post_events", args=[game_id]), data, format="json")
+
+        self.assertEqual(post(game.id + 100, player.id, season.id).status_code, status.HTTP_404_NOT_FOUND)
+        response = post(game.id, player.id + 100, season.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data), ["player_id"])
+        response = post(game.id, player.id, season.id + 100)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data), ["season_id"])
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(PlayerGame.objects.exists())
+
     def test_get_game(self):
         game = Game.objects.create(date="2025-07-28", external_id="game_3", opponent="Team C")
         url = reverse("get_game", args=[game.id])
@@ -75,6 +190,27 @@ class GameTests(APITestCase):
         response = self.client.patch(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_game_with_events_keeps_its_season(self):
+        seasons = [
+            Season.objects.create(name="S", external_id=f"season_move_{i}", start_date="2025-01-01", end_date="2025-12-31")
+            for i in range(2)
+        ]
+        game = Game.objects.create(date="2025-07-28", external_id="game_move", opponent="Team M", season=seasons[0])
+        url = reverse("update_game", args=[game.id])
+        # no events yet: the season can still be corrected
+        self.assertEqual(self.client.patch(url, {"season": seasons[1].id}, format="json").status_code, status.HTTP_200_OK)
+        player = Player.objects.create(name="Mover", external_id="player_move")
+        data = {"events": [{"player_id": player.id, "season_id": seasons[1].id, "action": "assist", "x": 0, "y": 0}]}
+        self.client.post(reverse("post_events", args=[game.id]), data, format="json")
+
+        response = self.client.patch(url, {"season": seasons[0].id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("season", response.data)
+        self.assertEqual(self.client.patch(url, {"season": None}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.patch(url, {"opponent": "Team N"}, format="json").status_code, status.HTTP_200_OK)
+        game.refresh_from_db()
+        self.assertEqual((game.season_id, game.opponent), (seasons[1].id, "Team N"))
+
     def test_delete_game(self):
         game = Game.objects.create(date="2025-07-28", external_id="game_5", opponent="Team E")
         url = reverse("delete_game", args=[game.id])
@@ -82,6 +218,1041 @@ class GameTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Game.objects.count(), 0)
 
+class HeatmapJobTests(APITestCase):
+    def setUp(self):
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_jobs", opponent="Team H")
+        self.player = Player.objects.create(name="Job Player", external_id="player_jobs")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_jobs"
+        )
+
+    def post_shot(self):
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        response = self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ingest_enqueues_coalesced_jobs(self):
+        self.post_shot()
+        self.post_shot()
+        self.assertEqual(
+            sorted(HeatmapJob.objects.values_list("scope", "scope_id")),
+            [("career", 0), ("game", self.game.id), ("season", self.season.id)],
+        )
+
+    def test_unchanged_heatmap_url_is_not_rewritten(self):
+        self.post_shot()
+        run_heatmap_jobs()
+        player_game = PlayerGame.objects.get(player_id=self.player)
+        store_heatmap_url(self.player.id, HeatmapJob.Scope.GAME, self.game.id, player_game.heatmap_url)
+        self.assertEqual(PlayerGame.objects.get(player_id=self.player).version, player_game.version)
+        store_heatmap_url(self.player.id, HeatmapJob.Scope.GAME, self.game.id, "https://example.com/new")
+        self.assertEqual(PlayerGame.objects.get(player_id=self.player).version, player_game.version + 1)
+
+    def test_run_jobs_stores_heatmap_urls(self):
+        self.post_shot()
+        self.assertEqual(run_heatmap_jobs(), 3)
+        self.assertFalse(HeatmapJob.objects.exists())
+        self.assertTrue(PlayerGame.objects.get(player_id=self.player).heatmap_url)
+        self.assertTrue(PlayerSeason.objects.get(player_id=self.player).heatmap_url)
+        self.assertTrue(PlayerCareer.objects.get(player_id=self.player).heatmap_url)
+
+    def backdate_jobs(self, seconds):
+        HeatmapJob.objects.update(updated_at=timezone.now() - timedelta(seconds=seconds))
+
+    @override_settings(HEATMAP_JOB_STALE_AFTER=600, HEATMAP_JOB_MAX_ATTEMPTS=2)
+    def test_stale_running_jobs_are_reclaimed(self):
+        self.post_shot()
+        # a worker claimed the jobs and died
+        self.assertEqual(len(claim_heatmap_jobs(20)), 3)
+        self.assertEqual(run_heatmap_jobs(), 0)
+        self.backdate_jobs(601)
+        self.assertEqual(run_heatmap_jobs(), 3)
+        self.assertFalse(HeatmapJob.objects.exists())
+        self.assertTrue(PlayerCareer.objects.get(player_id=self.player).heatmap_url)
+
+        # one claimed as often as allowed is given up on
+        self.post_shot()
+        claim_heatmap_jobs(20)
+        HeatmapJob.objects.update(attempts=2)
+        self.backdate_jobs(601)
+        self.assertEqual(claim_heatmap_jobs(20), [])
+        self.assertEqual(set(HeatmapJob.objects.values_list("status", flat=True)), {HeatmapJob.Status.FAILED})
+
+    @override_settings(HEATMAP_JOB_RETRY_DELAY=60, HEATMAP_JOB_MAX_ATTEMPTS=2)
+    def test_failed_jobs_are_retried_until_max_attempts(self):
+        self.post_shot()
+        with mock.patch("games.utility.heatmap_job_util.build_heatmap", side_effect=RuntimeError("upload failed")):
+            self.assertEqual(run_heatmap_jobs(), 3)
+            self.assertEqual(
+                set(HeatmapJob.objects.values_list("status", "attempts", "error")),
+                {(HeatmapJob.Status.FAILED, 1, "upload failed")},
+            )
+            # not before the retry delay
+            self.assertEqual(run_heatmap_jobs(), 0)
+            self.backdate_jobs(61)
+            self.assertEqual(run_heatmap_jobs(), 3)
+        self.backdate_jobs(61)
+        # out of attempts: left failed for inspection
+        self.assertEqual(run_heatmap_jobs(), 0)
+        self.assertEqual(set(HeatmapJob.objects.values_list("status", "attempts")), {(HeatmapJob.Status.FAILED, 2)})
+
+        with self.settings(HEATMAP_JOB_MAX_ATTEMPTS=3):
+            self.assertEqual(run_heatmap_jobs(), 3)
+        self.assertFalse(HeatmapJob.objects.exists())
+        self.assertTrue(PlayerGame.objects.get(player_id=self.player).heatmap_url)
+
+class StreamIngestTests(APITestCase):
+    def setUp(self):
+        self.games = [
+            Game.objects.create(date="2025-07-28", external_id=f"game_stream_{i}", opponent="Team N") for i in range(2)
+        ]
+        self.player = Player.objects.create(name="Stream Player", external_id="player_stream")
+        self.season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_stream"
+        )
+
+    def line(self, game_id, action="made_two", **fields):
+        event = {"game_id": game_id, "player_id": self.player.id, "season_id": self.season.id,
+                 "action": action, "x": 0, "y": 10, **fields}
+        return json.dumps(event)
+
+    def post_stream(self, lines):
+        body = "\n".join(lines) + "\n"
+        return self.client.generic("POST", reverse("post_events_stream"), body, content_type="application/x-ndjson")
+
+    @override_settings(STREAM_INGEST_CHUNK_SIZE=2)
+    def test_stream_ingests_events_across_games_in_chunks(self):
+        first, second = self.games
+        lines = [self.line(first.id), "", self.line(first.id), self.line(second.id), self.line(first.id, "assist")]
+        response = self.post_stream(lines)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["events"], 4)
+        self.assertEqual(response.data["games"], 2)
+
+        self.assertEqual(Event.objects.count(), 4)
+        first_game = PlayerGame.objects.get(player_id=self.player, game_id=first)
+        self.assertEqual((first_game.point, first_game.assist), (4, 1))
+        season = PlayerSeason.objects.get(player_id=self.player, season_id=self.season)
+        self.assertEqual((season.point, season.games_played), (6, 2))
+        self.assertEqual(HeatmapJob.objects.count(), 4)
+
+    @override_settings(STREAM_INGEST_CHUNK_SIZE=2)
+    def test_invalid_line_rejects_the_whole_stream(self):
+        first, _ = self.games
+        lines = [self.line(first.id), self.line(first.id), self.line(first.id, "dunk")]
+        response = self.post_stream(lines)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["line"], 3)
+        self.assertIn("action", response.data["errors"])
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(PlayerGame.objects.exists())
+
+    def test_malformed_json_and_unknown_game(self):
+        response = self.post_stream([self.line(self.games[0].id), "{not json"])
+        self.assertEqual((response.status_code, response.data["line"]), (400, 2))
+        response = self.post_stream([self.line(self.games[0].id + 100)])
+        self.assertEqual((response.status_code, response.data["line"]), (400, 1))
+        self.assertFalse(Event.objects.exists())
+
+    @override_settings(STREAM_INGEST_CHUNK_SIZE=2)
+    def test_unknown_player_rejects_the_whole_stream(self):
+        first, second = self.games
+        lines = [self.line(first.id), self.line(second.id), self.line(first.id), self.line(second.id, player_id=self.player.id + 100)]
+        response = self.post_stream(lines)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["line"], 4)
+        self.assertEqual(list(response.data["errors"]), ["player_id"])
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(PlayerGame.objects.exists())
+
+    def test_unknown_season_rejects_the_whole_stream(self):
+        first, _ = self.games
+        response = self.post_stream([self.line(first.id), self.line(first.id, season_id=self.season.id + 100)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["line"], 2)
+        self.assertEqual(list(response.data["errors"]), ["season_id"])
+        self.assertFalse(Event.objects.exists())
+
+
+class BatchIngestTests(APITestCase):
+    def setUp(self):
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_batch", opponent="Team B")
+        self.player = Player.objects.create(name="Batch Player", external_id="player_batch")
+        self.season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_batch"
+        )
+
+    def post_batch(self, actions, **payload):
+        events = [
+            {"player_id": self.player.id, "season_id": self.season.id, "action": action, "x": 0, "y": 10}
+            for action in actions
+        ]
+        return self.client.post(reverse("post_events", args=[self.game.id]), {"events": events, **payload}, format="json")
+
+    def test_replayed_batch_is_skipped_without_aggregation(self):
+        self.post_batch(["made_two", "assist"], batch_id="upload-1")
+        with self.assertNumQueries(1):
+            response = self.post_batch(["made_two", "assist"], batch_id="upload-1")
+        self.assertEqual(response.data["message"], "Batch already ingested")
+        self.assertEqual(Event.objects.count(), 2)
+        player_game = PlayerGame.objects.get(player_id=self.player)
+        self.assertEqual((player_game.point, player_game.assist), (2, 1))
+        self.assertEqual(PlayerSeason.objects.get(player_id=self.player).point, 2)
+
+    def test_partially_replayed_batch_only_adds_new_events(self):
+        self.post_batch(["made_two", "assist"], batch_id="upload-2")
+        response = self.post_batch(["made_two", "assist", "made_three"], batch_id="upload-2")
+        self.assertEqual(response.data["message"], "Events processed successfully")
+        self.assertEqual(sorted(Event.objects.values_list("seq", flat=True)), [0, 1, 2])
+        self.assertEqual(PlayerGame.objects.get(player_id=self.player).point, 5)
+
+    def test_unbatched_events_are_always_ingested(self):
+        self.post_batch(["made_two"])
+        self.post_batch(["made_two"])
+        self.assertEqual(PlayerGame.objects.get(player_id=self.player).point, 4)
+
+    def test_seq_requires_batch_id(self):
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "assist",
+                            "x": 0, "y": 10, "seq": 0}]}
+        response = self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_colliding_seq_in_one_batch_is_rejected(self):
+        events = [
+            {"player_id": self.player.id, "season_id": self.season.id, "action": "made_two", "x": 0, "y": 10, "seq": 1},
+            {"player_id": self.player.id, "season_id": self.season.id, "action": "made_two", "x": 0, "y": 10},
+        ]
+        response = self.client.post(
+            reverse("post_events", args=[self.game.id]), {"events": events, "batch_id": "upload-4"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("seq", response.data[1])
+        self.assertFalse(Event.objects.exists())
+
+    def test_streamed_batch_replay_is_skipped(self):
+        lines = "".join(
+            json.dumps({"game_id": self.game.id, "player_id": self.player.id, "season_id": self.season.id,
+                        "action": "made_two", "x": 0, "y": 10, "batch_id": "stream-1", "seq": seq}) + "\n"
+            for seq in range(3)
+        )
+        # the replay reports no new events
+        for expected in (3, 0):
+            response = self.client.generic("POST", reverse("post_events_stream"), lines, content_type="application/x-ndjson")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["events"], expected)
+        self.assertEqual(PlayerGame.objects.get(player_id=self.player).point, 6)
+
+    def test_unique_constraint_rejects_duplicate_keys(self):
+        self.post_batch(["assist"], batch_id="upload-3")
+        event = Event.objects.get()
+        event.pk = None
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            event.save()
+        self.assertTrue(is_batch_conflict(raised.exception))
+
+    def test_other_integrity_errors_are_not_batch_conflicts(self):
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            # no timestamp: a NOT NULL violation whose detail still shows the batch_id
+            Event.objects.create(
+                player=self.player, game=self.game, season=self.season,
+                action="assist", x=0, y=0, batch_id="batch_id", seq=0, timestamp=None,
+            )
+        self.assertFalse(is_batch_conflict(raised.exception))
+
+
+class BulkRegenerateTests(TransactionTestCase):
+    # outside a test transaction, regenerate_heatmaps really closes the
+    # connection before the pool forks and must reopen it to store the URLs
+    def test_regenerate_heatmaps_in_process_pool(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_pool", opponent="Team P")
+        player = Player.objects.create(name="Pool Player", external_id="player_pool")
+        season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_pool"
+        )
+        data = {"events": [{"player_id": player.id, "season_id": season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        self.client.post(reverse("post_events", args=[game.id]), data, content_type="application/json")
+        PlayerSeason.objects.update(heatmap_url=None)
+        rendered = regenerate_heatmaps([(player.id, HeatmapJob.Scope.SEASON, season.id)], workers=1)
+        self.assertEqual(rendered, 1)
+        self.assertTrue(PlayerSeason.objects.get(player_id=player).heatmap_url)
+
+    def test_regenerate_heatmaps_inside_atomic_block(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_pool_atomic", opponent="Team P")
+        player = Player.objects.create(name="Atomic Player", external_id="player_pool_atomic")
+        season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_pool_atomic"
+        )
+        data = {"events": [{"player_id": player.id, "season_id": season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        self.client.post(reverse("post_events", args=[game.id]), data, content_type="application/json")
+        with transaction.atomic():
+            PlayerSeason.objects.update(heatmap_url=None)
+            self.assertEqual(regenerate_heatmaps([(player.id, HeatmapJob.Scope.SEASON, season.id)], workers=1), 1)
+            # the caller's transaction is still usable
+            self.assertTrue(PlayerSeason.objects.get(player_id=player).heatmap_url)
+
+class StorageStandIn(BaseHTTPRequestHandler):
+    """Local stand-in for the Supabase Storage upload and delete endpoints."""
+    protocol_version = "HTTP/1.1"
+    rejected_buckets = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        bucket = self.path.split("/")[4]
+        self.server.requests.append((self.path, self.client_address))
+        status_code = 400 if bucket in self.rejected_buckets else 200
+        body = b"{}"
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_DELETE(self):
+        self.server.deleted.append(self.path)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SupabaseUploadTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StorageStandIn)
+        self.server.requests = []
+        self.server.deleted = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        env = {"SUPABASE_URL": f"http://127.0.0.1:{self.server.server_port}", "SUPABASE_SERVICE_ROLE_KEY": "key"}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(supabase_utility.reset_storage_client)
+        self.addCleanup(setattr, StorageStandIn, "rejected_buckets", set())
+        supabase_utility.reset_storage_client()
+        manifest_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(manifest_dir.cleanup)
+        self.manifest_path = os.path.join(manifest_dir.name, "uploads.jsonl")
+        manifest_settings = override_settings(HEATMAP_UPLOAD_MANIFEST=self.manifest_path)
+        manifest_settings.enable()
+        self.addCleanup(manifest_settings.disable)
+
+    def object_name(self, game_id, png=b"png"):
+        return supabase_utility.heatmap_object_name(game_id, 7, png)
+
+    @override_settings(HEATMAP_UPLOAD_CONCURRENCY=4)
+    def test_batch_upload_reuses_pooled_connections(self):
+        uploads = [(game_id, 7, io.BytesIO(b"png")) for game_id in range(20)]
+        urls = supabase_utility.upload_heatmaps_to_supabase(uploads)
+        base = f"http://127.0.0.1:{self.server.server_port}/storage/v1/object/public/heatmap"
+        self.assertEqual(urls, [f"{base}/{self.object_name(game_id)}" for game_id in range(20)])
+        self.assertEqual(len(self.server.requests), 20)
+        # at most one connection per concurrent upload, reused across the batch
+        self.assertLessEqual(len({address for _, address in self.server.requests}), 4)
+        self.assertIs(supabase_utility.get_storage_client(), supabase_utility.get_storage_client())
+
+    def test_remembers_the_bucket_that_accepted_the_upload(self):
+        StorageStandIn.rejected_buckets = {"heatmap"}
+        first = supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"png"))
+        second = supabase_utility.upload_heatmap_to_supabase(2, 7, io.BytesIO(b"png"))
+        self.assertTrue(first.endswith(f"/object/public/public/{self.object_name(1)}"))
+        self.assertTrue(second.endswith(f"/object/public/public/{self.object_name(2)}"))
+        self.assertEqual(
+            [path for path, _ in self.server.requests],
+            [f"/storage/v1/object/heatmap/{self.object_name(1)}", f"/storage/v1/object/public/{self.object_name(1)}",
+             f"/storage/v1/object/public/{self.object_name(2)}"],
+        )
+
+    def test_unchanged_heatmap_is_not_uploaded_again(self):
+        first = supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"png"))
+        self.assertEqual(supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"png")), first)
+        self.assertEqual(len(self.server.requests), 1)
+        changed = supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"new png"))
+        self.assertNotEqual(changed, first)
+        self.assertEqual(len(self.server.requests), 2)
+        # a fresh process reads the manifest written by this one
+        manifest = supabase_utility.UploadManifest(self.manifest_path)
+        base_url = supabase_utility.get_storage_client().base_url
+        self.assertEqual(manifest.get(f"{base_url}{self.object_name(1, b'new png')}"), changed)
+        self.assertIsNone(manifest.get(f"{base_url}{self.object_name(1)}"))
+
+    def test_async_uploads_share_a_pooled_client(self):
+        async def upload_all():
+            client = supabase_utility.get_async_storage_client()
+            urls = [await supabase_utility.aupload_heatmap_to_supabase(game_id, 7, io.BytesIO(b"png")) for game_id in range(5)]
+            self.assertIs(supabase_utility.get_async_storage_client(), client)
+            await client.aclose()
+            return urls
+
+        urls = async_to_sync(upload_all)()
+        base = f"http://127.0.0.1:{self.server.server_port}/storage/v1/object/public/heatmap"
+        self.assertEqual(urls, [f"{base}/{self.object_name(game_id)}" for game_id in range(5)])
+        # sequential uploads over one keep-alive connection
+        self.assertEqual(len({address for _, address in self.server.requests}), 1)
+
+    def test_async_upload_keeps_manifest_io_off_the_event_loop(self):
+        manifest = supabase_utility.get_upload_manifest()
+        threads = []
+
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+
+        async def upload():
+            loop_thread = threading.get_ident()
+            await supabase_utility.aupload_heatmap_to_supabase(1, 7, io.BytesIO(b"png"))
+            await supabase_utility.get_async_storage_client().aclose()
+            return loop_thread
+
+        with mock.patch.object(manifest, "get", record(manifest.get)), mock.patch.object(manifest, "add", record(manifest.add)):
+            loop_thread = async_to_sync(upload)()
+        # the object lookup and record, then the heatmap's latest object
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(loop_thread, threads)
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+    def test_changed_heatmap_replaces_its_previous_object(self):
+        first = supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"png"))
+        supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"new png"))
+        supabase_utility.upload_heatmap_to_supabase(2, 7, io.BytesIO(b"png"))
+        self.assertEqual(self.server.deleted, [f"/storage/v1/object/heatmap/{self.object_name(1)}"])
+        # the deleted bytes are uploaded again when they come back
+        self.assertEqual(supabase_utility.upload_heatmap_to_supabase(1, 7, io.BytesIO(b"png")), first)
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(self.server.deleted[1:], [f"/storage/v1/object/heatmap/{self.object_name(1, b'new png')}"])
+
+        async def upload_changed():
+            url = await supabase_utility.aupload_heatmap_to_supabase(1, 7, io.BytesIO(b"async png"))
+            await supabase_utility.get_async_storage_client().aclose()
+            return url
+
+        async_to_sync(upload_changed)()
+        self.assertEqual(self.server.deleted[2:], [f"/storage/v1/object/heatmap/{self.object_name(1)}"])
+
+    def test_placeholder_without_credentials(self):
+        with mock.patch.dict(os.environ, {"SUPABASE_URL": ""}):
+            url = supabase_utility.upload_heatmap_to_supabase(3, 7, io.BytesIO(b"png"))
+        self.assertEqual(url, "https://placeholder.com/heatmap-7-3")
+
+
+class HeatmapStorageTests(APITestCase):
+    def setUp(self):
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_storage", opponent="Team S")
+        self.player = Player.objects.create(name="Storage Player", external_id="player_storage")
+        self.season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_storage"
+        )
+        get_heatmap_storage.cache_clear()
+        self.addCleanup(get_heatmap_storage.cache_clear)
+
+    def use_storage(self, backend, **options):
+        storage_settings = override_settings(HEATMAP_STORAGE={"BACKEND": backend, "OPTIONS": options})
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+        get_heatmap_storage.cache_clear()
+        return get_heatmap_storage()
+
+    def test_filesystem_storage_round_trip(self):
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.use_storage("games.heatmap_storage.FileSystemHeatmapStorage", location=location.name)
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        self.assertEqual(run_heatmap_jobs(), 3)
+
+        heatmap_url = PlayerGame.objects.get(player_id=self.player).heatmap_url
+        self.assertTrue(heatmap_url.startswith("/games/heatmap/files/heatmap-"))
+        self.assertEqual(len(os.listdir(location.name)), 3)
+        response = self.client.get(heatmap_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"\x89PNG"))
+
+    def test_in_memory_storage_serves_saved_images(self):
+        storage = self.use_storage("games.heatmap_storage.InMemoryHeatmapStorage", base_url="http://testserver/")
+        url = save_heatmap("career", self.player.id, io.BytesIO(b"png"))
+        self.assertEqual(len(storage.images), 1)
+        self.assertTrue(url.startswith("http://testserver/games/heatmap/files/"))
+        response = self.client.get(url)
+        self.assertEqual(b"".join(response.streaming_content), b"png")
+        missing = self.client.get(reverse("heatmap_file", args=["heatmap-1-career-missing"]))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class HeatmapCacheTests(APITestCase):
+    def test_locmem_cache_evicts_least_recently_used(self):
+        cache = LocMemHeatmapCache(max_bytes=10)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertEqual(cache.size, 8)
+
+    def test_file_cache_round_trip_and_eviction(self):
+        with tempfile.TemporaryDirectory() as location:
+            cache = FileHeatmapCache(location, max_bytes=10)
+            cache.set("a", b"aaaa")
+            self.assertEqual(cache.get("a"), b"aaaa")
+            cache.set("b", b"bbbbbbbb")
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), b"bbbbbbbb")
+
+    def test_heatmap_view_renders_once_per_event_set(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_cache", opponent="Team I")
+        player = Player.objects.create(name="Cache Player", external_id="player_cache")
+        season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_cache"
+        )
+        Event.objects.create(game=game, season=season, player=player, timestamp="2025-07-28T00:00:00Z",
+                             action="made_shot", x=0, y=10)
+        url = reverse("generate_game_heatmap", args=[game.id])
+        with mock.patch.object(Heatmap, "save_as_image", autospec=True, side_effect=Heatmap.save_as_image) as render:
+            first = self.client.get(url)
+            second = self.client.get(url)
+            self.assertEqual(render.call_count, 1)
+            Event.objects.create(game=game, season=season, player=player, timestamp="2025-07-28T00:00:00Z",
+                                 action="missed_shot", x=0, y=300)
+            third = self.client.get(url)
+            self.assertEqual(render.call_count, 2)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(third.data["total_events"], 2)
+
+class HexbinTests(APITestCase):
+    def test_counts_match_matplotlib(self):
+        from matplotlib.figure import Figure
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-260, 260, 2000)
+        ys = rng.uniform(-60, 430, 2000)
+        for gridsize in (10, 20, 37):
+            collection = Figure().subplots().hexbin(xs, ys, gridsize=gridsize, extent=COURT_EXTENT, mincnt=1)
+            centers, counts = hexbin_counts(xs, ys, gridsize)
+            self.assertTrue(np.array_equal(collection.get_offsets(), centers))
+            self.assertTrue(np.array_equal(collection.get_array(), counts))
+
+    def test_bins_endpoint(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_bins", opponent="Team J")
+        player = Player.objects.create(name="Bins Player", external_id="player_bins")
+        season = Season.objects.create(
+            name="2025 Season", start_date="2025-01-01", end_date="2025-12-31", external_id="season_bins"
+        )
+        for action in ("made_shot", "made_shot", "missed_shot", "assist"):
+            Event.objects.create(game=game, season=season, player=player, timestamp="2025-07-28T00:00:00Z",
+                                 action=action, x=0, y=10)
+        response = self.client.get(reverse("heatmap_bins"), {"game_id": game.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["made"]["counts"], [2])
+        self.assertEqual(response.data["missed"]["counts"], [1])
+        self.assertEqual(self.client.get(reverse("heatmap_bins")).status_code, status.HTTP_400_BAD_REQUEST)
+
+class HeatmapRenderTests(SimpleTestCase):
+    def test_court_background_is_cached_per_size(self):
+        self.assertIs(court_background((6, 5), 100), court_background((6, 5), 100))
+        self.assertEqual(court_background((3, 2.5), 100).size, (300, 250))
+
+    def test_save_as_image_composites_onto_court(self):
+        from PIL import Image
+        buf = Heatmap(events=[Shot(0, 10, "made_two"), Shot(0, 300, "missed_three")]).save_as_image()
+        image = Image.open(buf)
+        self.assertEqual(image.format, "PNG")
+        self.assertEqual(image.size, court_background().size)
+        self.assertNotEqual(image.tobytes(), court_background().tobytes())
+
+    def test_rendering_does_not_leak_pyplot_figures(self):
+        import matplotlib.pyplot as plt
+        heatmap = Heatmap(events=[Shot(0, 10, "made_two")])
+        before = plt.get_fignums()
+        heatmap.render_with_hex()
+        heatmap.save_as_image()
+        self.assertEqual(plt.get_fignums(), before)
+
+    def test_reused_layer_figure_renders_identically(self):
+        first = Heatmap(events=[Shot(0, 10, "made_two")])
+        second = Heatmap(events=[Shot(100, 200, "missed_three")])
+        png = first.save_as_image().getvalue()
+        second.save_as_image()
+        self.assertEqual(first.save_as_image().getvalue(), png)
+
+class ListPaginationTests(APITestCase):
+    def setUp(self):
+        for i in range(5):
+            Player.objects.create(name=f"Player {i}", external_id=f"player_page_{i}")
+
+    def test_list_without_cursor_returns_array(self):
+        response = self.client.get(reverse("list_players"))
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pages_cover_every_row(self):
+        seen = []
+        url = reverse("list_players") + "?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen += [p["id"] for p in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, list(Player.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(reverse("list_players"), {"fields": "id,name"})
+        self.assertEqual(set(response.data[0]), {"id", "name"})
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_etag", opponent="Team E")
+        self.player = Player.objects.create(name="ETag Player", external_id="player_etag")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_etag"
+        )
+
+    def post_shot(self):
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        response = self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unchanged_resources_return_304(self):
+        self.post_shot()
+        urls = [
+            reverse("get_player_stats", args=[self.player.id]),
+            reverse("get_player_season", args=[self.season.id, self.player.id]),
+            reverse("get_all_players_season", args=[self.season.id]),
+            reverse("get_season_stats", args=[self.season.id]),
+        ]
+        for url in urls:
+            etag = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+
+    def test_ingest_changes_etag(self):
+        self.post_shot()
+        url = reverse("get_player_season", args=[self.season.id, self.player.id])
+        etag = self.client.get(url)["ETag"]
+        self.post_shot()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_query_string_is_part_of_etag(self):
+        self.post_shot()
+        url = reverse("get_player_stats", args=[self.player.id])
+        self.assertNotEqual(self.client.get(url)["ETag"], self.client.get(url, {"fields": "points"})["ETag"])
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        get_heatmap_cache.cache_clear()
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_async", opponent="Team A")
+        self.player = Player.objects.create(name="Async Player", external_id="player_async")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_async"
+        )
+        self.events = {"events": [
+            {"player_id": self.player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10},
+            {"player_id": self.player.id, "season_id": self.season.id, "action": "missed_shot", "x": 200, "y": 150},
+        ]}
+
+    async def test_async_ingest_matches_sync_ingest(self):
+        response = await self.async_client.post(
+            reverse("async_post_events", args=[self.game.id]), self.events, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        career = await PlayerCareer.objects.aget(player_id=self.player)
+        self.assertEqual(career.point, 2)
+        self.assertEqual(await HeatmapJob.objects.acount(), 3)
+
+    async def test_async_ingest_rejects_invalid_events(self):
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "dunk", "x": 0, "y": 0}]}
+        response = await self.async_client.post(
+            reverse("async_post_events", args=[self.game.id]), data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_async_ingest_rejects_unknown_game_and_player(self):
+        response = await self.async_client.post(
+            reverse("async_post_events", args=[self.game.id + 100]), self.events, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 404)
+        data = {"events": [{**self.events["events"][0], "player_id": self.player.id + 100}]}
+        response = await self.async_client.post(
+            reverse("async_post_events", args=[self.game.id]), data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("player_id", response.json())
+        self.assertFalse(await Event.objects.aexists())
+
+    def test_async_heatmap_matches_sync_heatmap(self):
+        self.client.post(reverse("post_events", args=[self.game.id]), self.events, format="json")
+        sync_response = self.client.get(reverse("generate_game_player_heatmap", args=[self.game.id, self.player.id]))
+        get_heatmap_cache.cache_clear()
+        async_response = async_to_sync(self.async_client.get)(
+            reverse("async_generate_game_player_heatmap", args=[self.game.id, self.player.id])
+        )
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    async def test_async_heatmap_not_found(self):
+        response = await self.async_client.get(reverse("async_generate_game_heatmap", args=[self.game.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_job_runner_stores_urls(self):
+        self.client.post(reverse("post_events", args=[self.game.id]), self.events, format="json")
+        self.assertEqual(async_to_sync(arun_heatmap_jobs)(), 3)
+        self.assertFalse(HeatmapJob.objects.exists())
+        self.assertTrue(PlayerSeason.objects.get(player_id=self.player).heatmap_url)
+
+class QueryBudgetTests(APITestCase):
+    """Per-endpoint query budgets; they must not grow with the number of rows.
+
+    Every game in the fixture has three players and the season has three
+    PlayerSeason rows, so a query per row would overshoot each budget.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_heatmap_cache.cache_clear()
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_budget"
+        )
+        self.games = [
+            Game.objects.create(date="2025-07-28", external_id=f"game_budget_{i}", opponent="Team B")
+            for i in range(2)
+        ]
+        self.players = [Player.objects.create(name=f"Budget {i}", external_id=f"player_budget_{i}") for i in range(3)]
+        for game in self.games:
+            data = {"events": [
+                {"player_id": player.id, "season_id": self.season.id, "action": action, "x": 0, "y": 10}
+                for player in self.players for action in ("made_shot", "missed_shot", "assist")
+            ]}
+            self.client.post(reverse("post_events", args=[game.id]), data, format="json")
+        cache.clear()
+
+    def assertBudget(self, budget, name, *args, params=None):
+        with self.subTest(endpoint=name), self.assertNumQueries(budget):
+            response = self.client.get(reverse(name, args=args), params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_read_endpoints(self):
+        game, player, season = self.games[0], self.players[0], self.season
+        # stat endpoints with an ETag spend one extra query on the version lookup
+        self.assertBudget(1, "list_players")
+        self.assertBudget(1, "list_seasons")
+        self.assertBudget(1, "list_games", params={"season_id": season.id})
+        self.assertBudget(1, "get_game", game.id)
+        self.assertBudget(1, "get_player", player.id)
+        self.assertBudget(1, "get_season", season.id)
+        self.assertBudget(2, "get_player_game", game.id, player.id)
+        self.assertBudget(2, "get_player_season", season.id, player.id)
+        self.assertBudget(2, "get_player_stats", player.id)
+        self.assertBudget(2, "get_season_stats", season.id)
+        self.assertBudget(2, "get_all_players_season", season.id)
+        self.assertBudget(1, "get_all_players_game", game.id)
+        self.assertBudget(1, "get_player_game_stats", player.id)
+        self.assertBudget(1, "player_heatmap", game.id, player.id)
+        self.assertBudget(1, "heatmap_bins", params={"season_id": season.id})
+
+    def assertWriteBudget(self, budget, method, name, *args, data=None):
+        with self.subTest(endpoint=name), self.assertNumQueries(budget):
+            response = getattr(self.client, method)(reverse(name, args=args), data, format="json")
+            self.assertLess(response.status_code, 300)
+
+    def test_ingest_budget_does_not_grow_with_roster(self):
+        more_players = self.players + [
+            Player.objects.create(name=f"Budget {i}", external_id=f"player_budget_{i}") for i in range(3, 9)
+        ]
+        for players in (self.players, more_players):
+            game = Game.objects.create(date="2025-08-01", external_id=f"game_roster_{len(players)}", opponent="Team R")
+            data = {"events": [
+                {"player_id": player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}
+                for player in players
+            ]}
+            # savepoint pair, game lock, player lookup, event insert, PlayerGame
+            # lock and write, then insert-missing/lock/bulk_update for each of
+            # PlayerSeason, PlayerCareer and SeasonSummary, and the job insert
+            # make 17; the first post also looks up the season and assigns it
+            self.assertWriteBudget(19, "post", "post_events", game.id, data=data)
+            self.assertWriteBudget(17, "post", "post_events", game.id, data=data)
+
+    def test_write_endpoints(self):
+        game, player, season = self.games[0], self.players[0], self.season
+        self.assertWriteBudget(2, "post", "create_player", data={"name": "New", "external_id": "player_budget_new"})
+        self.assertWriteBudget(2, "post", "create_game", data={"date": "2025-08-01", "external_id": "game_budget_new", "opponent": "X"})
+        # plus the partition check and CREATE on a season-partitioned games_event
+        season_queries = 4 if is_partitioned() else 2
+        self.assertWriteBudget(season_queries, "post", "create_season", data={
+            "name": "New", "external_id": "season_budget_new", "start_date": "2026-01-01", "end_date": "2026-12-31"
+        })
+        self.assertWriteBudget(6, "patch", "update_player", player.id, data={"name": "Renamed"})
+        # the game is locked and saved inside atomic(), which adds a savepoint pair here
+        self.assertWriteBudget(4, "patch", "update_game", game.id, data={"opponent": "Team Y"})
+        self.assertWriteBudget(3, "patch", "update_season", season.id, data={"name": "Renamed"})
+        # each delete is the row lookup, a savepoint pair, three bulk queries
+        # (insert-missing, lock, bulk_update) per aggregate table it subtracts
+        # from, its cascading deletes and, where heatmaps change, a job insert.
+        # delete_season: career and summary, one delete
+        self.assertWriteBudget(11, "delete", "delete_season", season.id, player.id)
+        # delete_game: PlayerGame read, season and career, three deletes, and a
+        # summary rebuild (two aggregates, one UPDATE), since ingest does not
+        # count games created with their season
+        self.assertWriteBudget(17, "delete", "delete_game", game.id)
+        # delete_player: PlayerSeason read, summaries, six deletes, no jobs
+        self.assertWriteBudget(13, "delete", "delete_player", player.id)
+        # delete_season_record: PlayerSeason read, careers, five deletes
+        self.assertWriteBudget(13, "delete", "delete_season_record", season.id)
+
+    def test_delete_player_budget_does_not_grow_with_seasons(self):
+        veteran = self.players[2]
+        for i in range(2):
+            season = Season.objects.create(
+                name=f"{2026 + i} Season",
+                start_date=f"{2026 + i}-01-01",
+                end_date=f"{2026 + i}-12-31",
+                external_id=f"season_budget_extra_{i}",
+            )
+            game = Game.objects.create(date=f"{2026 + i}-07-28", external_id=f"game_budget_extra_{i}", opponent="Team V")
+            data = {"events": [{"player_id": veteran.id, "season_id": season.id, "action": "made_shot", "x": 0, "y": 10}]}
+            self.client.post(reverse("post_events", args=[game.id]), data, format="json")
+        self.assertEqual(PlayerSeason.objects.filter(player_id=veteran).count(), 3)
+
+        # one season or three, the summaries are updated with the same bulk queries
+        self.assertWriteBudget(13, "delete", "delete_player", self.players[1].id)
+        self.assertWriteBudget(13, "delete", "delete_player", veteran.id)
+        summaries = SeasonSummary.objects.order_by("season_id")
+        self.assertEqual([s.total_points for s in summaries], [4, 0, 0])
+        self.assertEqual([s.total_games_played for s in summaries], [2, 0, 0])
+
+    def test_serializer_path_has_no_n_plus_one(self):
+        with self.settings(FAST_STAT_ROWS=False):
+            self.assertBudget(1, "get_all_players_game", self.games[0].id)
+            self.assertBudget(1, "get_player_game_stats", self.players[0].id)
+            self.assertBudget(2, "get_all_players_season", self.season.id)
+
+    def test_heatmap_endpoints(self):
+        game, player, season = self.games[0], self.players[0], self.season
+        # lookups for the title, the event fingerprint, then the shots on a cache miss
+        self.assertBudget(3, "generate_player_heatmap", player.id)
+        self.assertBudget(3, "generate_season_heatmap", season.id)
+        self.assertBudget(4, "generate_season_player_heatmap", season.id, player.id)
+        self.assertBudget(3, "generate_game_heatmap", game.id)
+        self.assertBudget(4, "generate_game_player_heatmap", game.id, player.id)
+        # a cached render skips the shot fetch; this one shares the season/player render
+        self.assertBudget(3, "generate_player_season_heatmap", player.id, season.id)
+        self.assertBudget(2, "generate_player_heatmap", player.id)
+
+class FastRowsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_fast", opponent="Team F")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_fast"
+        )
+        for i in range(3):
+            player = Player.objects.create(name=f"Fast Player {i}", external_id=f"player_fast_{i}")
+            data = {"events": [
+                {"player_id": player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10},
+                {"player_id": player.id, "season_id": self.season.id, "action": "assist", "x": 0, "y": 0},
+            ]}
+            self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        PlayerSeason.objects.update(heatmap_url="https://example.com/heatmap.png")
+
+    def test_values_rows_match_serializers(self):
+        for serializer_class, queryset in [
+            (PlayerGameSerializer, PlayerGame.objects.order_by("id")),
+            (PlayerSeasonSerializer, PlayerSeason.objects.order_by("id")),
+        ]:
+            expected = serializer_class(queryset, many=True).data
+            rows = values_rows(serializer_class, values_queryset(serializer_class, queryset))
+            self.assertEqual(rows, [dict(row) for row in expected])
+            self.assertEqual([list(row) for row in rows], [list(row) for row in expected])
+
+    def test_fast_endpoint_matches_serializer_endpoint(self):
+        url = reverse("get_all_players_season", args=[self.season.id])
+        fast = self.client.get(url, {"fields": "id,player_name,points"})
+        with self.settings(FAST_STAT_ROWS=False):
+            cache.clear()
+            slow = self.client.get(url, {"fields": "id,player_name,points"})
+        self.assertEqual(fast.content, slow.content)
+
+    def test_version_is_not_in_responses(self):
+        for name, args in [("get_all_players_game", [self.game.id]), ("get_all_players_season", [self.season.id])]:
+            url = reverse(name, args=args)
+            fast = self.client.get(url)
+            with self.settings(FAST_STAT_ROWS=False):
+                cache.clear()
+                slow = self.client.get(url)
+            self.assertEqual(fast.content, slow.content)
+            self.assertNotIn("version", json.loads(fast.content)[0])
+
+    def test_fast_renderer_is_limited_to_stat_lists(self):
+        for name, args in [("get_all_players_game", [self.game.id]), ("get_all_players_season", [self.season.id])]:
+            response = self.client.get(reverse(name, args=args))
+            self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        response = self.client.get(reverse("get_season_stats", args=[self.season.id]))
+        self.assertNotIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+    def test_renderer_matches_json_renderer(self):
+        data = PlayerGameSerializer(PlayerGame.objects.all(), many=True).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(date="2025-07-28", external_id="game_cache", opponent="Team C")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_cache"
+        )
+        self.player = Player.objects.create(name="Cached Player", external_id="player_cache")
+        self.other = Player.objects.create(name="Other Player", external_id="player_cache_other")
+
+    def post_shot(self, player):
+        data = {"events": [{"player_id": player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        response = self.client.post(reverse("post_events", args=[self.game.id]), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_repeat_reads_skip_serialization(self):
+        self.post_shot(self.player)
+        url = reverse("get_player_stats", args=[self.player.id])
+        first = self.client.get(url)
+        # only the ETag version lookup reaches the database
+        with self.assertNumQueries(1):
+            second = self.client.get(url)
+        self.assertEqual(second.data, first.data)
+
+    def test_ingest_invalidates_only_touched_players(self):
+        self.post_shot(self.player)
+        self.post_shot(self.other)
+        player_url = reverse("get_player_stats", args=[self.player.id])
+        other_url = reverse("get_player_stats", args=[self.other.id])
+        self.client.get(player_url)
+        self.client.get(other_url)
+
+        self.post_shot(self.player)
+        self.assertEqual(self.client.get(player_url).data["points"], 4)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(other_url).data["points"], 2)
+
+    def test_ingest_invalidates_season_views(self):
+        self.post_shot(self.player)
+        url = reverse("get_season_stats", args=[self.season.id])
+        self.assertEqual(self.client.get(url).data["total_points"], 2)
+        self.post_shot(self.other)
+        self.assertEqual(self.client.get(url).data["total_points"], 4)
+
+    def test_write_without_invalidation_is_not_served_stale(self):
+        # e.g. a heatmap worker's write, whose invalidate() only reached its own LocMem cache
+        self.post_shot(self.player)
+        url = reverse("get_player_stats", args=[self.player.id])
+        first = self.client.get(url)
+        self.assertEqual(first.data["points"], 2)
+        PlayerCareer.objects.filter(player_id=self.player).update(point=10, version=F("version") + 1)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data["points"], 10)
+
+class SeasonSummaryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.player = Player.objects.create(name="Summary Player", external_id="player_summary")
+        self.season = Season.objects.create(
+            name="2025 Season",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            external_id="season_summary"
+        )
+
+    def post_shot(self, game):
+        data = {"events": [{"player_id": self.player.id, "season_id": self.season.id, "action": "made_shot", "x": 0, "y": 10}]}
+        response = self.client.post(reverse("post_events", args=[game.id]), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ingest_maintains_season_summary(self):
+        first = Game.objects.create(date="2025-07-28", external_id="game_sum_1", opponent="Team S")
+        second = Game.objects.create(date="2025-07-29", external_id="game_sum_2", opponent="Team T")
+        self.post_shot(first)
+        self.post_shot(first)
+        self.post_shot(second)
+
+        # the ETag version lookup plus the summary read
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("get_season_stats", args=[self.season.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["games_count"], 2)
+        self.assertEqual(response.data["total_points"], 6)
+        self.assertEqual(response.data["total_games_played"], 2)
+        self.assertEqual(response.data["avg_ppg"], 3.0)
+
+    def test_ingest_assigns_game_season(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_sum_4", opponent="Team V")
+        Game.objects.create(date="2025-07-29", external_id="game_sum_5", opponent="Team W")
+        self.post_shot(game)
+        game.refresh_from_db()
+        self.assertEqual(game.season_id, self.season.id)
+
+        response = self.client.get(reverse("list_games"), {"season_id": self.season.id})
+        self.assertEqual([g["id"] for g in response.data], [game.id])
+
+    def test_delete_game_rebuilds_summary(self):
+        game = Game.objects.create(date="2025-07-28", external_id="game_sum_3", opponent="Team U")
+        self.post_shot(game)
+        self.client.delete(reverse("delete_game", args=[game.id]))
+        summary = SeasonSummary.objects.get(season_id=self.season)
+        self.assertEqual(summary.games_count, 0)
+
+    def test_season_stats_are_consistent_after_deleting_a_game(self):
+        first = Game.objects.create(date="2025-07-28", external_id="game_sum_8", opponent="Team Z")
+        second = Game.objects.create(date="2025-07-29", external_id="game_sum_9", opponent="Team Q")
+        self.post_shot(first)
+        self.post_shot(first)
+        self.post_shot(second)
+        self.client.delete(reverse("delete_game", args=[second.id]))
+
+        response = self.client.get(reverse("get_season_stats", args=[self.season.id]))
+        self.assertEqual(response.data["games_count"], 1)
+        self.assertEqual(response.data["total_points"], 4)
+        self.assertEqual(response.data["total_games_played"], 1)
+        self.assertEqual(response.data["avg_ppg"], 4.0)
+
+    def test_delete_game_subtracts_season_and_career_totals(self):
+        first = Game.objects.create(date="2025-07-28", external_id="game_sum_6", opponent="Team X")
+        second = Game.objects.create(date="2025-07-29", external_id="game_sum_7", opponent="Team Y")
+        self.post_shot(first)
+        self.post_shot(first)
+        self.post_shot(second)
+        self.client.delete(reverse("delete_game", args=[second.id]))
+
+        season = PlayerSeason.objects.get(player_id=self.player, season_id=self.season)
+        career = PlayerCareer.objects.get(player_id=self.player)
+        for totals in (season, career):
+            self.assertEqual((totals.point, totals.games_played), (4, 1))
+            self.assertEqual(totals.shot_zone_stats["REST_AREA"]["attempts"], 2)
+
 class SeasonTests(APITestCase):
     def test_create_season(self):
         url = reverse("create_season")
@@ -129,3 +1300,86 @@ class SeasonTests(APITestCase):
         url = reverse("delete_season", args=[season.id, player.id])
         response = self.client.delete(url)
         self.assertIn(response.status_code, [status.HTTP_204_NO_CONTENT, status.HTTP_404_NOT_FOUND])
+
+
+class SeasonPartitionTests(APITestCase):
+    def test_new_season_gets_a_partition(self):
+        season = Season.objects.create(name="S", external_id="season_part", start_date="2025-01-01", end_date="2025-12-31")
+        expected = [season.id] if is_partitioned() else []
+        self.assertEqual([s for s in season_partitions() if s == season.id], expected)
+        self.assertEqual(partition_name(season.id), f"games_event_season_{season.id}")
+
+    def test_game_events_are_pinned_to_the_game_season(self):
+        season = Season.objects.create(name="S", external_id="season_pin", start_date="2025-01-01", end_date="2025-12-31")
+        game = Game.objects.create(date="2025-08-01", external_id="game_pin", opponent="X")
+        self.assertEqual(game_event_filter(game), {"game_id": game.id})
+        game.season = season
+        self.assertEqual(game_event_filter(game), {"game_id": game.id, "season_id": season.id})
+
+    def test_events_from_another_season_are_rejected(self):
+        seasons = [
+            Season.objects.create(name="S", external_id=f"season_mix_{i}", start_date="2025-01-01", end_date="2025-12-31")
+            for i in range(2)
+        ]
+        game = Game.objects.create(date="2025-08-01", external_id="game_mix", opponent="X")
+        player = Player.objects.create(name="Mixed Player", external_id="player_mix")
+        url = reverse("post_events", args=[game.id])
+
+        def events(*seasons):
+            return {"events": [
+                {"player_id": player.id, "season_id": season.id, "action": "assist", "x": 0, "y": 0} for season in seasons
+            ]}
+
+        # one payload spanning two seasons, then a later post in the wrong season
+        response = self.client.post(url, events(seasons[0], seasons[1]), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("season_id", response.data)
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(self.client.post(url, events(seasons[0]), format="json").status_code, status.HTTP_200_OK)
+        response = self.client.post(url, events(seasons[1]), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(Event.objects.values_list("season_id", flat=True)), [seasons[0].id])
+
+    def test_deleted_season_drops_its_partition(self):
+        season = Season.objects.create(name="S", external_id="season_drop", start_date="2025-01-01", end_date="2025-12-31")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse("delete_season_record", args=[season.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn(season.id, season_partitions())
+        self.assertFalse(drop_season_partition(season.id))
+
+
+class ShotZoneTests(SimpleTestCase):
+    def _scalar_zones(self, xs, ys):
+        class Shot:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+        return [define_shot_zone(Shot(float(x), float(y))).value for x, y in zip(xs, ys)]
+
+    def test_vectorized_matches_scalar_on_grid(self):
+        gx, gy = np.meshgrid(np.arange(-260, 260.5, 2.5), np.arange(-50, 425, 2.5))
+        xs, ys = gx.ravel(), gy.ravel()
+        self.assertEqual(define_shot_zones(xs, ys).tolist(), self._scalar_zones(xs, ys))
+
+    def test_vectorized_matches_scalar_on_boundaries(self):
+        points = [
+            (0, 40), (40, 0), (80, 142.5), (-80, 142.5), (60, 100), (-60, 100),
+            (220, 92.5), (-220, 92.5), (0, 237.5), (0, 0), (0, -20), (-0.0, -47.5),
+        ]
+        # points exactly on the 10 and 30 degree angle lines
+        for deg in (-30, -10, 10, 30):
+            rad = np.radians(deg)
+            points.append((200 * np.sin(rad), 200 * np.cos(rad)))
+        xs, ys = zip(*points)
+        self.assertEqual(define_shot_zones(xs, ys).tolist(), self._scalar_zones(xs, ys))
+        self.assertEqual(define_shot_zones([0], [237.5])[0], ShotZone.THREE_C.value)
+
+    def test_raster_lookup_matches_exact(self):
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-260, 260, 50_000)
+        ys = rng.uniform(-50, 430, 50_000)
+        # snapping to the raster resolution puts points on cell edges
+        snapped_xs, snapped_ys = np.round(xs * 2) / 2, np.round(ys * 2) / 2
+        for x, y in ((xs, ys), (snapped_xs, snapped_ys)):
+            self.assertTrue(np.array_equal(lookup_shot_zones(x, y), define_shot_zones(x, y)))
@@ -1,8 +1,10 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # Heatmap endpoints
+    path('heatmap/bins/', views.heatmap_bins, name='heatmap_bins'),
+    path('heatmap/files/<slug:name>.png', views.heatmap_file, name='heatmap_file'),
     path('heatmap/<int:game_id>/<int:player_id>/', views.player_heatmap, name='player_heatmap'),
     path('heatmap/player/<int:player_id>/', views.generate_player_heatmap, name='generate_player_heatmap'),
     path('heatmap/season/<int:season_id>/', views.generate_season_heatmap, name='generate_season_heatmap'),
@@ -22,6 +24,7 @@ urlpatterns = [
     path('seasons/<int:season_id>/players/', views.get_all_players_season, name='get_all_players_season'),
 
     # POST endpoints
+    path('events/stream/', views.post_events_stream, name='post_events_stream'),
     path('events/<int:game_id>/', views.post_events, name='post_events'),
     path('games/create/', views.create_game, name='create_game'),
     path('seasons/create/', views.create_season, name='create_season'),
@@ -45,4 +48,13 @@ urlpatterns = [
     path('seasons/<int:season_id>/', views.get_season, name='get_season'),
     path('seasons/<int:season_id>/stats/', views.get_season_stats, name='get_season_stats'),
     path('seasons/<int:season_id>/players/', views.get_all_players_season, name='get_all_players_season'),
+
+    # Async endpoints (serve with an ASGI server)
+    path('async/events/<int:game_id>/', async_views.post_events, name='async_post_events'),
+    path('async/heatmap/player/<int:player_id>/', async_views.generate_player_heatmap, name='async_generate_player_heatmap'),
+    path('async/heatmap/season/<int:season_id>/', async_views.generate_season_heatmap, name='async_generate_season_heatmap'),
+    path('async/heatmap/season/<int:season_id>/player/<int:player_id>/', async_views.generate_season_heatmap, name='async_generate_season_player_heatmap'),
+    path('async/heatmap/game/<int:game_id>/', async_views.generate_game_heatmap, name='async_generate_game_heatmap'),
+    path('async/heatmap/game/<int:game_id>/player/<int:player_id>/', async_views.generate_game_heatmap, name='async_generate_game_player_heatmap'),
+    path('async/heatmap/player/<int:player_id>/season/<int:season_id>/', async_views.generate_player_season_heatmap, name='async_generate_player_season_heatmap'),
 ]
\ No newline at end of file
@@ -0,0 +1,78 @@
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.apps import apps
+from django.db import connections
+
+from games.heatmap import render_png
+from games.heatmap_storage import save_heatmaps
+from .heatmap_job_util import scope_events, store_heatmap_url, upload_key
+
+
+def _init_worker():
+    # spawned (non-forked) workers import games.heatmap, which needs the app registry
+    if not apps.ready:
+        django.setup()
+
+
+def regenerate_heatmaps(targets, workers=None, report_every=25):
+    """Re-render many heatmaps across a process pool.
+
+    ``targets`` is an iterable of ``(player_id, scope, scope_id)``. Shots are
+    read and heatmaps uploaded/stored in this process; only the CPU-bound
+    matplotlib rendering runs in the workers. Rendered images are uploaded
+    in concurrent batches. Returns the number rendered.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    targets = iter(targets)
+    pending = {}
+    rendered = []
+    done = 0
+    started = time.perf_counter()
+
+    def flush():
+        nonlocal done
+        urls = save_heatmaps(
+            (upload_key(scope, scope_id), player_id, image) for (player_id, scope, scope_id), image in rendered
+        )
+        for ((player_id, scope, scope_id), _), heatmap_url in zip(rendered, urls):
+            store_heatmap_url(player_id, scope, scope_id, heatmap_url)
+            done += 1
+            if done % report_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"  🔥 {done} heatmaps rendered ({done / elapsed:.1f}/s)")
+        rendered.clear()
+
+    # workers only render, but forked ones inherit our open DB sockets; close
+    # them first (they reopen on next use). A connection inside the caller's
+    # atomic() block is left alone, since closing it would break that transaction.
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        while True:
+            # keep the pool busy without reading every target's shots up front
+            for target in targets:
+                shots = list(scope_events(*target).values_list("x", "y", "action"))
+                pending[pool.submit(render_png, shots)] = target
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+            # upload while the refilled pool keeps rendering
+            if len(rendered) >= max_in_flight:
+                flush()
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                rendered.append((pending.pop(future), io.BytesIO(future.result())))
+    flush()
+
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0.0
+    print(f"✅ Rendered {done} heatmaps in {elapsed:.1f}s ({rate:.1f}/s, {workers} workers)")
+    return done
@@ -0,0 +1,191 @@
+import asyncio
+import io
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+
+from games.models import Event, Game, HeatmapJob, PlayerCareer, PlayerGame, PlayerSeason
+from games.heatmap import render_png
+from games.heatmap_cache import arender_png
+from games.heatmap_storage import asave_heatmap, save_heatmap
+from games.response_cache import invalidate
+
+
+def enqueue_heatmap_job(player_id, scope, scope_id=0):
+    """Queue a heatmap rebuild, coalescing with an identical pending job."""
+    job, _ = HeatmapJob.objects.get_or_create(
+        player_id=player_id,
+        scope=scope,
+        scope_id=scope_id,
+        status=HeatmapJob.Status.PENDING,
+    )
+    return job
+
+
+def enqueue_heatmap_jobs(targets):
+    """Queue ``(player_id, scope, scope_id)`` rebuilds in one insert.
+
+    Targets that already have a pending job are skipped by the
+    unique_pending_heatmap_job constraint.
+    """
+    HeatmapJob.objects.bulk_create(
+        [HeatmapJob(player_id=player_id, scope=scope, scope_id=scope_id) for player_id, scope, scope_id in targets],
+        ignore_conflicts=True,
+    )
+
+
+def scope_events(player_id, scope, scope_id):
+    """Events behind a player's heatmap at the given scope."""
+    events = Event.objects.filter(player_id=player_id)
+    if scope == HeatmapJob.Scope.GAME:
+        # the game's season keeps a partitioned games_event to one partition
+        game_season = Game.objects.filter(id=scope_id).values("season_id")[:1]
+        return events.filter(game_id=scope_id, season_id=Subquery(game_season))
+    if scope == HeatmapJob.Scope.SEASON:
+        return events.filter(season_id=scope_id)
+    return events
+
+
+def store_heatmap_url(player_id, scope, scope_id, heatmap_url):
+    """Write a rendered heatmap's URL back onto the matching aggregate row.
+
+    Heatmap URLs are content-addressed, so an unchanged URL means an
+    unchanged image: the row, its version and the caches are left alone.
+    """
+    if scope == HeatmapJob.Scope.GAME:
+        rows = PlayerGame.objects.filter(player_id=player_id, game_id=scope_id)
+    elif scope == HeatmapJob.Scope.SEASON:
+        rows = PlayerSeason.objects.filter(player_id=player_id, season_id=scope_id)
+    else:
+        rows = PlayerCareer.objects.filter(player_id=player_id)
+    if not rows.exclude(heatmap_url=heatmap_url).update(heatmap_url=heatmap_url, version=F("version") + 1):
+        return
+    if scope == HeatmapJob.Scope.GAME:
+        invalidate(players=[player_id], games=[scope_id])
+    elif scope == HeatmapJob.Scope.SEASON:
+        invalidate(players=[player_id], seasons=[scope_id])
+    else:
+        invalidate(players=[player_id])
+
+
+def upload_key(scope, scope_id):
+    # seasons keep their historical names; game ids would collide with them
+    if scope == HeatmapJob.Scope.GAME:
+        return f"game-{scope_id}"
+    if scope == HeatmapJob.Scope.SEASON:
+        return scope_id
+    return "career"
+
+
+def build_heatmap(player_id, scope, scope_id):
+    """Render, upload and record one heatmap. Returns its URL."""
+    # x/y/action only, so Postgres can answer from the covering event indexes
+    png = render_png(scope_events(player_id, scope, scope_id).values_list("x", "y", "action"))
+    heatmap_url = save_heatmap(upload_key(scope, scope_id), player_id, io.BytesIO(png))
+    store_heatmap_url(player_id, scope, scope_id, heatmap_url)
+    return heatmap_url
+
+
+def claim_heatmap_jobs(batch_size):
+    """Mark up to ``batch_size`` claimable jobs as running and return them.
+
+    Besides pending jobs, this reclaims running jobs not touched for
+    HEATMAP_JOB_STALE_AFTER seconds (their worker died) and retries failed
+    ones after HEATMAP_JOB_RETRY_DELAY seconds, each until it has been
+    claimed HEATMAP_JOB_MAX_ATTEMPTS times. Stale jobs out of attempts are
+    marked failed for good.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.HEATMAP_JOB_STALE_AFTER)
+    retry_before = now - timedelta(seconds=settings.HEATMAP_JOB_RETRY_DELAY)
+    max_attempts = settings.HEATMAP_JOB_MAX_ATTEMPTS
+    claimable = (
+        Q(status=HeatmapJob.Status.PENDING)
+        | Q(status=HeatmapJob.Status.RUNNING, updated_at__lt=stale_before, attempts__lt=max_attempts)
+        | Q(status=HeatmapJob.Status.FAILED, updated_at__lt=retry_before, attempts__lt=max_attempts)
+    )
+    with transaction.atomic():
+        HeatmapJob.objects.filter(
+            status=HeatmapJob.Status.RUNNING, updated_at__lt=stale_before, attempts__gte=max_attempts
+        ).update(status=HeatmapJob.Status.FAILED, error="Timed out while running", updated_at=now)
+        jobs = list(
+            HeatmapJob.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .order_by("id")[:batch_size]
+        )
+        # update() skips auto_now, so the claim time is set explicitly
+        HeatmapJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=HeatmapJob.Status.RUNNING, attempts=F("attempts") + 1, updated_at=now
+        )
+    return jobs
+
+
+def fail_heatmap_job(job, error):
+    return HeatmapJob.objects.filter(pk=job.pk).update(
+        status=HeatmapJob.Status.FAILED, error=str(error), updated_at=timezone.now()
+    )
+
+
+def run_heatmap_jobs(batch_size=20):
+    """Process claimable heatmap jobs until there are none left.
+
+    Finished jobs are deleted; failed ones are kept with their error and
+    retried by a later run (see claim_heatmap_jobs).
+    Returns the number of jobs processed.
+    """
+    processed = 0
+    while True:
+        jobs = claim_heatmap_jobs(batch_size)
+        if not jobs:
+            return processed
+        for job in jobs:
+            try:
+                build_heatmap(job.player_id, job.scope, job.scope_id)
+            except Exception as e:
+                fail_heatmap_job(job, e)
+            else:
+                job.delete()
+            processed += 1
+
+
+async def abuild_heatmap(player_id, scope, scope_id):
+    """Async ``build_heatmap``: renders on the executor, uploads with httpx."""
+    shots = [row async for row in scope_events(player_id, scope, scope_id).values_list("x", "y", "action")]
+    png = await arender_png(shots)
+    heatmap_url = await asave_heatmap(upload_key(scope, scope_id), player_id, io.BytesIO(png))
+    await sync_to_async(store_heatmap_url)(player_id, scope, scope_id, heatmap_url)
+    return heatmap_url
+
+
+async def arun_heatmap_jobs(batch_size=20, concurrency=4):
+    """Async ``run_heatmap_jobs``, building up to ``concurrency`` jobs at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            try:
+                await abuild_heatmap(job.player_id, job.scope, job.scope_id)
+            except Exception as e:
+                await sync_to_async(fail_heatmap_job)(job, e)
+            else:
+                await job.adelete()
+
+    processed = 0
+    while True:
+        jobs = await sync_to_async(claim_heatmap_jobs)(batch_size)
+        if not jobs:
+            return processed
+        await asyncio.gather(*(run(job) for job in jobs))
+        processed += len(jobs)
+
+
+def run_heatmap_worker(interval=2.0, batch_size=20):
+    """Poll the job table forever, like a tiny local task queue."""
+    while True:
+        if not run_heatmap_jobs(batch_size):
+            time.sleep(interval)
@@ -1,101 +1,366 @@
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Sum, Count
+from django.db.models import Sum, Count, F
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
 from collections import defaultdict
-from games.models import PlayerSeason, PlayerGame, Event, ShotZone, Game, Player, PlayerCareer
+from games.models import PlayerSeason, PlayerGame, Event, ShotZone, Game, Player, PlayerCareer, HeatmapJob, Season, SeasonSummary, SHOT_ACTIONS
+from games.shotzone import lookup_shot_zones
 from games.heatmap import Heatmap
-from .supabase_utility import upload_heatmap_to_supabase
+from games.heatmap_storage import save_heatmap
+from .heatmap_job_util import enqueue_heatmap_jobs, run_heatmap_jobs
+from games.response_cache import invalidate
 
 
-def process_game(events, game_id):
-    player_game = defaultdict(list)
-    
-    # First, save all events to the Event model (avoid duplicates)
-    for event_data in events:
-        try:
-            # Create the event directly since the save() method modifies the action field
-            event = Event.objects.create(
-                player_id=event_data['player_id'],
-                game_id=game_id,
-                season_id=event_data['season_id'],
-                action=event_data['action'],
-                x=event_data['x'],
-                y=event_data['y'],
-                timestamp=timezone.now()
+MADE_POINTS = {"made_shot": 2, "made_two": 2, "made_three": 3}
+MISSED_ACTIONS = {"missed_shot", "missed_two", "missed_three"}
+COUNTED_ACTIONS = ["assist", "steal", "block", "off_reb", "def_reb", "turnover"]
+BULK_BATCH_SIZE = 500
+PLAYER_GAME_FIELDS = ["point", "assist", "steal", "block", "off_reb", "def_reb", "turnover"]
+
+
+class EventReferenceError(ValidationError):
+    """Events naming players or seasons they cannot be ingested with.
+
+    ``invalid`` maps ``"player_id"``/``"season_id"`` to the offending ids,
+    so callers can point at the events; ``message`` formats one of them.
+    """
+
+    def __init__(self, invalid, message='Invalid pk "{pk}" - object does not exist.'):
+        self.invalid = invalid
+        self.message = message
+        super().__init__({
+            field: [message.format(pk=pk) for pk in sorted(ids)] for field, ids in invalid.items()
+        })
+
+
+def check_event_references(events, known_season_id=None):
+    """Raise EventReferenceError unless every event's player and season exist.
+
+    ``known_season_id`` is a season already known to exist, such as the
+    game's own, and is not looked up again.
+    """
+    missing = {}
+    for field, model, known in (("player_id", Player, None), ("season_id", Season, known_season_id)):
+        ids = {getattr(event, field) for event in events} - {known}
+        if not ids:
+            continue
+        unknown = ids - set(model.objects.filter(id__in=ids).values_list("id", flat=True))
+        if unknown:
+            missing[field] = unknown
+    if missing:
+        raise EventReferenceError(missing)
+
+
+def check_event_season(game, events):
+    """Raise EventReferenceError unless every event is in the game's season.
+
+    A game without a season yet takes the season of its first event, which
+    keeps each game's events in one partition of games_event.
+    """
+    season_id = game.season_id if game.season_id is not None else events[0].season_id
+    others = {event.season_id for event in events} - {season_id}
+    if others:
+        raise EventReferenceError({"season_id": others}, f'Game {game.id} is in season {season_id}, not "{{pk}}".')
+
+
+def build_events(events, game_id):
+    """Build classified, unsaved Event rows for a validated event payload.
+
+    Shot zones for the whole payload come from one court raster lookup.
+    """
+    timestamp = timezone.now()
+    new_events = [
+        Event(
+            player_id=event_data['player_id'],
+            game_id=game_id,
+            season_id=event_data['season_id'],
+            action=event_data['action'],
+            x=event_data['x'],
+            y=event_data['y'],
+            batch_id=event_data.get('batch_id'),
+            seq=event_data.get('seq'),
+            timestamp=timestamp,
+        )
+        for event_data in events
+    ]
+
+    shots = [e for e in new_events if e.action in SHOT_ACTIONS]
+    zones = iter(lookup_shot_zones([e.x for e in shots], [e.y for e in shots]))
+    for event in new_events:
+        event.classify(ShotZone(int(next(zones))) if event.action in SHOT_ACTIONS else None)
+    return new_events
+
+
+def skip_ingested_events(events):
+    """Drop events whose (batch_id, seq, season) is already stored or repeated.
+
+    Events without a batch_id are always kept. One indexed lookup covers the
+    whole payload, so a replayed batch is recognised before any other work.
+    """
+    batch_ids = {event['batch_id'] for event in events if event.get('batch_id') is not None}
+    if not batch_ids:
+        return list(events)
+    seen = set(
+        Event.objects.filter(
+            batch_id__in=batch_ids,
+            season_id__in={event['season_id'] for event in events},
+        ).values_list('batch_id', 'seq', 'season_id')
+    )
+    new_events = []
+    for event in events:
+        if event.get('batch_id') is not None:
+            key = (event['batch_id'], event['seq'], event['season_id'])
+            if key in seen:
+                continue
+            seen.add(key)
+        new_events.append(event)
+    return new_events
+
+
+def compute_player_game_stats(events):
+    """Box score and shot zone totals for one player's classified events."""
+    stats = {
+        "point": 0,
+        "assist": 0,
+        "steal": 0,
+        "block": 0,
+        "off_reb": 0,
+        "def_reb": 0,
+        "turnover": 0,
+    }
+    shot_zone_stats = defaultdict(lambda: {"makes": 0, "attempts": 0})
+
+    for e in events:
+        if e.action in MADE_POINTS:
+            stats["point"] += MADE_POINTS[e.action]
+            if e.shot_zone:
+                shot_zone_stats[e.shot_zone]["makes"] += 1
+                shot_zone_stats[e.shot_zone]["attempts"] += 1
+        elif e.action in MISSED_ACTIONS:
+            if e.shot_zone:
+                shot_zone_stats[e.shot_zone]["attempts"] += 1
+        elif e.action in COUNTED_ACTIONS:
+            stats[e.action] += 1
+
+    for zone, zstats in shot_zone_stats.items():
+        zstats["fg_pct"] = zstats["makes"] / zstats["attempts"] if zstats["attempts"] > 0 else 0.0
+
+    return stats, dict(shot_zone_stats)
+
+
+def merge_shot_zone_stats(base, delta):
+    """Sum per-zone makes/attempts of two shot_zone_stats dicts."""
+    merged = {zone: {"makes": z.get("makes", 0), "attempts": z.get("attempts", 0)} for zone, z in base.items()}
+    for zone, zone_stats in delta.items():
+        if zone not in merged:
+            merged[zone] = {"makes": 0, "attempts": 0}
+        merged[zone]["makes"] += zone_stats.get("makes", 0)
+        merged[zone]["attempts"] += zone_stats.get("attempts", 0)
+
+    # zones emptied by subtracting deleted rows drop out again
+    merged = {zone: z for zone, z in merged.items() if z["attempts"] or z["makes"]}
+    for zone_stats in merged.values():
+        attempts = zone_stats["attempts"]
+        zone_stats["fg_pct"] = zone_stats["makes"] / attempts if attempts > 0 else 0.0
+    return merged
+
+
+def add_stat_delta(row, stats, shot_zone_stats, games_played=0):
+    """Add a stat delta onto a locked aggregate row in memory."""
+    for field, value in stats.items():
+        setattr(row, field, getattr(row, field) + value)
+    if games_played:
+        row.games_played += games_played
+    if shot_zone_stats:
+        row.shot_zone_stats = merge_shot_zone_stats(row.shot_zone_stats, shot_zone_stats)
+    row.version += 1
+
+
+def apply_stat_deltas(model, key_fields, deltas, fields):
+    """Add per-row stat deltas onto aggregate rows with a fixed number of queries.
+
+    ``deltas`` maps a tuple of ``key_fields`` values to
+    ``(stats, shot_zone_stats, games_played)``. Missing rows are inserted,
+    then every target row is locked with select_for_update so concurrent
+    ingests serialize on it, and the new totals go out in one bulk_update.
+    """
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key))) for key in deltas],
+        ignore_conflicts=True,
+        batch_size=BULK_BATCH_SIZE,
+    )
+    candidates = model.objects.select_for_update().filter(**{
+        f"{field}__in": {key[i] for key in deltas} for i, field in enumerate(key_fields)
+    })
+    rows = []
+    for row in candidates:
+        key = tuple(getattr(row, field) for field in key_fields)
+        if key in deltas:
+            add_stat_delta(row, *deltas[key])
+            rows.append(row)
+    model.objects.bulk_update(rows, [*fields, "version"], batch_size=BULK_BATCH_SIZE)
+
+
+def process_game(events, game_id, run_eager_jobs=True, enqueue_jobs=True):
+    """Bulk-ingest a game's events and apply their deltas to the aggregates.
+
+    Events are classified in memory and written together with the per-player
+    PlayerGame rows in a single transaction. Only the new events' stats are
+    added onto PlayerGame, PlayerSeason and PlayerCareer, so ingest cost does
+    not grow with the size of the season or career, and each aggregate table
+    is written with bulk queries, so it does not grow with the roster either.
+
+    Events carrying a ``batch_id``/``seq`` already ingested are skipped, and
+    a fully replayed batch returns before any aggregation work; the unique
+    constraint on Event backs this up against concurrent replays.
+
+    An unknown game raises Http404, and events naming an unknown player or
+    season, or a season other than the game's, raise EventReferenceError
+    before anything is written.
+
+    Returns the number of events inserted and the ``(player_id, scope,
+    scope_id)`` heatmap targets (0 and empty when nothing was new); callers
+    ingesting in many chunks pass ``enqueue_jobs=False`` and queue them once.
+    """
+    events = skip_ingested_events(events)
+    if not events:
+        return 0, []
+    new_events = build_events(events, game_id)
+
+    grouped = defaultdict(list)
+    for event in new_events:
+        grouped[(event.player_id, event.season_id)].append(event)
+    season_deltas = {key: compute_player_game_stats(evts) for key, evts in grouped.items()}
+
+    player_deltas = {}
+    for (player_id, _), (stats, shot_zone_stats) in season_deltas.items():
+        if player_id in player_deltas:
+            totals, zones = player_deltas[player_id]
+            stats = {field: totals[field] + value for field, value in stats.items()}
+            shot_zone_stats = merge_shot_zone_stats(zones, shot_zone_stats)
+        player_deltas[player_id] = (stats, shot_zone_stats)
+
+    with transaction.atomic():
+        # a game belongs to the season of its first ingested events
+        game = get_object_or_404(Game.objects.select_for_update(), pk=game_id)
+        check_event_references(new_events, known_season_id=game.season_id)
+        check_event_season(game, new_events)
+        new_game_season = game.season_id is None and bool(new_events)
+        if new_game_season:
+            game.season_id = new_events[0].season_id
+            game.save(update_fields=["season"])
+        Event.objects.bulk_create(new_events, batch_size=BULK_BATCH_SIZE)
+
+        existing = {
+            pg.player_id_id: pg
+            for pg in PlayerGame.objects.select_for_update().filter(
+                game_id_id=game_id, player_id_id__in=player_deltas.keys()
             )
-            print(f"Created new event: {event.action} for player {event.player} in game {event.game}")
-        except Exception as e:
-            print(f"Error creating event: {e}")
-            print(f"Event data: {event_data}")
-            raise
-        player_game[event_data['player_id']].append(event_data)
-
-    for player_id, evts in player_game.items():
-        stats = {
-            "point": 0,
-            "assist": 0,
-            "steal": 0,
-            "block": 0,
-            "off_reb": 0,
-            "def_reb": 0,
-            "turnover": 0,
         }
-
-        shot_zone_stats = defaultdict(lambda: {"makes": 0, "attempts": 0})
-
-        for e in evts:
-            action = e['action']
-            if action in ["made_shot", "made_two", "made_three"]:
-                stats["point"] += 2 if action in ["made_shot", "made_two"] else 3
-                # For now, skip shot zone stats since we don't have shot zone data in the test
-            elif action in ["missed_shot", "missed_two", "missed_three"]:
-                # Skip shot zone stats for now
-                pass
-
-            if action == "assist":
-                stats["assist"] += 1
-            elif action == "steal":
-                stats["steal"] += 1
-            elif action == "block":
-                stats["block"] += 1
-            elif action == "off_reb":
-                stats["off_reb"] += 1
-            elif action == "def_reb":
-                stats["def_reb"] += 1
-            elif action == "turnover":
-                stats["turnover"] += 1
-
-        for zone, zstats in shot_zone_stats.items():
-            if zstats["attempts"] > 0:
-                zstats["fg_pct"] = zstats["makes"] / zstats["attempts"]
+        new_player_games = []
+        for player_id, (stats, shot_zone_stats) in player_deltas.items():
+            if player_id in existing:
+                add_stat_delta(existing[player_id], stats, shot_zone_stats)
             else:
-                zstats["fg_pct"] = 0.0
+                new_player_games.append(PlayerGame(
+                    player_id_id=player_id,
+                    game_id_id=game_id,
+                    shot_zone_stats=shot_zone_stats,
+                    version=1,
+                    **stats,
+                ))
+        PlayerGame.objects.bulk_update(
+            existing.values(), [*PLAYER_GAME_FIELDS, "shot_zone_stats", "version"], batch_size=BULK_BATCH_SIZE
+        )
+        PlayerGame.objects.bulk_create(new_player_games, batch_size=BULK_BATCH_SIZE)
 
-        # For now, skip heatmap creation since we don't have proper Event objects
-        heatmap_url = None
+        # a player's first events in this game count as a game played
+        aggregate_fields = [*PLAYER_GAME_FIELDS, "games_played", "shot_zone_stats"]
+        apply_stat_deltas(
+            PlayerSeason,
+            ("player_id_id", "season_id_id"),
+            {
+                key: (stats, shot_zone_stats, int(key[0] not in existing))
+                for key, (stats, shot_zone_stats) in season_deltas.items()
+            },
+            aggregate_fields,
+        )
+        apply_stat_deltas(
+            PlayerCareer,
+            ("player_id_id",),
+            {
+                (player_id,): (stats, shot_zone_stats, int(player_id not in existing))
+                for player_id, (stats, shot_zone_stats) in player_deltas.items()
+            },
+            aggregate_fields,
+        )
 
+        # league-wide season totals behind GET /seasons/<id>/stats/
+        season_summary_deltas = defaultdict(lambda: {"games_count": 0, "total_points": 0, "total_games_played": 0})
+        for (player_id, season_id), (stats, _) in season_deltas.items():
+            summary = season_summary_deltas[season_id]
+            summary["games_count"] = int(new_game_season and season_id == game.season_id)
+            summary["total_points"] += stats["point"]
+            summary["total_games_played"] += int(player_id not in existing)
+        apply_stat_deltas(
+            SeasonSummary,
+            ("season_id_id",),
+            {(season_id,): (summary, {}, 0) for season_id, summary in season_summary_deltas.items()},
+            ["games_count", "total_points", "total_games_played"],
+        )
+
+    invalidate(
+        players=player_deltas,
+        seasons=[season_id for _, season_id in season_deltas],
+        games=[game_id],
+    )
+
+    heatmap_targets = (
+        [(player_id, HeatmapJob.Scope.SEASON, season_id) for player_id, season_id in season_deltas]
+        + [(player_id, HeatmapJob.Scope.GAME, game_id) for player_id in player_deltas]
+        + [(player_id, HeatmapJob.Scope.CAREER, 0) for player_id in player_deltas]
+    )
+    if not enqueue_jobs:
+        return len(new_events), heatmap_targets
+    # heatmaps are rebuilt off the request path by the heatmap job worker
+    enqueue_heatmap_jobs(heatmap_targets)
+    # async callers run the eager jobs themselves, concurrently
+    if settings.HEATMAP_JOBS_EAGER and run_eager_jobs:
+        run_heatmap_jobs()
+    return len(new_events), heatmap_targets
+
+
+def rebuild_season_summary(season_id):
+    """Recompute a season's summary row from scratch, e.g. after deletes."""
+    totals = PlayerSeason.objects.filter(season_id=season_id).aggregate(
+        points=Sum("point"), games_played=Sum("games_played")
+    )
+    games_count = Game.objects.filter(season_id=season_id).count()
+    summary = {
+        "games_count": games_count,
+        "total_points": totals["points"] or 0.0,
+        "total_games_played": totals["games_played"] or 0,
+    }
+    # a plain UPDATE is enough once the row exists; update_or_create would
+    # spend a savepoint pair and a locking read on it
+    updated = SeasonSummary.objects.filter(season_id_id=season_id).update(**summary, version=F("version") + 1)
+    if not updated:
+        SeasonSummary.objects.update_or_create(
+            season_id_id=season_id,
+            defaults={**summary, "version": F("version") + 1},
+            create_defaults={**summary, "version": 1},
+        )
+    invalidate(seasons=[season_id])
 
-        with transaction.atomic():
-            pg, _ = PlayerGame.objects.update_or_create(
-                player_id_id=player_id,
-                game_id_id=game_id,
-                defaults={
-                    **stats,
-                    "shot_zone_stats": shot_zone_stats,
-                    "heatmap_url": heatmap_url,
-                },
-            )
-        # Update season stats for this player using the season_id from events
-        season_id = evts[0]['season_id'] if evts else None
-        if season_id:
-            process_season(player_id, season_id)
 
-def process_season(player_id, season_id):
+def process_season(player_id, season_id, render_heatmap=True):
     # get PlayerGame rows for specific player and season
-    # Since games aren't directly linked to seasons, we need to find games through events
-    game_ids_in_season = Event.objects.filter(season=season_id).values_list('game', flat=True).distinct()
+    game_ids_in_season = Game.objects.filter(season_id=season_id).values_list('id', flat=True)
     player_games = PlayerGame.objects.filter(
         player_id=player_id,
         game_id__in=game_ids_in_season
@@ -128,16 +393,7 @@ def process_season(player_id, season_id):
     # zone stats
     combined_shot_zones = {}
     for pg in player_games:
-        for zone, zone_stats in pg.shot_zone_stats.items():
-            if zone not in combined_shot_zones:
-                combined_shot_zones[zone] = {"makes": 0, "attempts": 0}
-            combined_shot_zones[zone]["makes"] += zone_stats.get("makes", 0)
-            combined_shot_zones[zone]["attempts"] += zone_stats.get("attempts", 0)
-
-    # field goal percentage in zone
-    for zone, zone_stats in combined_shot_zones.items():
-        attempts = zone_stats["attempts"]
-        zone_stats["fg_pct"] = zone_stats["makes"] / attempts if attempts > 0 else 0.0
+        combined_shot_zones = merge_shot_zone_stats(combined_shot_zones, pg.shot_zone_stats)
 
     # # stat averages
     # gp = totals["games_played"] or 1
@@ -151,22 +407,24 @@ def process_season(player_id, season_id):
     #     "turnover_per_game": (totals["turnovers"] or 0) / gp,
     # }
 
-    events = list(Event.objects.filter(player_id=player_id, season_id=season_id))
-    heatmap = Heatmap(player_id, events)
-    image = heatmap.save_as_image()
-    heatmap_url = upload_heatmap_to_supabase(season_id, player_id, image)
+    defaults = {**totals, "shot_zone_stats": combined_shot_zones}
+    # bulk regeneration renders heatmaps separately, across a process pool
+    if render_heatmap:
+        events = list(Event.objects.filter(player_id=player_id, season_id=season_id))
+        heatmap = Heatmap(player_id, events)
+        image = heatmap.save_as_image()
+        defaults["heatmap_url"] = save_heatmap(season_id, player_id, image)
 
     PlayerSeason.objects.update_or_create(
         player_id_id=player_id,
         season_id_id=season_id,
-        defaults={
-            **totals,
-            "shot_zone_stats": combined_shot_zones,
-            "heatmap_url": heatmap_url,
-        },
+        defaults={**defaults, "version": F("version") + 1},
+        create_defaults={**defaults, "version": 1},
     )
+    rebuild_season_summary(season_id)
+    invalidate(players=[player_id])
 
-def process_player(player_id):
+def process_player(player_id, render_heatmap=True):
     player_seasons = PlayerSeason.objects.filter(player_id=player_id)
 
     totals = {
@@ -192,26 +450,79 @@ def process_player(player_id):
         totals["off_reb"] += ps.off_reb
         totals["def_reb"] += ps.def_reb
 
-        for zone, zone_stats in ps.shot_zone_stats.items():
-            if zone not in combined_shot_zones:
-                combined_shot_zones[zone] = {"makes": 0, "attempts": 0}
-            combined_shot_zones[zone]["makes"] += zone_stats.get("makes", 0)
-            combined_shot_zones[zone]["attempts"] += zone_stats.get("attempts", 0)
+        combined_shot_zones = merge_shot_zone_stats(combined_shot_zones, ps.shot_zone_stats)
 
-    for zone, zone_stats in combined_shot_zones.items():
-        attempts = zone_stats["attempts"]
-        zone_stats["fg_pct"] = zone_stats["makes"] / attempts if attempts > 0 else 0.0
-
-    events = list(Event.objects.filter(player_id=player_id))
-    player_heatmap = Heatmap(player_id, events)
-    image = player_heatmap.save_as_image()
-    heatmap_url = upload_heatmap_to_supabase("career", player_id, image)
+    defaults = {**totals, "shot_zone_stats": combined_shot_zones}
+    if render_heatmap:
+        events = list(Event.objects.filter(player_id=player_id))
+        player_heatmap = Heatmap(player_id, events)
+        image = player_heatmap.save_as_image()
+        defaults["heatmap_url"] = save_heatmap("career", player_id, image)
 
     PlayerCareer.objects.update_or_create(
         player_id_id=player_id,
-        defaults= {
-            **totals,
-            "shot_zone_stats" : combined_shot_zones,
-            "heatmap_url" : heatmap_url
-        }
-    )
\ No newline at end of file
+        defaults={**defaults, "version": F("version") + 1},
+        create_defaults={**defaults, "version": 1},
+    )
+    invalidate(players=[player_id])
+
+
+def _negated_delta(row, games_played):
+    """A stat delta that takes an aggregate row's totals back out."""
+    stats = {field: -getattr(row, field) for field in PLAYER_GAME_FIELDS}
+    shot_zone_stats = {
+        zone: {"makes": -z.get("makes", 0), "attempts": -z.get("attempts", 0)}
+        for zone, z in (row.shot_zone_stats or {}).items()
+    }
+    return stats, shot_zone_stats, -games_played
+
+
+def subtract_player_games(player_games, season_id):
+    """Take deleted PlayerGame rows back out of the season and career totals.
+
+    Ingest only ever adds deltas onto PlayerSeason and PlayerCareer, so
+    deleting a game has to subtract its rows again; each counted as one game
+    played. Same fixed number of bulk queries as ingest.
+    """
+    deltas = {pg.player_id_id: _negated_delta(pg, 1) for pg in player_games}
+    fields = [*PLAYER_GAME_FIELDS, "games_played", "shot_zone_stats"]
+    if season_id is not None:
+        apply_stat_deltas(
+            PlayerSeason, ("player_id_id", "season_id_id"),
+            {(player_id, season_id): delta for player_id, delta in deltas.items()}, fields,
+        )
+    apply_stat_deltas(PlayerCareer, ("player_id_id",), {(player_id,): delta for player_id, delta in deltas.items()}, fields)
+
+
+def subtract_player_seasons(player_seasons):
+    """Take deleted PlayerSeason rows back out of the career totals."""
+    deltas = defaultdict(list)
+    for ps in player_seasons:
+        deltas[(ps.player_id_id,)].append(_negated_delta(ps, ps.games_played))
+    combined = {}
+    for key, parts in deltas.items():
+        stats, zones, games_played = parts[0]
+        for more_stats, more_zones, more_games in parts[1:]:
+            stats = {field: stats[field] + value for field, value in more_stats.items()}
+            zones = merge_shot_zone_stats(zones, more_zones)
+            games_played += more_games
+        combined[key] = (stats, zones, games_played)
+    apply_stat_deltas(PlayerCareer, ("player_id_id",), combined, [*PLAYER_GAME_FIELDS, "games_played", "shot_zone_stats"])
+
+
+def subtract_season_summaries(player_seasons):
+    """Take deleted PlayerSeason rows back out of their seasons' summaries.
+
+    The season's game count is left alone: the games themselves remain.
+    """
+    deltas = defaultdict(lambda: {"total_points": 0, "total_games_played": 0})
+    for ps in player_seasons:
+        summary = deltas[ps.season_id_id]
+        summary["total_points"] -= ps.point
+        summary["total_games_played"] -= ps.games_played
+    apply_stat_deltas(
+        SeasonSummary,
+        ("season_id_id",),
+        {(season_id,): (summary, {}, 0) for season_id, summary in deltas.items()},
+        ["total_points", "total_games_played"],
+    )
@@ -1,46 +1,309 @@
-from supabase import create_client
+"""Heatmap uploads to Supabase Storage.
+
+Uploads go straight to the Storage REST API. The sync path shares one pooled
+httpx client per process, and the async path one AsyncClient per event loop,
+so repeated uploads reuse keep-alive connections instead of paying a TLS
+handshake each time. The bucket that last accepted an upload is tried first
+from then on.
+
+Objects are named after a hash of the PNG bytes, and every successful
+upload is recorded in a local manifest (HEATMAP_UPLOAD_MANIFEST). A
+re-rendered heatmap with unchanged bytes resolves to the URL it already
+has, without another upload. The manifest also remembers the latest object
+of each (game, player) heatmap, and the object a changed heatmap replaces
+is deleted, so the bucket holds one object per heatmap. Without a manifest
+nothing is tracked, and replaced objects are left in the bucket.
+"""
+import asyncio
+import hashlib
+import json
 import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def upload_heatmap_to_supabase(game_id, player_id, image):
-    # Initialize Supabase client only if environment variables are available
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+BUCKETS = ("heatmap", "public")
+
+_client = None
+_client_config = None
+_client_lock = threading.Lock()
+# event loop -> (AsyncClient, config); a client's connections belong to its loop
+_async_clients = weakref.WeakKeyDictionary()
+# bucket that last accepted an upload, tried first by later uploads
+_bucket = None
+
+
+class UploadManifest:
+    """Append-only JSON-lines record of uploaded objects and their URLs.
+
+    Lines appended by other processes are picked up on the next lookup, so
+    the web process and the heatmap worker share what they uploaded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._urls = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            if os.path.getsize(self.path) <= self._offset:
+                return
+        except FileNotFoundError:
+            return
+        with open(self.path, "rb") as manifest:
+            manifest.seek(self._offset)
+            for line in manifest:
+                if not line.endswith(b"\n"):
+                    break  # partially written by another process
+                self._offset += len(line)
+                entry = json.loads(line)
+                self._urls[entry["key"]] = entry["url"]
+
+    def get(self, key):
+        with self._lock:
+            self._refresh()
+            return self._urls.get(key)
+
+    def add(self, key, url):
+        """Record ``key``'s URL; a None URL forgets it."""
+        line = json.dumps({"key": key, "url": url}) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # a single O_APPEND write, so concurrent writers don't interleave
+            with open(self.path, "a", encoding="utf-8") as manifest:
+                manifest.write(line)
+            self._urls[key] = url
+
+
+@lru_cache(maxsize=None)
+def _manifest_at(path):
+    return UploadManifest(path)
+
+
+def get_upload_manifest():
+    """The manifest at HEATMAP_UPLOAD_MANIFEST, or None when it is disabled."""
+    path = settings.HEATMAP_UPLOAD_MANIFEST
+    return _manifest_at(str(path)) if path else None
+
+
+def heatmap_object_name(game_id, player_id, image_bytes):
+    digest = hashlib.sha256(image_bytes).hexdigest()[:16]
+    return f"heatmap-{player_id}-{game_id}-{digest}"
+
+
+def _supersede(manifest, base_url, game_id, player_id, url):
+    """Record ``url`` as the heatmap's latest object.
+
+    Returns the ``bucket/name`` path of the object it replaces, or None. The
+    replaced object is forgotten, so the same bytes would be uploaded again.
+    """
+    heatmap_key = f"{base_url}heatmap-{player_id}-{game_id}"
+    previous = manifest.get(heatmap_key)
+    manifest.add(heatmap_key, url)
+    if previous is None or previous == url:
+        return None
+    path = previous.removeprefix(f"{base_url}object/public/")
+    manifest.add(f"{base_url}{path.partition('/')[2]}", None)
+    return path
+
+
+def _placeholder_url(game_id, player_id):
+    return f"https://placeholder.com/heatmap-{player_id}-{game_id}"
+
+
+def _storage_config():
     supabase_url = os.getenv("SUPABASE_URL")
-    #supabase_key = os.getenv("SUPABASE_KEY")
     supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
     if not supabase_url or not supabase_service_key:
+        return None
+    return f"{supabase_url.rstrip('/')}/storage/v1", supabase_service_key
+
+
+def _storage_headers(supabase_service_key):
+    return {
+        "Authorization": f"Bearer {supabase_service_key}",
+        "apikey": supabase_service_key,
+        "content-type": "image/png",
+        # an object re-uploaded after a lost manifest has the same bytes
+        "x-upsert": "true",
+    }
+
+
+def _bucket_order():
+    if _bucket is None:
+        return BUCKETS
+    return (_bucket, *(bucket for bucket in BUCKETS if bucket != _bucket))
+
+
+def _client_limits():
+    connections = settings.HEATMAP_UPLOAD_CONCURRENCY
+    return httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+
+def get_storage_client():
+    """The process-wide pooled Storage client, or None without credentials."""
+    global _client, _client_config
+    config = _storage_config()
+    if config is None:
+        return None
+    with _client_lock:
+        if _client is None or _client_config != config:
+            if _client is not None:
+                _client.close()
+            storage_url, supabase_service_key = config
+            _client = httpx.Client(
+                base_url=storage_url,
+                headers=_storage_headers(supabase_service_key),
+                timeout=30,
+                limits=_client_limits(),
+            )
+            _client_config = config
+        return _client
+
+
+def _aclose_on_loop(loop, client):
+    # AsyncClient.aclose() must run on the loop that owns the connections
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+
+
+def get_async_storage_client():
+    """The pooled async Storage client for the running event loop, or None."""
+    config = _storage_config()
+    if config is None:
+        return None
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        # pooled connections keep their loop alive, so drop finished loops' clients
+        for closed in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[closed]
+        client, client_config = _async_clients.get(loop, (None, None))
+        if client is None or client_config != config:
+            if client is not None:
+                _aclose_on_loop(loop, client)
+            storage_url, supabase_service_key = config
+            client = httpx.AsyncClient(
+                base_url=storage_url,
+                headers=_storage_headers(supabase_service_key),
+                timeout=30,
+                limits=_client_limits(),
+            )
+            _async_clients[loop] = (client, config)
+        return client
+
+
+def reset_storage_client():
+    """Close the pooled clients and forget the working bucket."""
+    global _client, _client_config, _bucket
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        for loop, (client, _) in list(_async_clients.items()):
+            _aclose_on_loop(loop, client)
+        _async_clients.clear()
+        _client = _client_config = _bucket = None
+
+
+def upload_heatmap_to_supabase(game_id, player_id, image):
+    global _bucket
+    client = get_storage_client()
+    if client is None:
         print(f" Supabase environment variables not set")
-        print(f"   - SUPABASE_URL: {'Set' if supabase_url else 'Not set'}")
-        print(f"   - SUPABASE_KEY: {'Set' if supabase_service_key else 'Not set'}")
+        print(f"   - SUPABASE_URL: {'Set' if os.getenv('SUPABASE_URL') else 'Not set'}")
+        print(f"   - SUPABASE_KEY: {'Set' if os.getenv('SUPABASE_SERVICE_ROLE_KEY') else 'Not set'}")
         # Return a placeholder URL for testing
-        return f"https://placeholder.com/heatmap-{player_id}-{game_id}"
-    
-    try:
-        supabase = create_client(supabase_url, supabase_service_key)
-        print(f"Supabase client initialized successfully")
-        
-        image_name = f"heatmap-{player_id}-{game_id}"
-        
-        # Convert BytesIO to bytes for upload
-        image_bytes = image.getvalue()
-        
+        return _placeholder_url(game_id, player_id)
+
+    image_bytes = image.getvalue()
+    image_name = heatmap_object_name(game_id, player_id, image_bytes)
+    manifest = get_upload_manifest()
+    manifest_key = f"{client.base_url}{image_name}"
+    if manifest is not None and (url := manifest.get(manifest_key)):
+        return url
+
+    for bucket in _bucket_order():
         try:
-            # Try to upload to the heatmap bucket
-            supabase.storage.from_("heatmap").upload(image_name, image_bytes, {"content-type": "image/png"})
-            return supabase.storage.from_("heatmap").get_public_url(image_name)
-        except Exception as upload_error:
-            print(f"   - Upload to 'heatmap' bucket failed: {upload_error}")
-            
-            # Try to upload to a different bucket or create a public URL
-            try:
-                # Try to upload to a public bucket
-                supabase.storage.from_("public").upload(image_name, image_bytes, {"content-type": "image/png"})
-                return supabase.storage.from_("public").get_public_url(image_name)
-            except Exception as public_error:
-                print(f"   - Upload to 'public' bucket also failed: {public_error}")
-                # Return a placeholder URL
-                return f"https://placeholder.com/heatmap-{player_id}-{game_id}"
-        
-    except Exception as e:
-        print(f"❌ Supabase client creation failed: {e}")
-        # Return a placeholder URL for testing
-        return f"https://placeholder.com/heatmap-{player_id}-{game_id}"
\ No newline at end of file
+            response = client.post(f"/object/{bucket}/{image_name}", content=image_bytes)
+            response.raise_for_status()
+        except httpx.HTTPError as upload_error:
+            print(f"   - Upload to '{bucket}' bucket failed: {upload_error}")
+            continue
+        _bucket = bucket
+        url = f"{client.base_url}object/public/{bucket}/{image_name}"
+        if manifest is not None:
+            manifest.add(manifest_key, url)
+            if replaced := _supersede(manifest, client.base_url, game_id, player_id, url):
+                try:
+                    client.delete(f"/object/{replaced}").raise_for_status()
+                except httpx.HTTPError as delete_error:
+                    print(f"   - Deleting replaced heatmap '{replaced}' failed: {delete_error}")
+        return url
+
+    # Return a placeholder URL
+    return _placeholder_url(game_id, player_id)
+
+
+def upload_heatmaps_to_supabase(uploads, max_workers=None):
+    """Upload many ``(game_id, player_id, image)`` heatmaps concurrently.
+
+    At most ``max_workers`` (default HEATMAP_UPLOAD_CONCURRENCY) uploads are
+    in flight, all over the pooled client. Returns the URLs in input order.
+    """
+    uploads = list(uploads)
+    workers = min(max_workers or settings.HEATMAP_UPLOAD_CONCURRENCY, len(uploads))
+    if workers <= 1:
+        return [upload_heatmap_to_supabase(*upload) for upload in uploads]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda upload: upload_heatmap_to_supabase(*upload), uploads))
+
+
+async def aupload_heatmap_to_supabase(game_id, player_id, image):
+    """Async upload through the Supabase Storage REST API, for async views.
+
+    Same buckets, names and fallbacks as upload_heatmap_to_supabase, over
+    the running loop's pooled AsyncClient.
+    """
+    global _bucket
+    client = get_async_storage_client()
+    if client is None:
+        print(f" Supabase environment variables not set")
+        return _placeholder_url(game_id, player_id)
+
+    image_bytes = image.getvalue()
+    image_name = heatmap_object_name(game_id, player_id, image_bytes)
+    manifest = get_upload_manifest()
+    manifest_key = f"{client.base_url}{image_name}"
+    # the manifest reads and appends a file; keep that off the event loop
+    if manifest is not None and (url := await sync_to_async(manifest.get, thread_sensitive=False)(manifest_key)):
+        return url
+
+    for bucket in _bucket_order():
+        try:
+            response = await client.post(f"/object/{bucket}/{image_name}", content=image_bytes)
+            response.raise_for_status()
+        except httpx.HTTPError as upload_error:
+            print(f"   - Upload to '{bucket}' bucket failed: {upload_error}")
+            continue
+        _bucket = bucket
+        url = f"{client.base_url}object/public/{bucket}/{image_name}"
+        if manifest is not None:
+            await sync_to_async(manifest.add, thread_sensitive=False)(manifest_key, url)
+            replaced = await sync_to_async(_supersede, thread_sensitive=False)(
+                manifest, client.base_url, game_id, player_id, url
+            )
+            if replaced:
+                try:
+                    (await client.delete(f"/object/{replaced}")).raise_for_status()
+                except httpx.HTTPError as delete_error:
+                    print(f"   - Deleting replaced heatmap '{replaced}' failed: {delete_error}")
+        return url
+
+    # Return a placeholder URL
+    return _placeholder_url(game_id, player_id)
@@ -1,35 +1,182 @@
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from django.shortcuts import get_object_or_404
-from .models import PlayerGame, PlayerSeason, Game, PlayerCareer, Player, Season
-from .serializers import PlayerGameSerializer, PlayerSeasonSerializer, GameSerializer, PlayerCareerStatsSerializer, PlayerSerializer, SeasonSerializer, EventSerializer
-from .utility.process_data_util import process_game
+from django.views.decorators.http import condition
+from django.db.models import F
+from .models import PlayerGame, PlayerSeason, Game, PlayerCareer, Player, Season, SeasonSummary, Event, HeatmapJob
+from .serializers import PlayerGameSerializer, PlayerSeasonSerializer, GameSerializer, PlayerCareerStatsSerializer, PlayerSerializer, SeasonSerializer, EventSerializer, StreamEventSerializer
+from .utility.process_data_util import EventReferenceError, process_game, rebuild_season_summary, subtract_player_games, subtract_player_seasons, subtract_season_summaries
+from .utility.heatmap_job_util import enqueue_heatmap_jobs, run_heatmap_jobs
+from .renderers import FastJSONRenderer, orjson
+from collections import defaultdict
+from django.conf import settings
+from django.db import IntegrityError, transaction
+import json
+from .pagination import list_response
+from .response_cache import cached_response, invalidate
+from .etags import player_game_etag, player_season_etag, player_career_etag, season_summary_etag, season_players_etag
 from rest_framework import serializers
 
 
 # Create your views here.
 
+@condition(etag_func=player_game_etag)
 @api_view(["GET"])
+@cached_response("game_id", "player_id", stamp=player_game_etag)
 def get_player_game(request, game_id, player_id):
-    pg = get_object_or_404(PlayerGame, game_id=game_id, player_id=player_id)
+    pg = get_object_or_404(PlayerGame.objects.select_related('player_id'), game_id=game_id, player_id=player_id)
     serializer = PlayerGameSerializer(pg)
     return Response(serializer.data)
 
+@condition(etag_func=player_season_etag)
 @api_view(["GET"])
+@cached_response("player_id", "season_id", stamp=player_season_etag)
 def get_player_season(request, season_id, player_id):
-    player_season = get_object_or_404(PlayerSeason, season_id=season_id, player_id=player_id)
+    player_season = get_object_or_404(
+        PlayerSeason.objects.select_related('player_id'), season_id=season_id, player_id=player_id
+    )
     serializer = PlayerSeasonSerializer(player_season)
     return Response(serializer.data)
 
+def batched_events(payload):
+    """The payload's events, keyed by its ``batch_id`` when one is given.
+
+    Each event gets the batch id and, unless it has its own, its position in
+    the batch as ``seq``, so a retried POST of the same batch is skipped.
+    A seq given twice (e.g. an explicit one matching another event's
+    position) fails validation rather than dropping an event.
+    """
+    events = payload.get("events", [])
+    batch_id = payload.get("batch_id")
+    if batch_id is None or not isinstance(events, list):
+        return events
+    return [
+        {"batch_id": batch_id, "seq": seq, **event} if isinstance(event, dict) else event
+        for seq, event in enumerate(events)
+    ]
+
+BATCH_CONFLICT = {"error": "This batch is being ingested by another request; retry it"}
+
+def is_batch_conflict(error):
+    """Whether an IntegrityError comes from unique_event_batch_seq."""
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is None:
+        return False
+    if diag.constraint_name == "unique_event_batch_seq":
+        return True
+    # on the season-partitioned games_event, Postgres reports the partition's
+    # copy of the constraint, which it names itself; its key columns are fixed
+    return diag.sqlstate == "23505" and (diag.message_detail or "").startswith("Key (batch_id, seq, season_id)=")
+
 @api_view(["POST"])
 def post_events(request, game_id):
-    events_data = request.data.get("events", [])
-    serializer = EventSerializer(data=events_data, many=True)
+    serializer = EventSerializer(data=batched_events(request.data), many=True)
     if serializer.is_valid():
-        process_game(serializer.validated_data, game_id)
+        try:
+            inserted, _ = process_game(serializer.validated_data, game_id)
+        except IntegrityError as error:
+            # a concurrent replay of the same batch won the unique constraint
+            if not is_batch_conflict(error):
+                raise
+            return Response(BATCH_CONFLICT, status=409)
+        if serializer.validated_data and not inserted:
+            return Response({"message": "Batch already ingested"})
         return Response({"message": "Events processed successfully"})
     return Response(serializer.errors, status=400)
 
+class StreamLineError(Exception):
+    def __init__(self, line, errors):
+        super().__init__(line, errors)
+        self.line = line
+        self.errors = errors
+
+
+def _ndjson_chunks(stream, chunk_size):
+    """Yield ``(first_line_number, rows)`` chunks of a newline-delimited JSON stream."""
+    loads = orjson.loads if orjson else json.loads
+    chunk, first_line = [], 1
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = loads(line)
+        except ValueError:
+            raise StreamLineError(line_number, "Invalid JSON")
+        if not chunk:
+            first_line = line_number
+        chunk.append((line_number, row))
+        if len(chunk) >= chunk_size:
+            yield first_line, chunk
+            chunk = []
+    if chunk:
+        yield first_line, chunk
+
+
+@api_view(["POST"])
+def post_events_stream(request):
+    """Ingest newline-delimited JSON events, one event (with its game_id) per line.
+
+    The body is read line by line and validated and written in chunks of
+    STREAM_INGEST_CHUNK_SIZE events, so memory stays flat however large the
+    upload. The whole stream is one transaction: an invalid line rejects it
+    with nothing ingested. Heatmap jobs are queued once at the end.
+    """
+    stream = request.stream
+    if stream is None:
+        return Response({"error": "Empty body"}, status=400)
+
+    total_events, game_ids, heatmap_targets = 0, set(), set()
+    try:
+        with transaction.atomic():
+            for _, chunk in _ndjson_chunks(stream, settings.STREAM_INGEST_CHUNK_SIZE):
+                serializer = StreamEventSerializer(data=[row for _, row in chunk], many=True)
+                if not serializer.is_valid():
+                    # a list of per-row errors, or {index: errors} for the failing rows only
+                    errors = serializer.errors
+                    rows = errors.items() if isinstance(errors, dict) else enumerate(errors)
+                    index, row_errors = min((i, e) for i, e in rows if e)
+                    raise StreamLineError(chunk[index][0], row_errors)
+
+                by_game = defaultdict(list)
+                for (line_number, _), event in zip(chunk, serializer.validated_data):
+                    by_game[event["game_id"]].append((line_number, event))
+                known = set(Game.objects.filter(id__in=by_game).values_list("id", flat=True))
+                for game_id, events in by_game.items():
+                    if game_id not in known:
+                        raise StreamLineError(events[0][0], {"game_id": ["Game not found."]})
+                    try:
+                        inserted, targets = process_game([event for _, event in events], game_id, enqueue_jobs=False)
+                    except EventReferenceError as error:
+                        line_number, event = next(
+                            (line_number, event) for line_number, event in events
+                            if any(event[field] in ids for field, ids in error.invalid.items())
+                        )
+                        raise StreamLineError(line_number, {
+                            field: [error.message.format(pk=event[field])]
+                            for field, ids in error.invalid.items() if event[field] in ids
+                        })
+                    # replayed batch events are skipped, not counted
+                    total_events += inserted
+                    heatmap_targets.update(targets)
+                game_ids.update(by_game)
+    except StreamLineError as error:
+        return Response({"line": error.line, "errors": error.errors}, status=400)
+    except IntegrityError as error:
+        if not is_batch_conflict(error):
+            raise
+        return Response(BATCH_CONFLICT, status=409)
+
+    # process_game invalidated before the commit; retire anything cached since
+    invalidate(
+        players={player_id for player_id, _, _ in heatmap_targets},
+        seasons={scope_id for _, scope, scope_id in heatmap_targets if scope == HeatmapJob.Scope.SEASON},
+        games=game_ids,
+    )
+    enqueue_heatmap_jobs(heatmap_targets)
+    if settings.HEATMAP_JOBS_EAGER:
+        run_heatmap_jobs()
+    return Response({"message": "Events processed successfully", "events": total_events, "games": len(game_ids)})
+
 @api_view(["POST"])
 def create_player(request):
     serializer = PlayerSerializer(data=request.data)
@@ -39,16 +186,18 @@ def create_player(request):
     return Response(serializer.errors, status=400)
 
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
 def get_all_players_game(request, game_id):
-    player_games = PlayerGame.objects.filter(game_id=game_id)
-    serializer = PlayerGameSerializer(player_games, many=True)
-    return Response(serializer.data)
+    player_games = PlayerGame.objects.filter(game_id=game_id).select_related('player_id')
+    return list_response(request, player_games, PlayerGameSerializer, fast=True)
 
+@condition(etag_func=season_players_etag)
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
+@cached_response("season_id", stamp=season_players_etag)
 def get_all_players_season(request, season_id):
     player_seasons = PlayerSeason.objects.filter(season_id=season_id).select_related('player_id')
-    serializer = PlayerSeasonSerializer(player_seasons, many=True)
-    return Response(serializer.data)
+    return list_response(request, player_seasons, PlayerSeasonSerializer, fast=True)
 
 @api_view(["POST"])
 def create_game(request):
@@ -64,17 +213,15 @@ def list_players(request):
     players = Player.objects.all()
     if search:
         players = players.filter(name__icontains=search)
-    serializer = PlayerSerializer(players, many=True)
-    return Response(serializer.data)
+    return list_response(request, players, PlayerSerializer)
 
 @api_view(["GET"])
 def list_games(request):
     season_id = request.query_params.get("season_id")
     games = Game.objects.all()
     if season_id:
-        games = games.filter(events__season_id=season_id).distinct()
-    serializer = GameSerializer(games, many=True)
-    return Response(serializer.data)
+        games = games.filter(season_id=season_id)
+    return list_response(request, games, GameSerializer)
 
 @api_view(["GET"])
 def list_seasons(request):
@@ -82,13 +229,14 @@ def list_seasons(request):
     seasons = Season.objects.all()
     if search:
         seasons = seasons.filter(name__icontains=search)
-    serializer = SeasonSerializer(seasons, many=True)
-    return Response(serializer.data)
+    return list_response(request, seasons, SeasonSerializer)
 
+@condition(etag_func=player_career_etag)
 @api_view(["GET"])
+@cached_response("player_id", stamp=player_career_etag)
 def get_player_stats(request, player_id):
     try:
-        career = PlayerCareer.objects.get(player_id=player_id)
+        career = PlayerCareer.objects.select_related('player_id').get(player_id=player_id)
     except PlayerCareer.DoesNotExist:
         return Response({"error": "No career stats found"}, status=404)
 
@@ -96,12 +244,12 @@ def get_player_stats(request, player_id):
     return Response(serializer.data)
 
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
 def get_player_game_stats(request, player_id):
     """Get all game statistics for a specific player"""
     try:
-        player_games = PlayerGame.objects.filter(player_id=player_id).select_related('game_id')
-        serializer = PlayerGameSerializer(player_games, many=True)
-        return Response(serializer.data)
+        player_games = PlayerGame.objects.filter(player_id=player_id).select_related('player_id')
+        return list_response(request, player_games, PlayerGameSerializer, fast=True)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
@@ -112,26 +260,56 @@ from rest_framework import status
 @api_view(["DELETE"])
 def delete_game(request, game_id):
     game = get_object_or_404(Game, id=game_id)
-    game.delete()
+    season_id = game.season_id
+    with transaction.atomic():
+        player_games = list(PlayerGame.objects.filter(game_id=game_id))
+        # take the game's stats back out of the season and career totals
+        subtract_player_games(player_games, season_id)
+        game.delete()
+        if season_id:
+            rebuild_season_summary(season_id)
+    player_ids = [pg.player_id_id for pg in player_games]
+    enqueue_heatmap_jobs(
+        [(player_id, HeatmapJob.Scope.SEASON, season_id) for player_id in player_ids if season_id]
+        + [(player_id, HeatmapJob.Scope.CAREER, 0) for player_id in player_ids]
+    )
+    invalidate(players=player_ids, seasons=[season_id] if season_id else [], games=[game_id])
     return Response(status=204)
 
 @api_view(["DELETE"])
 def delete_season(request, season_id, player_id):
     season = get_object_or_404(PlayerSeason, season_id=season_id, player_id=player_id)
-    season.delete()
+    with transaction.atomic():
+        subtract_player_seasons([season])
+        subtract_season_summaries([season])
+        season.delete()
+    enqueue_heatmap_jobs([(player_id, HeatmapJob.Scope.CAREER, 0)])
+    invalidate(players=[player_id], seasons=[season_id])
     return Response(status=204)
 
 @api_view(["DELETE"])
 def delete_season_record(request, season_id):
     """Delete the actual Season record and all related data"""
     season = get_object_or_404(Season, id=season_id)
-    season.delete()
+    with transaction.atomic():
+        player_seasons = list(PlayerSeason.objects.filter(season_id=season_id))
+        subtract_player_seasons(player_seasons)
+        season.delete()
+    player_ids = [ps.player_id_id for ps in player_seasons]
+    enqueue_heatmap_jobs([(player_id, HeatmapJob.Scope.CAREER, 0) for player_id in player_ids])
+    invalidate(players=player_ids, seasons=[season_id])
     return Response(status=204)
 
 @api_view(["DELETE"])
 def delete_player(request, player_id):
     player = get_object_or_404(Player, id=player_id)
-    player.delete()
+    with transaction.atomic():
+        player_seasons = list(PlayerSeason.objects.filter(player_id=player_id))
+        # the player's points leave the league-wide season totals too
+        subtract_season_summaries(player_seasons)
+        player.delete()
+    season_ids = [ps.season_id_id for ps in player_seasons]
+    invalidate(players=[player_id], seasons=season_ids)
     return Response(status=204)
 
 @api_view(["PATCH", "PUT"])
@@ -140,6 +318,11 @@ def update_player(request, player_id):
     serializer = PlayerSerializer(player, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        # stat payloads embed the player's name, so their ETags must move
+        for model in (PlayerGame, PlayerSeason, PlayerCareer):
+            model.objects.filter(player_id=player_id).update(version=F("version") + 1)
+        season_ids = PlayerSeason.objects.filter(player_id=player_id).values_list("season_id", flat=True)
+        invalidate(players=[player_id], seasons=season_ids)
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 
@@ -149,6 +332,8 @@ def update_season(request, season_id):
     serializer = SeasonSerializer(season, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        SeasonSummary.objects.filter(season_id=season_id).update(version=F("version") + 1)
+        invalidate(seasons=[season_id])
         return Response(serializer.data)
     return Response(serializer.errors, status=400)
 
@@ -163,12 +348,15 @@ def create_season(request):
 
 @api_view(["PATCH", "PUT"])
 def update_game(request, game_id):
-    game = get_object_or_404(Game, id=game_id)
-    serializer = GameSerializer(game, data=request.data, partial=True)
-    if serializer.is_valid():
+    with transaction.atomic():
+        # locked like ingest does, so no events land between the check and the save
+        game = get_object_or_404(Game.objects.select_for_update(), id=game_id)
+        serializer = GameSerializer(game, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
         serializer.save()
-        return Response(serializer.data)
-    return Response(serializer.errors, status=400)
+    invalidate(games=[game_id])
+    return Response(serializer.data)
 
 
 # Additional endpoints
@@ -190,39 +378,40 @@ def get_season(request, season_id):
     serializer = SeasonSerializer(season)
     return Response(serializer.data)
 
+@condition(etag_func=season_summary_etag)
 @api_view(["GET"])
+@cached_response("season_id", stamp=season_summary_etag)
 def get_season_stats(request, season_id):
     """Get aggregated statistics for a season"""
     try:
-        season = get_object_or_404(Season, id=season_id)
-        
-        # Get all games in this season (through events)
-        games_in_season = Game.objects.filter(events__season_id=season_id).distinct()
-        games_count = games_in_season.count()
-        
-        # Get all player season stats for this season
-        player_seasons = PlayerSeason.objects.filter(season_id=season_id)
-        
-        # Calculate total points and games played across all players
-        total_points = sum(ps.point for ps in player_seasons)
-        total_games_played = sum(ps.games_played for ps in player_seasons)
+        # one query: the summary row is maintained by ingest
+        season = get_object_or_404(Season.objects.select_related("summary"), id=season_id)
+        try:
+            summary = season.summary
+        except SeasonSummary.DoesNotExist:
+            summary = SeasonSummary(season_id=season)
         
         # Calculate average PPG (total points / total games played by all players)
-        avg_ppg = total_points / total_games_played if total_games_played > 0 else 0.0
+        total_games_played = summary.total_games_played
+        avg_ppg = summary.total_points / total_games_played if total_games_played > 0 else 0.0
         
         return Response({
             'season_id': season_id,
             'season_name': season.name,
-            'games_count': games_count,
+            'games_count': summary.games_count,
             'avg_ppg': round(avg_ppg, 1),
-            'total_points': total_points,
+            'total_points': summary.total_points,
             'total_games_played': total_games_played
         })
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
-from django.http import HttpResponse
-from .heatmap import Heatmap
+from django.http import FileResponse, Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from .heatmap_cache import cached_heatmap_png
+from .heatmap_storage import get_heatmap_storage
+from .partitions import game_event_filter
+from .hexbin import shot_hexbins, MADE_ACTIONS, MISSED_ACTIONS
 from .models import Event
 import base64
 import io
@@ -235,6 +424,10 @@ def player_heatmap(request, game_id, player_id):
     except PlayerGame.DoesNotExist:
         return Response({"error": "Player game not found"}, status=404)
 
+def _heatmap_data(png):
+    # Convert to base64 for frontend display
+    return f"data:image/png;base64,{base64.b64encode(png).decode('utf-8')}"
+
 @api_view(["GET"])
 def generate_player_heatmap(request, player_id):
     """Generate heatmap for a player's career"""
@@ -242,23 +435,19 @@ def generate_player_heatmap(request, player_id):
         player = Player.objects.get(id=player_id)
         events = Event.objects.filter(player_id=player_id)
         
-        if not events.exists():
-            return Response({"error": f"No events found for player: {player.name}"}, status=404)
-        
         try:
-            heatmap = Heatmap(player_id=player_id, events=list(events))
-            buf = heatmap.save_as_image()
-            
-            # Convert to base64 for frontend display
-            image_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-            
-            return Response({
-                "heatmap_data": f"data:image/png;base64,{image_data}",
-                "player_name": player.name,
-                "total_events": events.count()
-            })
+            png, total_events = cached_heatmap_png(f"player:{player_id}", events)
         except Exception as e:
             return Response({"error": f"Heatmap generation failed: {str(e)}"}, status=500)
+
+        if png is None:
+            return Response({"error": f"No events found for player: {player.name}"}, status=404)
+
+        return Response({
+            "heatmap_data": _heatmap_data(png),
+            "player_name": player.name,
+            "total_events": total_events
+        })
     except Player.DoesNotExist:
         return Response({"error": "Player not found"}, status=404)
     except Exception as e:
@@ -275,23 +464,21 @@ def generate_season_heatmap(request, season_id, player_id=None):
             events = Event.objects.filter(season_id=season_id, player_id=player_id)
             player = Player.objects.get(id=player_id)
             title = f"{player.name} - {season.name}"
+            scope = f"season:{season_id}:player:{player_id}"
         else:
             # All players in season
             events = Event.objects.filter(season_id=season_id)
             title = f"All Players - {season.name}"
+            scope = f"season:{season_id}"
         
-        if not events.exists():
+        png, total_events = cached_heatmap_png(scope, events)
+        if png is None:
             return Response({"error": f"No events found for season: {season.name}"}, status=404)
         
-        heatmap = Heatmap(events=list(events))
-        buf = heatmap.save_as_image()
-        
-        image_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-        
         return Response({
-            "heatmap_data": f"data:image/png;base64,{image_data}",
+            "heatmap_data": _heatmap_data(png),
             "title": title,
-            "total_events": events.count()
+            "total_events": total_events
         })
     except Season.DoesNotExist:
         return Response({"error": "Season not found"}, status=404)
@@ -304,26 +491,24 @@ def generate_game_heatmap(request, game_id, player_id=None):
         
         if player_id:
             # Specific player's game heatmap
-            events = Event.objects.filter(game_id=game_id, player_id=player_id)
+            events = Event.objects.filter(**game_event_filter(game), player_id=player_id)
             player = Player.objects.get(id=player_id)
             title = f"{player.name} vs {game.opponent}"
+            scope = f"game:{game_id}:player:{player_id}"
         else:
             # All players in game
-            events = Event.objects.filter(game_id=game_id)
+            events = Event.objects.filter(**game_event_filter(game))
             title = f"All Players vs {game.opponent}"
+            scope = f"game:{game_id}"
         
-        if not events.exists():
+        png, total_events = cached_heatmap_png(scope, events)
+        if png is None:
             return Response({"error": f"No events found for game vs {game.opponent}"}, status=404)
         
-        heatmap = Heatmap(events=list(events))
-        buf = heatmap.save_as_image()
-        
-        image_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-        
         return Response({
-            "heatmap_data": f"data:image/png;base64,{image_data}",
+            "heatmap_data": _heatmap_data(png),
             "title": title,
-            "total_events": events.count()
+            "total_events": total_events
         })
     except Game.DoesNotExist:
         return Response({"error": "Game not found"}, status=404)
@@ -336,18 +521,47 @@ def generate_player_season_heatmap(request, player_id, season_id):
         season = Season.objects.get(id=season_id)
         events = Event.objects.filter(player_id=player_id, season_id=season_id)
         
-        if not events.exists():
+        png, total_events = cached_heatmap_png(f"season:{season_id}:player:{player_id}", events)
+        if png is None:
             return Response({"error": "No events found for this player in this season"}, status=404)
         
-        heatmap = Heatmap(player_id=player_id, events=list(events))
-        buf = heatmap.save_as_image()
-        
-        image_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-        
         return Response({
-            "heatmap_data": f"data:image/png;base64,{image_data}",
+            "heatmap_data": _heatmap_data(png),
             "title": f"{player.name} - {season.name}",
-            "total_events": events.count()
+            "total_events": total_events
         })
     except (Player.DoesNotExist, Season.DoesNotExist):
         return Response({"error": "Player or Season not found"}, status=404)
+
+@api_view(["GET"])
+def heatmap_bins(request):
+    """Raw make/miss hexbin counts so the frontend can draw the heatmap itself"""
+    filters = {}
+    for param in ("player_id", "season_id", "game_id"):
+        value = request.query_params.get(param)
+        if value is not None:
+            if not value.isdigit():
+                return Response({"error": f"{param} must be an integer"}, status=400)
+            filters[param] = int(value)
+    if not filters:
+        return Response({"error": "Provide player_id, season_id and/or game_id"}, status=400)
+
+    gridsize = request.query_params.get("gridsize", "20")
+    if not gridsize.isdigit() or not 1 <= int(gridsize) <= 100:
+        return Response({"error": "gridsize must be an integer between 1 and 100"}, status=400)
+
+    shots = Event.objects.filter(
+        **filters, action__in=MADE_ACTIONS + MISSED_ACTIONS
+    ).values_list("x", "y", "action")
+    return Response(shot_hexbins(shots, int(gridsize)))
+
+@require_GET
+def heatmap_file(request, name):
+    """Serve a heatmap saved by the filesystem or in-memory storage backend"""
+    image = get_heatmap_storage().open(name)
+    if image is None:
+        raise Http404("Heatmap not found")
+    response = FileResponse(image, content_type="image/png")
+    # names are content hashes, so a stored image never changes
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
@@ -4,6 +4,7 @@ Script to populate PlayerCareer records with calculated statistics from Event da
 This will fix the issue where player statistics show as 0 despite having events.
 """
 
+import argparse
 import os
 import django
 from django.conf import settings
@@ -14,16 +15,22 @@ django.setup()
 
 from games.models import Player, PlayerCareer, Event, PlayerGame, PlayerSeason
 from games.utility.process_data_util import process_player
+from games.utility.bulk_heatmap_util import regenerate_heatmaps
 from django.db.models import Count, Sum
 
-def populate_player_careers():
-    """Populate PlayerCareer records for all players"""
+def populate_player_careers(parallel=False):
+    """Populate PlayerCareer records for all players
+
+    With ``parallel``, career heatmaps are rendered afterwards across a
+    process pool instead of one player at a time.
+    """
     print("🏀 Populating Player Career Statistics")
     print("=" * 50)
     
     players = Player.objects.all()
     print(f"Found {players.count()} players")
     
+    processed = []
     for player in players:
         print(f"\nProcessing player: {player.name} (ID: {player.id})")
         
@@ -37,7 +44,8 @@ def populate_player_careers():
         
         try:
             # Use the existing process_player function to calculate and create career stats
-            process_player(player.id)
+            process_player(player.id, render_heatmap=not parallel)
+            processed.append(player.id)
             print(f"  ✅ Career stats created/updated for {player.name}")
             
             # Verify the career record was created
@@ -50,6 +58,10 @@ def populate_player_careers():
         except Exception as e:
             print(f"  ❌ Error processing {player.name}: {e}")
 
+    if parallel and processed:
+        print(f"\n🔥 Rendering {len(processed)} career heatmaps in parallel")
+        regenerate_heatmaps([(player_id, "career", 0) for player_id in processed])
+
 def verify_player_careers():
     """Verify that PlayerCareer records have been created and populated"""
     print("\n🔍 Verifying Player Career Records")
@@ -130,6 +142,11 @@ def calculate_stats_from_events():
 
 def main():
     """Main function to run the population script"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parallel", action="store_true",
+                        help="render career heatmaps across all CPU cores")
+    args = parser.parse_args()
+
     print("🏀 Basketball Stat Tracker - Player Career Population")
     print("=" * 60)
     
@@ -137,7 +154,7 @@ def main():
     calculate_stats_from_events()
     
     # Then populate the career records
-    populate_player_careers()
+    populate_player_careers(parallel=args.parallel)
     
     # Finally, verify the results
     verify_player_careers()
@@ -4,6 +4,7 @@ Script to populate PlayerSeason records with calculated statistics from Event da
 This will enable season statistics functionality.
 """
 
+import argparse
 import os
 import django
 from django.conf import settings
@@ -13,7 +14,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stats_tracker.settings')
 django.setup()
 
 from games.models import Player, PlayerSeason, Event, Game, Season
-from games.utility.process_data_util import process_season
+from games.utility.process_data_util import process_season, rebuild_season_summary
+from games.utility.bulk_heatmap_util import regenerate_heatmaps
 from django.db.models import Count
 
 def create_test_season():
@@ -42,6 +44,8 @@ def update_games_with_season(season):
     for game in games:
         # Update events for this game to include the season
         events_updated = Event.objects.filter(game_id=game.id).update(season_id=season.id)
+        game.season = season
+        game.save(update_fields=["season"])
         games_updated += 1
         print(f"  Updated game {game.id} with {events_updated} events")
     
@@ -132,6 +136,20 @@ def populate_player_season_stats():
         except Exception as e:
             print(f"  ❌ Error updating season record: {e}")
 
+    # keep the season summary behind /seasons/<id>/stats/ in step
+    rebuild_season_summary(season.id)
+
+def render_season_heatmaps():
+    """Render every PlayerSeason heatmap across a process pool"""
+    print("\n🔥 Rendering Season Heatmaps")
+    print("=" * 50)
+
+    targets = [
+        (player_id, "season", season_id)
+        for player_id, season_id in PlayerSeason.objects.values_list("player_id", "season_id")
+    ]
+    regenerate_heatmaps(targets)
+
 def verify_season_stats():
     """Verify that PlayerSeason records have been created and populated"""
     print("\n🔍 Verifying Player Season Records")
@@ -158,11 +176,19 @@ def verify_season_stats():
 
 def main():
     """Main function to run the population script"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parallel", action="store_true",
+                        help="also render season heatmaps across all CPU cores")
+    args = parser.parse_args()
+
     print("🏀 Basketball Stat Tracker - Season Statistics Population")
     print("=" * 60)
     
     # Populate the season statistics
     populate_player_season_stats()
+
+    if args.parallel:
+        render_season_heatmaps()
     
     # Verify the results
     verify_season_stats()
@@ -75,6 +75,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'stats_tracker.wsgi.application'
+ASGI_APPLICATION = 'stats_tracker.asgi.application'
 
 
 # Database
@@ -152,7 +153,75 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # the values()-based stat lists opt into games.renderers.FastJSONRenderer
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    # list endpoints page by id cursor when called with ?cursor= or ?page_size=
+    'DEFAULT_PAGINATION_CLASS': 'games.pagination.IdCursorPagination',
+    'PAGE_SIZE': 100,
+}
+
+# Heatmap rebuilds queued by ingest are processed by `manage.py run_heatmap_jobs`.
+# Set to True to render them inline instead (no worker needed).
+HEATMAP_JOBS_EAGER = os.getenv("HEATMAP_JOBS_EAGER", "false").lower() == "true"
+
+# A running job not finished after HEATMAP_JOB_STALE_AFTER seconds is assumed
+# lost with its worker and claimed again; a failed one is retried after
+# HEATMAP_JOB_RETRY_DELAY seconds. Either gives up after
+# HEATMAP_JOB_MAX_ATTEMPTS claims and stays failed with its error.
+HEATMAP_JOB_STALE_AFTER = int(os.getenv("HEATMAP_JOB_STALE_AFTER", "600"))
+HEATMAP_JOB_RETRY_DELAY = int(os.getenv("HEATMAP_JOB_RETRY_DELAY", "60"))
+HEATMAP_JOB_MAX_ATTEMPTS = int(os.getenv("HEATMAP_JOB_MAX_ATTEMPTS", "3"))
+
+# Events validated and written per chunk by the NDJSON ingest endpoint
+# (POST /games/events/stream/); bounds its memory use.
+STREAM_INGEST_CHUNK_SIZE = int(os.getenv("STREAM_INGEST_CHUNK_SIZE", "5000"))
+
+# Threads the async heatmap views (games/async_views.py) render on.
+HEATMAP_RENDER_THREADS = int(os.getenv("HEATMAP_RENDER_THREADS", "4"))
+
+# Parallel heatmap uploads to Supabase Storage (and the size of the pooled
+# client's connection pool) for batch uploads such as bulk regeneration.
+HEATMAP_UPLOAD_CONCURRENCY = int(os.getenv("HEATMAP_UPLOAD_CONCURRENCY", "8"))
+
+# Local record of uploaded heatmap objects (named by content hash); unchanged
+# heatmaps are not uploaded again and a changed heatmap's old object is
+# deleted. Set to an empty string to disable (old objects are then kept).
+HEATMAP_UPLOAD_MANIFEST = os.getenv("HEATMAP_UPLOAD_MANIFEST", str(BASE_DIR / "heatmap_uploads.jsonl"))
+
+# Where rendered heatmaps are stored (games.heatmap_storage). Backends:
+# SupabaseHeatmapStorage, FileSystemHeatmapStorage (OPTIONS: location,
+# base_url) and InMemoryHeatmapStorage (OPTIONS: base_url). The last two are
+# served from /games/heatmap/files/ and need no credentials.
+HEATMAP_STORAGE = {
+    "BACKEND": os.getenv("HEATMAP_STORAGE_BACKEND", "games.heatmap_storage.SupabaseHeatmapStorage"),
+    "OPTIONS": {},
+}
+
+# Rendered heatmap PNGs, keyed on scope plus an event-set fingerprint.
+# Backends: games.heatmap_cache.LocMemHeatmapCache, FileHeatmapCache
+# (OPTIONS: location) and DjangoHeatmapCache (OPTIONS: alias).
+HEATMAP_CACHE = {
+    "BACKEND": "games.heatmap_cache.LocMemHeatmapCache",
+    "OPTIONS": {"max_bytes": 64 * 1024 * 1024},
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+# Build PlayerGame/PlayerSeason list payloads straight from .values() rows
+# instead of the ModelSerializers (same output, much less CPU per row).
+FAST_STAT_ROWS = True
+
+# Read-through cache for the aggregate stat endpoints (games.response_cache).
+# Ingest and the edit/delete endpoints retire entries per player/season/game.
+RESPONSE_CACHE = {
+    "ENABLED": True,
+    "ALIAS": "default",
+    "TIMEOUT": 300,
 }
@@ -127,4 +127,8 @@ export const seasonAPI = {
 export const heatmapAPI = {
   // Get heatmap URL for a player in a game
   getHeatmap: (gameId, playerId) => fetchAPI(`/heatmap/${gameId}/${playerId}/`),
+
+  // Get raw make/miss hexbin counts to draw client-side
+  // params: { player_id, season_id, game_id, gridsize } (at least one id)
+  getBins: (params) => fetchAPI(`/heatmap/bins/?${new URLSearchParams(params)}`),
 }; 
\ No newline at end of file